@@ -1,3 +1,7 @@
+from .budget import PartialResult
+from .cache import VerificationCache
+from .classification import CLASS_IMPLICATIONS, CLASS_NAMES, classify
+from .decision_diagram import verify_circuit_decision_diagram
 from .functions_testing import (
     verify_circuit_relative_clean_non_wasting,
     verify_circuit_relative_clean_wasting_separable,
@@ -10,6 +14,17 @@ from .functions_testing import (
     verify_circuit_strict_dirty_wasting_entangled,
     verify_circuit_strict_dirty_wasting_separable,
 )
+from .monomial import MonomialMatrix, mct_reference
+from .mpo import verify_circuit_mpo
+from .out_of_core import build_unitary_memmap, verify_circuit_out_of_core
+from .phase_polynomial import verify_circuit_phase_polynomial
+from .planner import plan_verification, verify_circuit_planned
+from .probabilistic import verify_circuit_probabilistic
+from .reversible import verify_mct_bitstrings
+from .sampling import verify_circuit_sampled
+from .stats import VerificationStats
+from .streaming import verify_circuit_streaming
+from .workspace import Workspace
 
 __all__ = [
     "verify_circuit_strict_clean_non_wasting",
@@ -22,4 +37,24 @@ __all__ = [
     "verify_circuit_strict_clean_wasting_separable",
     "verify_circuit_strict_dirty_wasting_entangled",
     "verify_circuit_relative_dirty_wasting_separable",
+    "verify_circuit_probabilistic",
+    "verify_circuit_streaming",
+    "verify_circuit_sampled",
+    "verify_mct_bitstrings",
+    "verify_circuit_phase_polynomial",
+    "verify_circuit_decision_diagram",
+    "verify_circuit_mpo",
+    "verify_circuit_out_of_core",
+    "build_unitary_memmap",
+    "verify_circuit_planned",
+    "plan_verification",
+    "classify",
+    "CLASS_NAMES",
+    "CLASS_IMPLICATIONS",
+    "MonomialMatrix",
+    "mct_reference",
+    "VerificationCache",
+    "Workspace",
+    "VerificationStats",
+    "PartialResult",
 ]
@@ -0,0 +1,111 @@
+import time
+from typing import Dict, Iterable, Iterator, Optional, Tuple, TypeVar
+
+_Item = TypeVar("_Item")
+
+
+class _OutOfTime(Exception):
+    """Raised inside a verification when its deadline has passed.
+
+    Args:
+        checked (int): columns, probes or samples fully checked before stopping
+    """
+
+    def __init__(self, checked: int = 0) -> None:
+        super().__init__(f"Time budget exceeded after {checked} checked")
+        self.checked = checked
+
+
+class Deadline:
+    """Point in time at which a verification stops.
+
+    Args:
+        budget (float): seconds from now
+    """
+
+    def __init__(self, budget: float) -> None:
+        if budget < 0:
+            raise ValueError("Time budget must be >= 0")
+        self.end = time.monotonic() + budget
+
+    def expired(self) -> bool:
+        return time.monotonic() >= self.end
+
+    def check(self, checked: int = 0) -> None:
+        """Raises _OutOfTime if the deadline has passed."""
+        if self.expired():
+            raise _OutOfTime(checked)
+
+    def overrun(self) -> float:
+        """Returns the seconds elapsed since the deadline, 0 before it."""
+        return max(0.0, time.monotonic() - self.end)
+
+
+class PartialResult:
+    """Outcome of a verification run under a time budget.
+
+    Attributes:
+        decided (Dict[str, Tuple[bool, str]]): for each class decided in time, the flag
+            denoting if the tested matrix is of given class, and reason if it is not
+        pending (Tuple[str, ...]): classes not decided when the budget ran out
+        checked (int): columns, probes or samples checked, 0 for the dense checks, which
+            stop only before a check or a costly stage
+        total (int): columns, probes or samples of the complete verification
+        confidence (float): confidence of the answer, for a pending class the one the
+            checked probes or samples give, or the share of the columns checked
+        overrun (float): seconds the verification ran past the deadline, as a stage
+            started before it is finished and its answer kept
+    """
+
+    def __init__(
+        self,
+        decided: Dict[str, Tuple[bool, str]],
+        pending: Tuple[str, ...] = (),
+        checked: int = 0,
+        total: int = 0,
+        confidence: Optional[float] = None,
+        overrun: float = 0.0,
+    ) -> None:
+        self.decided = decided
+        self.pending = pending
+        self.checked = checked
+        self.total = total
+        if confidence is None:
+            confidence = 0.0 if pending else 1.0
+        self.confidence = confidence
+        self.overrun = overrun
+
+    @property
+    def complete(self) -> bool:
+        """Whether all the classes were decided within the budget."""
+        return not self.pending
+
+    def __repr__(self) -> str:
+        return (
+            f"PartialResult(decided={self.decided!r}, pending={self.pending!r}, "
+            f"checked={self.checked}, total={self.total}, "
+            f"confidence={self.confidence:.3g}, overrun={self.overrun:.3g})"
+        )
+
+
+def _deadline(budget: Optional[float]) -> Optional[Deadline]:
+    return None if budget is None else Deadline(budget)
+
+
+class _Timed(Iterator[_Item]):
+    """Iterates over the items until the deadline, counting the items consumed.
+
+    The deadline is checked before each item, so ``checked`` counts the items processed
+    completely by a loop over the iterator when _OutOfTime is raised.
+    """
+
+    def __init__(self, items: Iterable[_Item], deadline: Deadline) -> None:
+        self._items = iter(items)
+        self.deadline = deadline
+        self.checked = 0
+
+    def __next__(self) -> _Item:
+        self.deadline.check(self.checked)
+        item = next(self._items)
+        self.checked += 1
+        return item
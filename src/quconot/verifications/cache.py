@@ -0,0 +1,255 @@
+import hashlib
+import json
+import os
+import time
+from importlib import metadata
+from typing import TYPE_CHECKING, Any, Dict, Optional, Tuple, Union
+
+import numpy as np
+from qiskit import QuantumCircuit
+from qiskit.quantum_info import Operator
+from scipy import sparse
+
+from .budget import PartialResult, _deadline, _OutOfTime
+from .classification import CLASS_NAMES
+from .functions import ABS_TOLERANCE, REL_TOLERANCE
+from .functions_testing import DEFAULT_PRECISION_MARGIN, _prepare
+from .monomial import AnyMatrix, MonomialMatrix
+from .simulation import _flatten
+from .streaming import _as_circuit
+
+if TYPE_CHECKING:
+    from ..implementations.mct_base import MCTBase
+
+
+def _library_version() -> str:
+    try:
+        return metadata.version("quconot")
+    except metadata.PackageNotFoundError:
+        return "unknown"
+
+
+def _update_array(digest: "hashlib._Hash", array: np.ndarray) -> None:
+    array = np.ascontiguousarray(array)
+    digest.update(f"{array.dtype.str}{array.shape}".encode())
+    digest.update(array.tobytes())
+
+
+def circuit_fingerprint(circuit: Union[QuantumCircuit, "MCTBase"]) -> str:
+    """Returns a canonical fingerprint of a circuit.
+
+    The circuit is flattened into its sequence of small gate matrices and the qubits they
+    act on, so equal circuits have equal fingerprints regardless of the names of their
+    custom gates and of the registers.
+
+    Args:
+        circuit (Union[QuantumCircuit, MCTBase]): the circuit or the MCT implementation
+
+    Returns:
+        str: hexadecimal SHA-256 digest
+    """
+    circuit = _as_circuit(circuit)
+    gates, global_phase = _flatten(circuit)
+    digest = hashlib.sha256(f"circuit {circuit.num_qubits} {global_phase!r}".encode())
+    for matrix, qubits in gates:
+        digest.update(repr(qubits).encode())
+        _update_array(digest, matrix)
+    return digest.hexdigest()
+
+
+def matrix_fingerprint(matrix: Union[AnyMatrix, QuantumCircuit]) -> str:
+    """Returns a fingerprint of a dense, sparse or monomial matrix, or of a circuit.
+
+    Args:
+        matrix (Union[AnyMatrix, QuantumCircuit]): the matrix or the reference circuit
+
+    Returns:
+        str: hexadecimal SHA-256 digest
+    """
+    if isinstance(matrix, QuantumCircuit):
+        return circuit_fingerprint(matrix)
+    digest = hashlib.sha256()
+    if isinstance(matrix, MonomialMatrix):
+        digest.update(b"monomial")
+        _update_array(digest, matrix.permutation)
+        _update_array(digest, matrix.phases)
+    elif sparse.issparse(matrix):
+        matrix = sparse.csr_matrix(matrix)
+        matrix.sum_duplicates()
+        matrix.sort_indices()
+        digest.update(f"sparse{matrix.shape}".encode())
+        for array in (matrix.data, matrix.indices, matrix.indptr):
+            _update_array(digest, array)
+    else:
+        digest.update(b"dense")
+        _update_array(digest, np.asarray(matrix))
+    return digest.hexdigest()
+
+
+class VerificationCache:
+    """Persistent cache of the verdicts of the dense verifiers, one file per key.
+
+    The key is the SHA-256 digest of the fingerprints of the circuit and of the reference,
+    of the tolerances and precision settings, and of the library version, so a changed
+    circuit, reference, setting or release never reuses a stale verdict. Each file holds
+    the verdict, the reason and the time of the check for every class computed so far. The
+    unitary of the circuit is only built if some requested class is missing.
+
+    Args:
+        directory (Union[str, os.PathLike]): directory of the cache, created if missing
+    """
+
+    def __init__(self, directory: Union[str, "os.PathLike[str]"]) -> None:
+        self.directory = os.fspath(directory)
+        os.makedirs(self.directory, exist_ok=True)
+
+    def key(
+        self,
+        circuit: Union[QuantumCircuit, "MCTBase"],
+        ref_unitary: Union[AnyMatrix, QuantumCircuit],
+        precision: str = "double",
+        margin: float = DEFAULT_PRECISION_MARGIN,
+    ) -> str:
+        """Returns the key of the verdicts of a circuit against a reference."""
+        settings = {
+            "circuit": circuit_fingerprint(circuit),
+            "reference": matrix_fingerprint(ref_unitary),
+            "atol": ABS_TOLERANCE,
+            "rtol": REL_TOLERANCE,
+            "precision": precision,
+            "margin": margin if precision != "double" else None,
+            "version": _library_version(),
+        }
+        return hashlib.sha256(json.dumps(settings, sort_keys=True).encode()).hexdigest()
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.directory, key + ".json")
+
+    def load(self, key: str) -> Dict[str, Dict[str, Any]]:
+        """Returns the stored entries of a key, keyed by the class abbreviation."""
+        try:
+            with open(self._path(key), encoding="utf-8") as file:
+                return json.load(file)["classes"]
+        except (FileNotFoundError, json.JSONDecodeError, KeyError):
+            return {}
+
+    def store(self, key: str, entries: Dict[str, Dict[str, Any]]) -> None:
+        """Merges the entries into the file of the key, replacing it atomically."""
+        entries = {**self.load(key), **entries}
+        temporary = f"{self._path(key)}.{os.getpid()}.tmp"
+        with open(temporary, "w", encoding="utf-8") as file:
+            json.dump({"classes": entries}, file, sort_keys=True)
+        os.replace(temporary, self._path(key))
+
+    def classify(
+        self,
+        circuit: Union[QuantumCircuit, "MCTBase"],
+        ref_unitary: AnyMatrix,
+        class_names: Optional[Tuple[str, ...]] = None,
+        precision: str = "double",
+        margin: float = DEFAULT_PRECISION_MARGIN,
+        budget: Optional[float] = None,
+    ) -> Union[Dict[str, Tuple[bool, str]], PartialResult]:
+        """Verifies the circuit against the classes, computing only the missing verdicts.
+
+        With a ``budget`` the verdicts computed before the deadline are stored, and the
+        result is a PartialResult with the classes not decided in time pending. Building
+        the unitary is not interrupted, and neither is a check started in time, whose
+        time past the deadline is reported as the overrun.
+
+        Args:
+            circuit (Union[QuantumCircuit, MCTBase]): the circuit or the MCT implementation
+            ref_unitary (AnyMatrix): true 0-1 unitary matrix
+            class_names (Optional[Tuple[str, ...]]): abbreviations of the classes, all
+                the classes if None
+            precision (str): "double" or "single", as in the verifiers
+            margin (float): factor of the tolerance deciding the single-precision answers
+            budget (Optional[float]): seconds the verification may take, None for no
+                limit
+
+        Returns:
+            Union[Dict[str, Tuple[bool, str]], PartialResult]: for each class
+                abbreviation, the flag denoting if the circuit is of given class, and
+                reason if it is not, or the PartialResult if a budget is given.
+        """
+        class_names = CLASS_NAMES if class_names is None else class_names
+        unknown = set(class_names).difference(CLASS_NAMES)
+        if unknown:
+            raise ValueError(f"Unknown class {sorted(unknown)[0]}")
+
+        deadline = _deadline(budget)
+        key = self.key(circuit, ref_unitary, precision, margin)
+        entries = self.load(key)
+        missing = [name for name in class_names if name not in entries]
+        if missing:
+            tested_matrix = Operator(_as_circuit(circuit)).data
+            data, checks = _prepare(
+                tested_matrix, ref_unitary, precision, margin, deadline=deadline
+            )
+            computed = {}
+            try:
+                for class_name in missing:
+                    start = time.perf_counter()
+                    flag, msg = checks[class_name](data)
+                    computed[class_name] = {
+                        "flag": bool(flag),
+                        "msg": msg,
+                        "seconds": time.perf_counter() - start,
+                    }
+            except _OutOfTime:
+                pass
+            if computed:
+                self.store(key, computed)
+            entries.update(computed)
+        decided = {
+            name: (entries[name]["flag"], entries[name]["msg"])
+            for name in class_names
+            if name in entries
+        }
+        if deadline is None:
+            return decided
+        pending = tuple(name for name in class_names if name not in entries)
+        return PartialResult(decided, pending, overrun=deadline.overrun())
+
+    def verify(
+        self,
+        circuit: Union[QuantumCircuit, "MCTBase"],
+        ref_unitary: AnyMatrix,
+        class_name: str,
+        precision: str = "double",
+        margin: float = DEFAULT_PRECISION_MARGIN,
+        budget: Optional[float] = None,
+    ) -> Union[Tuple[bool, str], PartialResult]:
+        """Same as the ``verify_circuit_*`` verifier of the class, for a circuit.
+
+        Args:
+            circuit (Union[QuantumCircuit, MCTBase]): the circuit or the MCT implementation
+            ref_unitary (AnyMatrix): true 0-1 unitary matrix
+            class_name (str): class abbreviation, e.g. "SCNW" or "RDWS"
+            precision (str): "double" or "single", as in the verifiers
+            margin (float): factor of the tolerance deciding the single-precision answers
+            budget (Optional[float]): seconds the verification may take, None for no
+                limit
+
+        Returns:
+            Union[Tuple[bool, str], PartialResult]: flag denoting if the circuit is of
+                given class, and reason if it is not, or the PartialResult if a budget is
+                given.
+        """
+        result = self.classify(
+            circuit, ref_unitary, (class_name,), precision, margin, budget
+        )
+        if isinstance(result, PartialResult):
+            return result
+        return result[class_name]
+
+    def timings(
+        self,
+        circuit: Union[QuantumCircuit, "MCTBase"],
+        ref_unitary: Union[AnyMatrix, QuantumCircuit],
+        precision: str = "double",
+        margin: float = DEFAULT_PRECISION_MARGIN,
+    ) -> Dict[str, float]:
+        """Returns the stored times of the checks in seconds, keyed by the class."""
+        entries = self.load(self.key(circuit, ref_unitary, precision, margin))
+        return {name: entry["seconds"] for name, entry in entries.items()}
@@ -0,0 +1,177 @@
+from typing import Any, Callable, Dict, FrozenSet, Optional, Tuple, Union
+
+from .budget import PartialResult, _deadline, _OutOfTime
+from .functions_testing import _CHECKS, DEFAULT_PRECISION_MARGIN, _prepare
+from .monomial import AnyMatrix
+from .stats import VerificationStats
+from .workspace import Workspace
+
+# abbreviations of all the classes, in the order of the verifiers
+CLASS_NAMES = tuple(_CHECKS)
+
+# direct implications between the classes: each key class is contained in the value classes
+CLASS_IMPLICATIONS: Dict[str, Tuple[str, ...]] = {
+    "SCNW": ("RCNW", "SCWS"),
+    "RCNW": ("RCWS",),
+    "SDNW": ("SCNW", "RDNW", "SDWS"),
+    "RDNW": ("RCNW", "RDWS"),
+    "SCWE": (),
+    "SCWS": ("RCWS",),
+    "RCWS": ("SCWE",),
+    "SDWE": ("SCWE",),
+    "SDWS": ("SCWS", "RDWS"),
+    "RDWS": ("SDWE",),
+}
+
+# rough number of operations of each check for the global, main and auxiliary dimensions
+_CHECK_COSTS: Dict[str, Callable[[int, int, int], int]] = {
+    "SCNW": lambda g, m, a: m**2,
+    "RCNW": lambda g, m, a: m**2,
+    "SDNW": lambda g, m, a: g**2,
+    "RDNW": lambda g, m, a: 10 * g**2,
+    "SCWE": lambda g, m, a: g * m,
+    "SCWS": lambda g, m, a: g * m,
+    "RCWS": lambda g, m, a: g * m,
+    "SDWE": lambda g, m, a: g**2,
+    "SDWS": lambda g, m, a: 10 * g**2,
+    "RDWS": lambda g, m, a: 10 * g**2,
+}
+
+
+def implied_classes(class_name: str) -> FrozenSet[str]:
+    """Returns all the classes containing the given one, following the implications.
+
+    Args:
+        class_name (str): class abbreviation, e.g. "SDNW"
+
+    Returns:
+        FrozenSet[str]: classes implied by the given class, without itself
+    """
+    implied = set()
+    stack = list(CLASS_IMPLICATIONS[class_name])
+    while stack:
+        name = stack.pop()
+        if name not in implied:
+            implied.add(name)
+            stack.extend(CLASS_IMPLICATIONS[name])
+    return frozenset(implied)
+
+
+def implying_classes(class_name: str) -> FrozenSet[str]:
+    """Returns all the classes contained in the given one, following the implications.
+
+    Args:
+        class_name (str): class abbreviation, e.g. "SCWE"
+
+    Returns:
+        FrozenSet[str]: classes implying the given class, without itself
+    """
+    return frozenset(
+        name for name in CLASS_NAMES if class_name in implied_classes(name)
+    )
+
+
+def _classify_pruned(
+    data: Any,
+    checks: Dict[str, Callable[[Any], Tuple[bool, str]]],
+    report: Dict[str, Tuple[bool, str]],
+) -> Dict[str, Tuple[bool, str]]:
+    """Runs the checks in the order of increasing cost, skipping the implied answers.
+
+    The answers are added to ``report`` as they are decided, so that they are kept if a
+    check is stopped by the deadline.
+    """
+    costs = {
+        name: cost(data.global_dim, data.main_dim, data.aux_dim)
+        for name, cost in _CHECK_COSTS.items()
+    }
+
+    while len(report) < len(CLASS_NAMES):
+        undecided = [name for name in CLASS_NAMES if name not in report]
+        # the cheapest check first, and of equally cheap the one deciding most classes
+        class_name = min(
+            undecided,
+            key=lambda name: (
+                costs[name],
+                -len(
+                    (implied_classes(name) | implying_classes(name)).difference(report)
+                ),
+            ),
+        )
+        flag, msg = checks[class_name](data)
+        report[class_name] = (flag, msg)
+
+        if flag:
+            for name in implied_classes(class_name).difference(report):
+                report[name] = (True, "")
+        else:
+            for name in implying_classes(class_name).difference(report):
+                report[name] = (False, f"{name} implies {class_name}: {msg}")
+
+    return {name: report[name] for name in CLASS_NAMES}
+
+
+def classify(
+    tested_matrix: AnyMatrix,
+    ref_unitary: AnyMatrix,
+    prune: bool = False,
+    precision: str = "double",
+    margin: float = DEFAULT_PRECISION_MARGIN,
+    workspace: Optional[Workspace] = None,
+    stats: Optional[VerificationStats] = None,
+    budget: Optional[float] = None,
+) -> Union[Dict[str, Tuple[bool, str]], PartialResult]:
+    """Verifies tested_matrix against all the classes at once.
+
+    Intermediate results shared by the verifiers, such as the clean-ancilla block, the
+    inverse of the reference matrix, the residual auxiliary states and the reverse
+    Kronecker product, are computed only once.
+
+    With ``prune`` the checks run from the cheapest one, and the answers implied by
+    CLASS_IMPLICATIONS are not verified: a positive answer decides all the implied
+    classes, and a negative one all the implying classes.
+
+    With a ``budget`` the classes are decided until the deadline, which is checked before
+    each check and each costly stage of the checks, and the answers decided in time are
+    returned as a PartialResult, with the other classes pending. A running stage, e.g.
+    the reverse Kronecker product, is not interrupted; the check using it is finished,
+    and the time past the deadline is reported as the overrun.
+
+    Args:
+        tested_matrix (AnyMatrix): the global matrix to be tested
+        ref_unitary (AnyMatrix): true 0-1 unitary matrix
+        prune (bool): skip the checks with answers implied by the class lattice
+        precision (str): "double", or "single" to check in complex64 with the absolute
+            tolerance scaled by 1e4, and to recompute the answers within ``margin`` in
+            complex128
+        margin (float): factor of the tolerance deciding the single-precision answers
+        workspace (Optional[Workspace]): buffers of the dense checks, which batch callers
+            can reuse between calls
+        stats (Optional[VerificationStats]): collector of the time, FLOPs and memory of
+            the stages of the checks
+        budget (Optional[float]): seconds the classification may take, None for no
+            limit
+
+    Returns:
+        Union[Dict[str, Tuple[bool, str]], PartialResult]: for each class abbreviation,
+            e.g. "SCNW", the flag denoting if the tested matrix is of given class, and
+            reason if it is not, or the PartialResult if a budget is given.
+    """
+    deadline = _deadline(budget)
+    data, checks = _prepare(
+        tested_matrix, ref_unitary, precision, margin, workspace, stats, deadline
+    )
+    report: Dict[str, Tuple[bool, str]] = {}
+    try:
+        if prune:
+            _classify_pruned(data, checks, report)
+        else:
+            for class_name, check in checks.items():
+                report[class_name] = check(data)
+    except _OutOfTime:
+        pass
+    report = {name: report[name] for name in CLASS_NAMES if name in report}
+    if deadline is None:
+        return report
+    pending = tuple(name for name in CLASS_NAMES if name not in report)
+    return PartialResult(report, pending, overrun=deadline.overrun())
@@ -0,0 +1,680 @@
+from typing import (
+    TYPE_CHECKING,
+    Callable,
+    Dict,
+    List,
+    Optional,
+    Sequence,
+    Set,
+    Tuple,
+    Union,
+)
+
+import numpy as np
+from qiskit import QuantumCircuit
+from qiskit.circuit import ControlledGate, Instruction
+from qiskit.exceptions import QiskitError
+from qiskit.quantum_info import Operator
+from scipy import sparse
+
+from .functions import ABS_TOLERANCE, REL_TOLERANCE, MatrixLike, _split_dims
+from .simulation import _MAX_GATE_QUBITS, _small_matrix, _visit_operations
+from .streaming import _as_circuit
+
+if TYPE_CHECKING:
+    from ..implementations.mct_base import MCTBase
+
+# edge weights below this fraction of the largest sibling are replaced by the zero edge
+_WEIGHT_TOLERANCE = 1e-10
+
+# number of decimals of the normalized weights compared in the unique table
+_DECIMALS = 10
+
+
+class _Node:
+    """Node of the diagram, splitting the matrix of its level into four quadrants.
+
+    The edge ``2 * i + j`` points to the quadrant of row bit ``i`` and column bit ``j`` of
+    the qubit ``level``; levels decrease towards the terminal node of level -1.
+    """
+
+    __slots__ = ("level", "edges")
+
+    def __init__(self, level: int, edges: Tuple["Edge", ...]) -> None:
+        self.level = level
+        self.edges = edges
+
+
+# weight and the node it multiplies
+Edge = Tuple[complex, _Node]
+
+_TERMINAL = _Node(-1, ())
+_ZERO: Edge = (0j, _TERMINAL)
+
+
+def _round(weight: complex) -> complex:
+    return complex(round(weight.real, _DECIMALS), round(weight.imag, _DECIMALS))
+
+
+class _Package:
+    """Unique table of the nodes and compute tables of the operations.
+
+    Equal matrices are represented by the same node, so the compute tables can be keyed by
+    the node identities, and diagrams are compared by identity.
+    """
+
+    def __init__(self) -> None:
+        self._unique: Dict[tuple, _Node] = {}
+        self._identities: List[Edge] = [(1 + 0j, _TERMINAL)]
+        self._multiply_table: Dict[Tuple[int, int], Edge] = {}
+        self._add_table: Dict[Tuple[int, int, complex], Edge] = {}
+        self._adjoint_table: Dict[int, Edge] = {}
+
+    def make_node(self, level: int, edges: Sequence[Edge]) -> Edge:
+        """Returns the normalized edge to the unique node with the given edges."""
+        top = max(abs(weight) for weight, _ in edges)
+        if top == 0.0:
+            return _ZERO
+        threshold = top * _WEIGHT_TOLERANCE
+        edges = [edge if abs(edge[0]) > threshold else _ZERO for edge in edges]
+        # the first edge of the largest weight is normalized to 1
+        norm = next(weight for weight, _ in edges if abs(weight) >= top - threshold)
+        normalized = tuple((_round(weight / norm), node) for weight, node in edges)
+
+        key = (level, tuple((weight, id(node)) for weight, node in normalized))
+        node = self._unique.get(key)
+        if node is None:
+            node = _Node(level, normalized)
+            self._unique[key] = node
+        return norm, node
+
+    def identity(self, level: int) -> Edge:
+        """Returns the identity on the qubits up to ``level``."""
+        while len(self._identities) <= level + 1:
+            child = self._identities[-1]
+            self._identities.append(
+                self.make_node(len(self._identities) - 1, (child, _ZERO, _ZERO, child))
+            )
+        return self._identities[level + 1]
+
+    def add(self, a: Edge, b: Edge) -> Edge:
+        (weight_a, node_a), (weight_b, node_b) = a, b
+        if abs(weight_a) <= _WEIGHT_TOLERANCE:
+            return b if abs(weight_b) > _WEIGHT_TOLERANCE else _ZERO
+        if abs(weight_b) <= _WEIGHT_TOLERANCE:
+            return a
+        if node_a is node_b:
+            weight = weight_a + weight_b
+            return (weight, node_a) if abs(weight) > _WEIGHT_TOLERANCE else _ZERO
+        if abs(weight_b) > abs(weight_a):
+            (weight_a, node_a), (weight_b, node_b) = b, a
+
+        ratio = weight_b / weight_a
+        key = (id(node_a), id(node_b), _round(ratio))
+        result = self._add_table.get(key)
+        if result is None:
+            result = self.make_node(
+                node_a.level,
+                [
+                    self.add(edge_a, (ratio * edge_b[0], edge_b[1]))
+                    for edge_a, edge_b in zip(node_a.edges, node_b.edges)
+                ],
+            )
+            self._add_table[key] = result
+        return weight_a * result[0], result[1]
+
+    def multiply(self, a: Edge, b: Edge) -> Edge:
+        (weight_a, node_a), (weight_b, node_b) = a, b
+        if weight_a == 0 or weight_b == 0:
+            return _ZERO
+        if node_a is _TERMINAL or node_b is self.identity(node_b.level)[1]:
+            return weight_a * weight_b, node_a
+        if node_a is self.identity(node_a.level)[1]:
+            return weight_a * weight_b, node_b
+
+        key = (id(node_a), id(node_b))
+        result = self._multiply_table.get(key)
+        if result is None:
+            x, y = node_a.edges, node_b.edges
+            result = self.make_node(
+                node_a.level,
+                [
+                    self.add(
+                        self.multiply(x[2 * i], y[j]),
+                        self.multiply(x[2 * i + 1], y[2 + j]),
+                    )
+                    for i in (0, 1)
+                    for j in (0, 1)
+                ],
+            )
+            self._multiply_table[key] = result
+        return weight_a * weight_b * result[0], result[1]
+
+    def adjoint(self, edge: Edge) -> Edge:
+        weight, node = edge
+        if node is _TERMINAL:
+            return np.conjugate(weight), node
+        result = self._adjoint_table.get(id(node))
+        if result is None:
+            first, upper, lower, last = (self.adjoint(child) for child in node.edges)
+            result = self.make_node(node.level, (first, lower, upper, last))
+            self._adjoint_table[id(node)] = result
+        return np.conjugate(weight) * result[0], result[1]
+
+    def gate(
+        self,
+        num_qubits: int,
+        matrix: np.ndarray,
+        targets: Sequence[int],
+        controls: Dict[int, int],
+    ) -> Edge:
+        """Returns the diagram of a gate, with the identity on the other qubits.
+
+        Args:
+            num_qubits (int): number of qubits of the circuit
+            matrix (np.ndarray): matrix of the gate, little-endian in the targets
+            targets (Sequence[int]): target qubits
+            controls (Dict[int, int]): control qubits and the values activating the gate
+
+        Returns:
+            Edge: diagram of the gate
+        """
+        # a controlled gate is I + |controls><controls| (x) (matrix - I)
+        block = matrix - np.eye(len(matrix)) if controls else matrix
+        positions = {qubit: i for i, qubit in enumerate(targets)}
+        built: Dict[Tuple[int, int, int], Edge] = {}
+
+        def build(level: int, row: int, col: int) -> Edge:
+            if level < 0:
+                return complex(block[row, col]), _TERMINAL
+            key = (level, row, col)
+            if key not in built:
+                if level in positions:
+                    shift = positions[level]
+                    edges = [
+                        build(level - 1, row | (i << shift), col | (j << shift))
+                        for i in (0, 1)
+                        for j in (0, 1)
+                    ]
+                elif level in controls:
+                    edges = [_ZERO] * 4
+                    edges[3 * controls[level]] = build(level - 1, row, col)
+                else:
+                    child = build(level - 1, row, col)
+                    edges = [child, _ZERO, _ZERO, child]
+                built[key] = self.make_node(level, edges)
+            return built[key]
+
+        edge = build(num_qubits - 1, 0, 0)
+        if controls:
+            return self.add(self.identity(num_qubits - 1), edge)
+        return edge
+
+
+# gate matrix, target qubits, and control qubits with their activating values
+_Gate = Tuple[np.ndarray, Tuple[int, ...], Dict[int, int]]
+
+
+def _controlled_gate(
+    operation: ControlledGate, qubits: Tuple[int, ...]
+) -> Optional[_Gate]:
+    controls_no = operation.num_ctrl_qubits
+    base_gate = operation.base_gate
+    if (
+        operation.num_qubits != controls_no + base_gate.num_qubits
+        or base_gate.num_qubits > _MAX_GATE_QUBITS
+    ):
+        return None
+    try:
+        matrix = Operator(base_gate).data
+    except QiskitError:
+        return None
+    controls = {
+        q: (operation.ctrl_state >> i) & 1 for i, q in enumerate(qubits[:controls_no])
+    }
+    return matrix, qubits[controls_no:], controls
+
+
+def _flatten_controlled(circuit: QuantumCircuit) -> Tuple[List[_Gate], float]:
+    """Flattens a circuit into controlled gates with small base gates.
+
+    Args:
+        circuit (QuantumCircuit): circuit without measurements
+
+    Returns:
+        Tuple[List[_Gate], float]: gates in the order of application, and the global
+            phase collected from the decomposed definitions
+    """
+    gates: List[_Gate] = []
+
+    def apply(operation: Instruction, qubits: Tuple[int, ...]) -> bool:
+        if isinstance(operation, ControlledGate):
+            gate = _controlled_gate(operation, qubits)
+            if gate is not None:
+                gates.append(gate)
+                return True
+        matrix = _small_matrix(operation)
+        if matrix is None:
+            return False
+        gates.append((matrix, qubits, {}))
+        return True
+
+    return gates, _visit_operations(circuit, apply)
+
+
+class DecisionDiagram:
+    """Quantum multiple-valued decision diagram (QMDD) of a unitary.
+
+    The matrix is split recursively into quadrants, one qubit per level starting from the
+    most significant one, and equal quadrants up to a scalar share a node. Multi-controlled
+    gates and the MCT reference matrices have diagrams of O(n) nodes, so circuits on tens
+    of qubits can be verified without the O(4^n) unitary.
+
+    Diagrams combined by ``@`` have to share their unique and compute tables, which is
+    arranged by building them with ``like``.
+
+    Args:
+        root (Edge): weight and the root node
+        num_qubits (int): number of qubits
+        package (_Package): unique and compute tables of the nodes
+    """
+
+    def __init__(self, root: Edge, num_qubits: int, package: _Package) -> None:
+        self.root = root
+        self.num_qubits = num_qubits
+        self._package = package
+
+    @staticmethod
+    def _package_of(like: Optional["DecisionDiagram"]) -> _Package:
+        return _Package() if like is None else like._package
+
+    @classmethod
+    def from_circuit(
+        cls,
+        circuit: Union[QuantumCircuit, "MCTBase"],
+        like: Optional["DecisionDiagram"] = None,
+        clean_qubits: int = 0,
+    ) -> "DecisionDiagram":
+        """Builds the diagram of a circuit gate by gate.
+
+        With ``clean_qubits`` the most significant qubits start in |0>, i.e. the diagram of
+        ``U (|0><0| (x) I)`` is built. It keeps only the columns of clean auxiliary qubits,
+        which for relative Toffoli gates on the auxiliary qubits is much smaller.
+
+        Args:
+            circuit (Union[QuantumCircuit, MCTBase]): the circuit or the MCT implementation
+            like (Optional[DecisionDiagram]): diagram whose tables are shared
+            clean_qubits (int): number of most significant qubits starting in |0>
+
+        Returns:
+            DecisionDiagram: the diagram of the circuit unitary
+        """
+        circuit = _as_circuit(circuit)
+        package = cls._package_of(like)
+        gates, global_phase = _flatten_controlled(circuit)
+
+        root = package.identity(circuit.num_qubits - clean_qubits - 1)
+        for level in range(circuit.num_qubits - clean_qubits, circuit.num_qubits):
+            root = package.make_node(level, (root, _ZERO, _ZERO, _ZERO))
+        for matrix, targets, controls in gates:
+            gate = package.gate(circuit.num_qubits, matrix, targets, controls)
+            root = package.multiply(gate, root)
+        return cls(
+            (np.exp(1j * global_phase) * root[0], root[1]), circuit.num_qubits, package
+        )
+
+    @classmethod
+    def from_matrix(
+        cls, matrix: MatrixLike, like: Optional["DecisionDiagram"] = None
+    ) -> "DecisionDiagram":
+        """Builds the diagram of a matrix of size a power of two.
+
+        Args:
+            matrix (MatrixLike): the matrix
+            like (Optional[DecisionDiagram]): diagram whose tables are shared
+
+        Returns:
+            DecisionDiagram: the diagram of the matrix
+        """
+        if sparse.issparse(matrix):
+            matrix = sparse.csr_matrix(matrix).toarray()
+        package = cls._package_of(like)
+        num_qubits = int(np.log2(matrix.shape[0]))
+
+        def build(block: np.ndarray, level: int) -> Edge:
+            if level < 0:
+                return complex(block[0, 0]), _TERMINAL
+            half = block.shape[0] // 2
+            quadrants = [block[:half, :half], block[:half, half:], block[half:, :half]]
+            quadrants.append(block[half:, half:])
+            return package.make_node(level, [build(q, level - 1) for q in quadrants])
+
+        return cls(build(np.asarray(matrix), num_qubits - 1), num_qubits, package)
+
+    def __matmul__(self, other: "DecisionDiagram") -> "DecisionDiagram":
+        if self._package is not other._package:
+            raise ValueError("Diagrams should be built with shared tables")
+        if self.num_qubits != other.num_qubits:
+            raise ValueError("Diagrams should have the same number of qubits")
+        root = self._package.multiply(self.root, other.root)
+        return DecisionDiagram(root, self.num_qubits, self._package)
+
+    def adjoint(self) -> "DecisionDiagram":
+        return DecisionDiagram(
+            self._package.adjoint(self.root), self.num_qubits, self._package
+        )
+
+    @property
+    def size(self) -> int:
+        """Number of distinct nodes, without the terminal node."""
+        seen: Set[int] = set()
+        stack = [self.root[1]]
+        while stack:
+            node = stack.pop()
+            if node is _TERMINAL or id(node) in seen:
+                continue
+            seen.add(id(node))
+            stack.extend(child for _, child in node.edges)
+        return len(seen)
+
+    def toarray(self) -> np.ndarray:
+        def build(edge: Edge, level: int) -> np.ndarray:
+            weight, node = edge
+            dim = 2 ** (level + 1)
+            if weight == 0:
+                return np.zeros((dim, dim), dtype=complex)
+            if node is _TERMINAL:
+                return np.array([[weight]], dtype=complex)
+            quadrants = [build(child, level - 1) for child in node.edges]
+            return weight * np.block([quadrants[:2], quadrants[2:]])
+
+        return build(self.root, self.num_qubits - 1)
+
+
+def _is_close(value: complex, expected: complex) -> bool:
+    return bool(np.isclose(value, expected, atol=ABS_TOLERANCE, rtol=REL_TOLERANCE))
+
+
+def _is_zero(edge: Edge) -> bool:
+    # the entries below a normalized node have moduli at most 1
+    return abs(edge[0]) <= ABS_TOLERANCE
+
+
+def _reached_nodes(root: Edge, main_qubits: int, indices: Sequence[int]) -> List[_Node]:
+    """Returns the top nodes of the main register reached through the given edges."""
+    reached: List[_Node] = []
+    seen: Set[int] = set()
+    stack = [root[1]]
+    while stack:
+        node = stack.pop()
+        if id(node) in seen:
+            continue
+        seen.add(id(node))
+        if node.level < main_qubits:
+            reached.append(node)
+            continue
+        stack.extend(node.edges[i][1] for i in indices if not _is_zero(node.edges[i]))
+    return reached
+
+
+def _clean_block(root: Edge, main_qubits: int) -> Edge:
+    """Follows the edges of auxiliary input and output |0> down to the main register."""
+    weight, node = root
+    while node.level >= main_qubits and weight != 0:
+        child_weight, node = node.edges[0]
+        weight *= child_weight
+    return weight, node
+
+
+def _scaled_identity(
+    node: _Node, memo: Dict[int, Optional[complex]]
+) -> Optional[complex]:
+    """Returns the scalar ``s`` if the node is ``s I`` up to the tolerance, None otherwise."""
+    if node is _TERMINAL:
+        return 1.0 + 0j
+    if id(node) not in memo:
+        first, upper, lower, last = node.edges
+        scalar: Optional[complex] = None
+        if _is_zero(upper) and _is_zero(lower) and not _is_zero(first):
+            first_scalar = _scaled_identity(first[1], memo)
+            last_scalar = _scaled_identity(last[1], memo)
+            if first_scalar is not None and last_scalar is not None:
+                scalar = first[0] * first_scalar
+                if not _is_close(last[0] * last_scalar, scalar):
+                    scalar = None
+        memo[id(node)] = scalar
+    return memo[id(node)]
+
+
+def _diagonal_moduli(
+    node: _Node, memo: Dict[int, Optional[Tuple[float, float]]]
+) -> Optional[Tuple[float, float]]:
+    """Returns the least and the largest modulus of the diagonal, or None if not diagonal."""
+    if node is _TERMINAL:
+        return 1.0, 1.0
+    if id(node) not in memo:
+        first, upper, lower, last = node.edges
+        moduli: Optional[Tuple[float, float]] = None
+        if _is_zero(upper) and _is_zero(lower):
+            bounds = []
+            for weight, child in (first, last):
+                child_moduli = (
+                    (0.0, 0.0) if weight == 0 else _diagonal_moduli(child, memo)
+                )
+                if child_moduli is None:
+                    break
+                bounds.append(
+                    (abs(weight) * child_moduli[0], abs(weight) * child_moduli[1])
+                )
+            else:
+                moduli = min(b[0] for b in bounds), max(b[1] for b in bounds)
+        memo[id(node)] = moduli
+    return memo[id(node)]
+
+
+def _unit_diagonal(edge: Edge) -> bool:
+    """Whether the matrix is diagonal with entries of modulus 1."""
+    moduli = _diagonal_moduli(edge[1], {})
+    return moduli is not None and all(_is_close(abs(edge[0]) * m, 1.0) for m in moduli)
+
+
+def _equal(a: Edge, b: Edge, package: _Package) -> bool:
+    """Whether the matrices are equal, where ``b`` is unitary up to a scalar."""
+    if a[1] is b[1]:
+        return _is_close(a[0], b[0])
+    weight, product = package.multiply(a, package.adjoint(b))
+    scalar = _scaled_identity(product, {})
+    return scalar is not None and _is_close(weight * scalar, abs(b[0]) ** 2)
+
+
+def _proportional_diagonals(nodes: Sequence[_Node], package: _Package) -> bool:
+    """Whether the nodes are proportional diagonal matrices with entries of equal modulus."""
+    first = nodes[0]
+    moduli = _diagonal_moduli(first, {})
+    if (
+        moduli is None
+        or moduli[0] <= ABS_TOLERANCE
+        or not _is_close(moduli[0], moduli[1])
+    ):
+        return False
+    inverse = package.adjoint((1 + 0j, first))
+    # the product with the inverse of the first node is a scaled identity
+    memo: Dict[int, Optional[complex]] = {}
+    for node in nodes[1:]:
+        _, product = package.multiply((1 + 0j, node), inverse)
+        if _scaled_identity(product, memo) is None:
+            return False
+    return True
+
+
+def _dd_strict_clean_non_wasting(
+    product: Edge, main_qubits: int, package: _Package
+) -> Tuple[bool, str]:
+    weight, node = _clean_block(product, main_qubits)
+    scalar = _scaled_identity(node, {})
+    if scalar is None or not _is_close(abs(weight * scalar), 1.0):
+        return False, "Generated matrix should be all 0"
+    return True, ""
+
+
+def _dd_relative_clean_non_wasting(
+    product: Edge, main_qubits: int, package: _Package
+) -> Tuple[bool, str]:
+    if not _unit_diagonal(_clean_block(product, main_qubits)):
+        return False, "Generated matrix should be all 0"
+    return True, ""
+
+
+def _dd_strict_dirty_non_wasting(
+    product: Edge, main_qubits: int, package: _Package
+) -> Tuple[bool, str]:
+    weight, node = product
+    scalar = _scaled_identity(node, {})
+    if scalar is None or not _is_close(abs(weight * scalar), 1.0):
+        return False, "Generated matrix should be all 0"
+    return True, ""
+
+
+def _dd_relative_dirty_non_wasting(
+    product: Edge, main_qubits: int, package: _Package
+) -> Tuple[bool, str]:
+    weight, node = product
+    # the auxiliary levels of W = I have equal diagonal quadrants and zero off-diagonal ones
+    while node.level >= main_qubits:
+        first, upper, lower, last = node.edges
+        if (
+            not _is_zero(upper)
+            or not _is_zero(lower)
+            or not _equal(last, first, package)
+        ):
+            return False, "Matrix W should be identity"
+        weight *= first[0]
+        node = first[1]
+    if not _unit_diagonal((weight, node)):
+        return False, "Generated matrix V should be all 0"
+    return True, ""
+
+
+def _dd_wasting_entangled(indices: Sequence[int]) -> Callable[..., Tuple[bool, str]]:
+    # with unitarity, the residual states have norm 1 iff the main output equals pi(b)
+    def check(product: Edge, main_qubits: int, package: _Package) -> Tuple[bool, str]:
+        memo: Dict[int, Optional[Tuple[float, float]]] = {}
+        for node in _reached_nodes(product, main_qubits, indices):
+            if _diagonal_moduli(node, memo) is None:
+                return False, "The length should be 1"
+        return True, ""
+
+    return check
+
+
+def _dd_strict_clean_wasting_separable(
+    product: Edge, main_qubits: int, package: _Package
+) -> Tuple[bool, str]:
+    # all the residual states equal phi_0, i.e. the clean columns are phi_0 (x) I
+    memo: Dict[int, Optional[complex]] = {}
+    for node in _reached_nodes(product, main_qubits, (0, 2)):
+        if _scaled_identity(node, memo) is None:
+            return False, "The state should be a quantum state"
+    return True, ""
+
+
+def _dd_relative_clean_wasting_separable(
+    product: Edge, main_qubits: int, package: _Package
+) -> Tuple[bool, str]:
+    # the clean columns are psi (x) D for a diagonal D
+    if not _proportional_diagonals(
+        _reached_nodes(product, main_qubits, (0, 2)), package
+    ):
+        return False, "Resulting matrix should be identity"
+    return True, ""
+
+
+def _dd_strict_dirty_wasting_separable(
+    product: Edge, main_qubits: int, package: _Package
+) -> Tuple[bool, str]:
+    reached = _reached_nodes(product, main_qubits, (0, 1, 2, 3))
+    memo: Dict[int, Optional[complex]] = {}
+    if all(_scaled_identity(node, memo) is not None for node in reached):
+        return True, ""
+    if len(reached) == 1:
+        return False, "Resulting matrix should be an Identity"
+    return False, "Not separable unitary matrix"
+
+
+def _dd_relative_dirty_wasting_separable(
+    product: Edge, main_qubits: int, package: _Package
+) -> Tuple[bool, str]:
+    if not _proportional_diagonals(
+        _reached_nodes(product, main_qubits, (0, 1, 2, 3)), package
+    ):
+        return False, "Resulting matrix should be identity"
+    return True, ""
+
+
+# checks of all the classes on the diagram of (I (x) U_ref^dagger) U
+_DD_CHECKS: Dict[str, Callable[[Edge, int, _Package], Tuple[bool, str]]] = {
+    "SCNW": _dd_strict_clean_non_wasting,
+    "RCNW": _dd_relative_clean_non_wasting,
+    "SDNW": _dd_strict_dirty_non_wasting,
+    "RDNW": _dd_relative_dirty_non_wasting,
+    "SCWE": _dd_wasting_entangled((0, 2)),
+    "SCWS": _dd_strict_clean_wasting_separable,
+    "RCWS": _dd_relative_clean_wasting_separable,
+    "SDWE": _dd_wasting_entangled((0, 1, 2, 3)),
+    "SDWS": _dd_strict_dirty_wasting_separable,
+    "RDWS": _dd_relative_dirty_wasting_separable,
+}
+
+# classes depending only on the columns of clean auxiliary qubits
+_CLEAN_CLASSES = frozenset(("SCNW", "RCNW", "SCWE", "SCWS", "RCWS"))
+
+
+def verify_circuit_decision_diagram(
+    circuit: Union[QuantumCircuit, "MCTBase"],
+    ref_unitary: Union[QuantumCircuit, MatrixLike],
+    class_name: str,
+) -> Tuple[bool, str]:
+    """Verifies if the circuit is of the given class on decision diagrams.
+
+    The circuit unitary ``U`` and the reference are built as decision diagrams, and the
+    class is decided from the structure of the diagram of ``(I (x) U_ref^dagger) U``, e.g.
+    SDNW holds iff it is the identity node up to a phase. The reference is best given as a
+    circuit, e.g. a single multi-controlled X gate, so no matrix is built at all.
+
+    Args:
+        circuit (Union[QuantumCircuit, MCTBase]): the circuit or the MCT implementation
+        ref_unitary (Union[QuantumCircuit, MatrixLike]): the reference circuit, or its
+            true 0-1 unitary matrix
+        class_name (str): class abbreviation, e.g. "SCNW" or "RDWS"
+
+    Returns:
+        Tuple[bool, str]: flag denoting if the circuit is of given class, and reason if
+            it is not.
+    """
+    if class_name not in _DD_CHECKS:
+        raise ValueError(f"Unknown class {class_name}")
+
+    circuit = _as_circuit(circuit)
+    if isinstance(ref_unitary, QuantumCircuit):
+        main_qubits = ref_unitary.num_qubits
+    else:
+        main_qubits = int(np.log2(ref_unitary.shape[0]))
+    _split_dims(2**circuit.num_qubits, 2**main_qubits)
+    clean_qubits = (
+        circuit.num_qubits - main_qubits if class_name in _CLEAN_CLASSES else 0
+    )
+
+    tested = DecisionDiagram.from_circuit(circuit, clean_qubits=clean_qubits)
+    if isinstance(ref_unitary, QuantumCircuit):
+        reference = DecisionDiagram.from_circuit(ref_unitary, like=tested)
+    else:
+        reference = DecisionDiagram.from_matrix(ref_unitary, like=tested)
+
+    # I (x) U_ref^dagger, the auxiliary qubits are the most significant ones
+    package = tested._package
+    lifted = package.adjoint(reference.root)
+    for level in range(main_qubits, tested.num_qubits):
+        lifted = package.make_node(level, (lifted, _ZERO, _ZERO, lifted))
+    product = package.multiply(lifted, tested.root)
+
+    return _DD_CHECKS[class_name](product, main_qubits, package)
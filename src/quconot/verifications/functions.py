@@ -1,38 +1,250 @@
 # This is where we put fixtures
-from typing import Tuple
+from typing import Tuple, Union
 
 import numpy as np
+from scipy import sparse
 
 # constants
 ABS_TOLERANCE = 1e-8
 REL_TOLERANCE = 1e-8
 
-
-def ket0(dim: int):
-    ket_0 = np.zeros(dim)
-    ket_0[0] = 1.0
-    return ket_0
+# dense or scipy.sparse matrix accepted by the verifiers
+MatrixLike = Union[np.ndarray, sparse.spmatrix]
 
 
 def _get_dims(
-    tested_matrix: np.ndarray, ref_unitary: np.ndarray
+    tested_matrix: MatrixLike, ref_unitary: MatrixLike
 ) -> Tuple[int, int, int]:
     """Returns the dimensions of the global, main and auxilliary system.
 
     Auxiliary system dimension is the dimensionality
 
     Args:
-        tested_matrix (np.ndarray): the global system unitary
-        ref_unitary (np.ndarray): the main system unitary
+        tested_matrix (MatrixLike): the global system unitary
+        ref_unitary (MatrixLike): the main system unitary
+
+    Returns:
+        Tuple[int, int, int]: global, main, and aux dimensions.
+    """
+    return _split_dims(tested_matrix.shape[0], ref_unitary.shape[0])
+
+
+def _split_dims(global_dim: int, main_dim: int) -> Tuple[int, int, int]:
+    """Returns the dimensions of the global, main and auxilliary system.
+
+    Args:
+        global_dim (int): dimension of the global system
+        main_dim (int): dimension of the main system
 
     Returns:
         Tuple[int, int, int]: global, main, and aux dimensions.
     """
-    main_dim = ref_unitary.shape[0]
-    global_dim = tested_matrix.shape[0]
     if global_dim % main_dim != 0:
         raise ValueError(
             f"One cannot find auxilliary system for dimensions {main_dim} and {global_dim} cannot"
         )
     aux_dim = global_dim // main_dim
     return global_dim, main_dim, aux_dim
+
+
+def _align_formats(
+    tested_matrix: MatrixLike, ref_unitary: MatrixLike
+) -> Tuple[MatrixLike, MatrixLike]:
+    """Brings the tested and the reference matrix to a common format.
+
+    If the tested matrix is sparse, both matrices are converted to CSR, otherwise a sparse
+    reference matrix is made dense. The global matrix is never densified.
+
+    Args:
+        tested_matrix (MatrixLike): the global system unitary
+        ref_unitary (MatrixLike): the main system unitary
+
+    Returns:
+        Tuple[MatrixLike, MatrixLike]: tested and reference matrices
+    """
+    if sparse.issparse(tested_matrix):
+        return sparse.csr_matrix(tested_matrix), sparse.csr_matrix(ref_unitary)
+    if sparse.issparse(ref_unitary):
+        return tested_matrix, sparse.csr_matrix(ref_unitary).toarray()
+    return tested_matrix, ref_unitary
+
+
+def _eye(dim: int, like: MatrixLike) -> MatrixLike:
+    """Returns the identity of the same format and element type as ``like``."""
+    if sparse.issparse(like):
+        return sparse.identity(dim, dtype=like.dtype, format="csr")
+    return np.eye(dim, dtype=like.dtype)
+
+
+def _kron(a: MatrixLike, b: MatrixLike) -> MatrixLike:
+    """Returns the Kronecker product, which is sparse if any of the factors is sparse."""
+    if sparse.issparse(a) or sparse.issparse(b):
+        return sparse.kron(a, b, format="csr")
+    return np.kron(a, b)
+
+
+def _dense_vector(vector: MatrixLike) -> np.ndarray:
+    """Returns a 1D dense copy of a vector stored as a sparse or dense array."""
+    if sparse.issparse(vector):
+        vector = sparse.csr_matrix(vector).toarray()
+    return np.asarray(vector).ravel()
+
+
+def _allclose(
+    a: MatrixLike,
+    b: Union[MatrixLike, float],
+    atol: float = ABS_TOLERANCE,
+    rtol: float = REL_TOLERANCE,
+) -> bool:
+    """Same as np.allclose, but it does not densify scipy.sparse arguments.
+
+    If any of the arguments is sparse, ``b`` has to be a matrix or the scalar 0.
+
+    Args:
+        a (MatrixLike): tested matrix
+        b (Union[MatrixLike, float]): expected matrix
+        atol (float): absolute tolerance
+        rtol (float): relative tolerance
+
+    Returns:
+        bool: flag denoting if all the entries are close
+    """
+    if not sparse.issparse(a) and not sparse.issparse(b):
+        return np.allclose(a, b, atol=atol, rtol=rtol)
+    if np.isscalar(b):
+        if b != 0:
+            raise ValueError("Sparse matrices can be compared only with the scalar 0")
+        deviation = abs(a)
+    else:
+        deviation = abs(a - b) - rtol * abs(b)
+    return bool(deviation.max() <= atol)
+
+
+def _clean_subspace(tested_matrix: MatrixLike, main_dim: int) -> MatrixLike:
+    """Returns the block of the global unitary acting on the main system with all
+    auxiliary qubits in |0> on both input and output.
+
+    This is equivalent to projecting both sides of ``tested_matrix`` onto ``|0> (x) I``,
+    but it is returned as a strided view of ``tested_matrix`` and no memory is copied. For
+    sparse matrices the block is a sparse copy.
+
+    Args:
+        tested_matrix (MatrixLike): the global system unitary
+        main_dim (int): dimension of the main system
+
+    Returns:
+        MatrixLike: view of the top-left ``main_dim x main_dim`` block
+    """
+    return tested_matrix[:main_dim, :main_dim]
+
+
+def _clean_columns(tested_matrix: MatrixLike, main_dim: int) -> MatrixLike:
+    """Returns the columns of the global unitary with all auxiliary qubits in |0> on input.
+
+    This is equivalent to projecting the input of ``tested_matrix`` onto ``|0> (x) I`` and
+    is returned as a view. For sparse matrices the columns are a sparse copy.
+
+    Args:
+        tested_matrix (MatrixLike): the global system unitary
+        main_dim (int): dimension of the main system
+
+    Returns:
+        MatrixLike: view of the ``global_dim x main_dim`` column block
+    """
+    return tested_matrix[:, :main_dim]
+
+
+def _residual_states(
+    columns: MatrixLike, ref_unitary: MatrixLike, main_dim: int, aux_dim: int
+) -> MatrixLike:
+    """Returns the auxiliary residual states for a block of columns of the global unitary.
+
+    Column ``j`` of the block is the input ``|c, b>`` with ``b = j % main_dim``, and column
+    ``j`` of the result is ``(I (x) <pi(b)|) U |c, b>``, where ``pi(b)`` is
+    ``ref_unitary @ |b>``.
+
+    Args:
+        columns (MatrixLike): ``global_dim x k`` column block, ``k`` divisible by main_dim
+        ref_unitary (MatrixLike): the main system unitary
+        main_dim (int): dimension of the main system
+        aux_dim (int): dimension of the auxiliary system
+
+    Returns:
+        MatrixLike: matrix of shape ``(aux_dim, k)``
+    """
+    if sparse.issparse(columns):
+        entries = sparse.coo_matrix(columns)
+        weights = np.asarray(
+            sparse.csr_matrix(ref_unitary)[
+                entries.row % main_dim, entries.col % main_dim
+            ]
+        ).ravel()
+        return sparse.csr_matrix(
+            (entries.data * weights, (entries.row // main_dim, entries.col)),
+            shape=(aux_dim, columns.shape[1]),
+        )
+
+    # tensor[c', m, c, b] = <c', m| U |c, b>; a view for contiguous column blocks
+    tensor = columns.reshape(aux_dim, main_dim, -1, main_dim)
+    return np.einsum("imjb,mb->ijb", tensor, ref_unitary).reshape(aux_dim, -1)
+
+
+def _column_norms(matrix: MatrixLike) -> np.ndarray:
+    """Returns the 2-norms of the columns of a dense or sparse matrix."""
+    if sparse.issparse(matrix):
+        return np.sqrt(_dense_vector(abs(matrix).power(2).sum(axis=0)))
+    return np.linalg.norm(matrix, axis=0)
+
+
+def _ref_permutation(ref_unitary: MatrixLike) -> np.ndarray:
+    """Returns the permutation ``pi`` of a 0-1 unitary, with ``ref_unitary[pi[b], b] == 1``.
+
+    Args:
+        ref_unitary (MatrixLike): true 0-1 unitary matrix
+
+    Returns:
+        np.ndarray: integer array of length ``main_dim``
+    """
+    magnitudes = abs(ref_unitary)
+    permutation = _dense_vector(magnitudes.argmax(axis=0)).astype(np.int64)
+    main_dim = ref_unitary.shape[0]
+    if not (
+        np.array_equal(np.sort(permutation), np.arange(main_dim))
+        and np.allclose(
+            _dense_vector(magnitudes[permutation, np.arange(main_dim)]), 1.0
+        )
+    ):
+        raise ValueError("Reference matrix should be a 0-1 unitary matrix")
+    return permutation
+
+
+def _apply_ref_dagger(matrix: MatrixLike, permutation: np.ndarray) -> MatrixLike:
+    """Returns ``matrix @ (I (x) ref_unitary^dagger)`` by reindexing the columns.
+
+    For the 0-1 reference with the permutation ``pi``, column ``c * main_dim + pi(b)`` of
+    the product is column ``c * main_dim + b`` of the matrix, so no product is computed.
+
+    Args:
+        matrix (MatrixLike): matrix with a number of columns divisible by main_dim
+        permutation (np.ndarray): permutation of the reference, of length ``main_dim``
+
+    Returns:
+        MatrixLike: the product, of the same shape and format as the matrix
+    """
+    return matrix[:, _ref_dagger_columns(matrix.shape[1], permutation)]
+
+
+def _ref_dagger_columns(columns_no: int, permutation: np.ndarray) -> np.ndarray:
+    """Returns the columns taken by _apply_ref_dagger, in order.
+
+    Args:
+        columns_no (int): number of columns, divisible by main_dim
+        permutation (np.ndarray): permutation of the reference, of length ``main_dim``
+
+    Returns:
+        np.ndarray: integer array of length ``columns_no``
+    """
+    main_dim = len(permutation)
+    columns = np.arange(columns_no)
+    main_columns = columns % main_dim
+    return columns - main_columns + np.argsort(permutation)[main_columns]
@@ -1,334 +1,1042 @@
-from typing import Tuple
+from contextlib import nullcontext
+from functools import cached_property, lru_cache
+from typing import Any, Callable, ContextManager, Dict, Optional, Tuple, Union, overload
 
 import numpy as np
-
-from .functions import ABS_TOLERANCE, REL_TOLERANCE, _get_dims, ket0
+from scipy import sparse
+
+from .budget import Deadline, PartialResult, _deadline, _OutOfTime
+from .functions import (
+    ABS_TOLERANCE,
+    REL_TOLERANCE,
+    MatrixLike,
+    _align_formats,
+    _allclose,
+    _apply_ref_dagger,
+    _clean_columns,
+    _clean_subspace,
+    _column_norms,
+    _dense_vector,
+    _eye,
+    _get_dims,
+    _kron,
+    _ref_dagger_columns,
+    _residual_states,
+)
+from .monomial import (
+    _MONOMIAL_CHECKS,
+    AnyMatrix,
+    MonomialMatrix,
+    _monomial_permutation,
+    _MonomialIntermediates,
+)
 from .reverse_kronecker_product import reverse_kronecker_product
+from .stats import COMPLEX_FLOPS, VerificationStats
+from .workspace import Workspace, _max_combined_deviation, _max_deviation
 
+# element type of the checks, None keeping the input, and the factor of their absolute
+# tolerance; relative tolerances are not scaled, as they bound deviations of order 1
+_PRECISIONS: Dict[str, Tuple[Optional[type], float]] = {
+    "double": (None, 1.0),
+    "single": (np.complex64, 1e4),
+}
 
-# Strict Clean Non-Wasting
-def verify_circuit_strict_clean_non_wasting(
-    tested_matrix: np.ndarray, ref_unitary: np.ndarray
-) -> Tuple[bool, str]:
-    """Verifies if tested_matrix is strict clean non-wasting based on reference matrix.
+# single-precision answers within this factor of the tolerance are recomputed in double
+DEFAULT_PRECISION_MARGIN = 10.0
 
-    Args:
-        tested_matrix (np.ndarray): the global matrix to be tested
-        ref_unitary (np.ndarray): true 0-1 unitary matrix
+# default relative tolerance of np.allclose, used by the norm checks
+_NUMPY_RTOL = 1e-5
 
-    Returns:
-        Tuple[bool, str]: flag denoting if the tested matrix is of given class, and reason if
-            it is not.
+# stages computing the intermediates shared by the checks, the only ones preceded by a
+# check of the deadline; the stages using them are finished even past the deadline
+_COSTLY_STAGES = frozenset({"projection", "rkp"})
+
+# factor of the absolute tolerance of the O(d) prescreens, which only reject clear
+# violations
+_PRESCREEN_MARGIN = 10.0
+
+
+class _Intermediates:
+    """Quantities shared between the verifiers, computed lazily and at most once.
+
+    Args:
+        tested_matrix (MatrixLike): the global matrix to be tested
+        ref_unitary (AnyMatrix): true 0-1 unitary matrix
+        precision (str): "double", or "single" to compute in complex64 with the
+            absolute tolerance scaled accordingly
+        workspace (Optional[Workspace]): buffers of the dense checks, a new one if None
+        stats (Optional[VerificationStats]): collector of the statistics of the stages
+        deadline (Optional[Deadline]): deadline checked before the costly stages
+        rng (Optional[np.random.Generator]): generator of the starting vector of the
+            reverse Kronecker product, for reproducible answers
     """
-    _, main_dim, aux_dim = _get_dims(tested_matrix, ref_unitary)
 
-    i = np.eye(main_dim)
-    ket_0 = ket0(aux_dim)
-    ket_0_i = np.kron(ket_0, i)
+    def __init__(
+        self,
+        tested_matrix: MatrixLike,
+        ref_unitary: AnyMatrix,
+        precision: str = "double",
+        workspace: Optional[Workspace] = None,
+        stats: Optional[VerificationStats] = None,
+        deadline: Optional[Deadline] = None,
+        rng: Optional[np.random.Generator] = None,
+    ) -> None:
+        if precision not in _PRECISIONS:
+            raise ValueError(f"Unknown precision {precision}")
+        self._dtype, self.tolerance_scale = _PRECISIONS[precision]
+        if self._dtype is not None:
+            tested_matrix = tested_matrix.astype(self._dtype, copy=False)
+        if sparse.issparse(tested_matrix):
+            tested_matrix = sparse.csr_matrix(tested_matrix)
+        self.tested_matrix = tested_matrix
+        self._reference = ref_unitary
+        self.global_dim, self.main_dim, self.aux_dim = _get_dims(
+            self.tested_matrix, ref_unitary
+        )
+        self.dense = not sparse.issparse(tested_matrix)
+        self.workspace = Workspace() if workspace is None else workspace
+        self.stats = stats
+        self.deadline = deadline
+        self.rng = rng
+
+    def allclose(
+        self,
+        a: MatrixLike,
+        b: Any,
+        atol: float = ABS_TOLERANCE,
+        rtol: float = REL_TOLERANCE,
+    ) -> bool:
+        """Same as _allclose, with the absolute tolerance scaled to the precision."""
+        return _allclose(a, b, atol=atol * self.tolerance_scale, rtol=rtol)
+
+    def close_to_identity(
+        self,
+        matrix: np.ndarray,
+        columns: np.ndarray,
+        scale: complex = 1.0,
+        absolute: bool = False,
+    ) -> bool:
+        """Same as ``allclose(f(matrix[:, columns]) - I, 0.0)`` for a dense matrix.
+
+        ``f`` multiplies by ``scale``, or takes the magnitudes if ``absolute`` is set.
+        The deviation is reduced block by block in the workspace, without allocating
+        the intermediate matrices.
+        """
+        atol = ABS_TOLERANCE * self.tolerance_scale
+        deviation = _max_deviation(
+            matrix,
+            columns,
+            np.arange(matrix.shape[0]),
+            self.workspace,
+            scale=scale,
+            absolute=absolute,
+            limit=atol,
+        )
+        return deviation <= atol
+
+    @cached_property
+    def ref_unitary(self) -> MatrixLike:
+        """The reference in the format of the tested matrix, built on first use."""
+        reference = self._reference
+        if isinstance(reference, MonomialMatrix):
+            ref_unitary = reference.tocsr()
+        else:
+            ref_unitary = reference
+        if self._dtype is not None:
+            ref_unitary = ref_unitary.astype(self._dtype, copy=False)
+        return _align_formats(self.tested_matrix, ref_unitary)[1]
+
+    @cached_property
+    def ref_permutation(self) -> np.ndarray:
+        return _monomial_permutation(self._reference)
+
+    @cached_property
+    def clean_product(self) -> MatrixLike:
+        """The clean-ancilla block multiplied by the inverse of the reference."""
+        with self.stage("reference"):
+            block = _clean_subspace(self.tested_matrix, self.main_dim)
+            return _apply_ref_dagger(block, self.ref_permutation)
+
+    @cached_property
+    def clean_columns(self) -> MatrixLike:
+        return _clean_columns(self.tested_matrix, self.main_dim)
+
+    @cached_property
+    def clean_residual_states(self) -> MatrixLike:
+        flops = COMPLEX_FLOPS * self.aux_dim * self.main_dim**2
+        with self.stage("projection", flops):
+            return _residual_states(
+                self.clean_columns, self.ref_unitary, self.main_dim, self.aux_dim
+            )
+
+    @cached_property
+    def residual_states(self) -> MatrixLike:
+        flops = COMPLEX_FLOPS * self.global_dim**2
+        with self.stage("projection", flops):
+            return _residual_states(
+                self.tested_matrix, self.ref_unitary, self.main_dim, self.aux_dim
+            )
+
+    @cached_property
+    def reference_entries(self) -> np.ndarray:
+        """Entries ``U[c, pi(b); c, b]`` moving each basis input as the reference does,
+        with the auxiliary state kept, as an ``aux_dim x main_dim`` array."""
+        offsets = self.main_dim * np.arange(self.aux_dim)[:, None]
+        rows = offsets + self.ref_permutation
+        columns = offsets + np.arange(self.main_dim)
+        return self._entries(rows, columns).reshape(rows.shape)
+
+    @cached_property
+    def clean_norms(self) -> np.ndarray:
+        """Norms of the residual states ``(I (x) <pi(b)|) U |0, b>``, read in O(d)."""
+        rows = self.main_dim * np.arange(self.aux_dim)[:, None] + self.ref_permutation
+        columns = np.broadcast_to(np.arange(self.main_dim), rows.shape)
+        entries = self._entries(rows, columns).reshape(rows.shape)
+        return np.linalg.norm(entries, axis=0)
+
+    def _entries(self, rows: np.ndarray, columns: np.ndarray) -> np.ndarray:
+        entries = self.tested_matrix[rows.ravel(), columns.ravel()]
+        return entries if self.dense else _dense_vector(entries)
+
+    @cached_property
+    def kronecker_factors(self) -> Tuple[np.ndarray, np.ndarray]:
+        # a product with the rearranged matrix and its adjoint per iteration
+        with self.stage("rkp", 2 * COMPLEX_FLOPS * self.global_dim**2):
+            return reverse_kronecker_product(
+                self.tested_matrix, (self.aux_dim, self.aux_dim), self.rng
+            )
+
+    def stage(self, name: str, flops: int = 0) -> ContextManager[None]:
+        """Records a stage in the statistics, if they are collected.
+
+        Raises _OutOfTime instead if the deadline has passed and the stage is one of
+        _COSTLY_STAGES. A running stage is not interrupted, and the stages comparing its
+        results run to completion, so that its cost is not wasted.
+        """
+        if self.deadline is not None and name in _COSTLY_STAGES:
+            self.deadline.check()
+        if self.stats is None:
+            return nullcontext()
+        return self.stats.stage(name, flops)
+
+
+def _check_strict_clean_non_wasting(data: _Intermediates) -> Tuple[bool, str]:
+    flops = COMPLEX_FLOPS * data.main_dim**2
+    if data.dense:
+        block = _clean_subspace(data.tested_matrix, data.main_dim)
+        with data.stage("reference"):
+            columns = _ref_dagger_columns(data.main_dim, data.ref_permutation)
+        with data.stage("tolerance", flops):
+            phase = np.conjugate(block[0, columns[0]])
+            passed = data.close_to_identity(block, columns, scale=phase)
+    else:
+        m = data.clean_product
+        with data.stage("tolerance", flops):
+            generated_unitary = m * np.conjugate(m[0, 0]) - _eye(data.main_dim, m)
+            passed = data.allclose(generated_unitary, 0.0)
+
+    if not passed:
+        return False, "Generated matrix should be all 0"
 
-    tested_matrix = ket_0_i @ tested_matrix @ ket_0_i.T
+    return True, ""
 
-    m = tested_matrix @ ref_unitary.conj().T
-    generated_unitary = m * np.conjugate(m[0, 0]) - np.eye(main_dim)
 
-    if not np.allclose(generated_unitary, 0.0, atol=ABS_TOLERANCE, rtol=REL_TOLERANCE):
+def _check_relative_clean_non_wasting(data: _Intermediates) -> Tuple[bool, str]:
+    flops = COMPLEX_FLOPS * data.main_dim**2
+    if data.dense:
+        block = _clean_subspace(data.tested_matrix, data.main_dim)
+        with data.stage("reference"):
+            columns = _ref_dagger_columns(data.main_dim, data.ref_permutation)
+        with data.stage("tolerance", flops):
+            passed = data.close_to_identity(block, columns, absolute=True)
+    else:
+        m = data.clean_product
+        with data.stage("tolerance", flops):
+            generated_unitary = abs(m) - _eye(data.main_dim, m)
+            passed = data.allclose(generated_unitary, 0.0)
+
+    if not passed:
+        return False, "Generated matrix should be all 0"
+    return True, ""
+
+
+def _check_strict_dirty_non_wasting(data: _Intermediates) -> Tuple[bool, str]:
+    flops = COMPLEX_FLOPS * data.global_dim**2
+    if data.dense:
+        matrix = data.tested_matrix
+        with data.stage("reference"):
+            columns = _ref_dagger_columns(data.global_dim, data.ref_permutation)
+        with data.stage("tolerance", flops):
+            phase = np.conjugate(matrix[0, columns[0]])
+            passed = data.close_to_identity(matrix, columns, scale=phase)
+    else:
+        with data.stage("reference"):
+            m = _apply_ref_dagger(data.tested_matrix, data.ref_permutation)
+        with data.stage("tolerance", flops):
+            generated_unitary = np.conjugate(m[0, 0]) * m - _eye(data.global_dim, m)
+            passed = data.allclose(generated_unitary, 0.0)
+
+    if not passed:
         return False, "Generated matrix should be all 0"
 
     return True, ""
 
 
-# Relative Clean Non-Wasting
-def verify_circuit_relative_clean_non_wasting(
-    tested_matrix: np.ndarray, ref_unitary: np.ndarray
-) -> Tuple[bool, str]:
-    """Verifies if tested_matrix is relative clean non-wasting based on reference matrix.
+def _check_relative_dirty_non_wasting(data: _Intermediates) -> Tuple[bool, str]:
+    w, v = data.kronecker_factors
 
-    Args:
-        tested_matrix (np.ndarray): the global matrix to be tested
-        ref_unitary (np.ndarray): true 0-1 unitary matrix
+    with data.stage("tolerance", COMPLEX_FLOPS * data.aux_dim**2):
+        passed = data.allclose(np.conjugate(w[0, 0]) * w, np.eye(data.aux_dim))
+    if not passed:
+        return False, "Matrix W should be identity"
 
-    Returns:
-        Tuple[bool, str]: flag denoting if the tested matrix is of given class, and reason if
-            it is not.
-    """
-    _, main_dim, aux_dim = _get_dims(tested_matrix, ref_unitary)
-    ket_0_i = np.kron(ket0(aux_dim), np.eye(main_dim))
+    with data.stage("reference"):
+        check_v = _apply_ref_dagger(np.abs(v), data.ref_permutation)
+    with data.stage("tolerance", COMPLEX_FLOPS * data.main_dim**2):
+        generated_unitary = check_v - np.eye(data.main_dim)
+        passed = data.allclose(generated_unitary, 0.0)
 
-    tested_matrix = ket_0_i @ tested_matrix @ ket_0_i.T
+    if not passed:
+        return False, "Generated matrix V should be all 0"
 
-    m = tested_matrix @ ref_unitary.conj().T
-    generated_unitary = np.abs(m) - np.eye(main_dim)
+    return True, ""
+
+
+def _check_strict_clean_wasting_entangled(data: _Intermediates) -> Tuple[bool, str]:
+    res = data.clean_residual_states
+    with data.stage("tolerance", COMPLEX_FLOPS * data.aux_dim * data.main_dim):
+        passed = data.allclose(_column_norms(res), 1.0, rtol=_NUMPY_RTOL)
+    if not passed:
+        return False, "The length should be 1"
 
-    if not np.allclose(generated_unitary, 0.0, atol=ABS_TOLERANCE, rtol=REL_TOLERANCE):
-        return False, "Generated matrix should be all 0"
     return True, ""
 
 
-# Strict Dirty Non-Wasting
-def verify_circuit_strict_dirty_non_wasting(
-    tested_matrix: np.ndarray, ref_unitary: np.ndarray
+def _check_strict_dirty_wasting_entangled(data: _Intermediates) -> Tuple[bool, str]:
+    # (I (x) <pi(b)|) U |c, b>, for all the basis pairs at once
+    res = data.residual_states
+    with data.stage("tolerance", COMPLEX_FLOPS * data.aux_dim * data.global_dim):
+        passed = data.allclose(_column_norms(res), 1.0, rtol=_NUMPY_RTOL)
+    if not passed:
+        return False, "The length should be 1"
+    return True, ""
+
+
+def _check_strict_clean_wasting_separable(data: _Intermediates) -> Tuple[bool, str]:
+    res = data.clean_residual_states
+    with data.stage("tolerance", COMPLEX_FLOPS * data.aux_dim * data.main_dim):
+        # this is to get the |\phi_0>
+        phi_0 = _dense_vector(res[:, 0])
+        passed = data.allclose(_dense_vector(phi_0.conj() @ res), 1, rtol=_NUMPY_RTOL)
+
+    if not passed:
+        return False, "The state should be a quantum state"
+
+    return True, ""
+
+
+def _check_relative_clean_wasting_separable(data: _Intermediates) -> Tuple[bool, str]:
+    columns = data.clean_columns
+    main_dim, aux_dim = data.main_dim, data.aux_dim
+
+    with data.stage("tolerance", COMPLEX_FLOPS * aux_dim * main_dim**2):
+        if data.dense:
+            # psi = (I (x) <pi(0)|) U |0, 0>, the reference is a 0-1 matrix
+            psi = columns[:, 0].reshape((aux_dim, main_dim))
+            psi = psi[:, data.ref_permutation[0]]
+            atol = ABS_TOLERANCE * data.tolerance_scale
+            deviation = _max_combined_deviation(
+                columns,
+                psi.conj(),
+                np.argsort(data.ref_permutation),
+                data.workspace,
+                rtol=REL_TOLERANCE,
+                limit=atol,
+            )
+            passed = deviation <= atol
+        else:
+            psi = _dense_vector(
+                columns[:, 0].reshape((aux_dim, main_dim)) @ data.ref_unitary[:, 0]
+            )
+            generated_unitary = abs(
+                _kron(psi.conj()[None, :], _eye(main_dim, columns)) @ columns
+            )
+            passed = data.allclose(generated_unitary, data.ref_unitary)
+
+    if not passed:
+        return False, "Resulting matrix should be identity"
+    return True, ""
+
+
+def _check_strict_dirty_wasting_separable(data: _Intermediates) -> Tuple[bool, str]:
+    w, v = data.kronecker_factors
+    with data.stage("tolerance", COMPLEX_FLOPS * data.aux_dim**3):
+        # check if w is unitary
+        check_w = w @ w.conj().T
+        passed = data.allclose(check_w, np.eye(data.aux_dim))
+
+    if not passed:
+        return False, "Not separable unitary matrix"
+
+    # X_1 * X_2^dagger * np.conj((X_1 * X_2^dagger)[0,0]) = I
+    with data.stage("reference"):
+        m = _apply_ref_dagger(v, data.ref_permutation)
+    with data.stage("tolerance", COMPLEX_FLOPS * data.main_dim**2):
+        generated_unitary = m * np.conjugate(m[0, 0])
+        passed = data.allclose(generated_unitary, np.eye(data.main_dim))
+
+    if not passed:
+        return False, "Resulting matrix should be an Identity"
+    return True, ""
+
+
+def _check_relative_dirty_wasting_separable(data: _Intermediates) -> Tuple[bool, str]:
+    w, v = data.kronecker_factors
+    with data.stage("tolerance", COMPLEX_FLOPS * data.aux_dim**3):
+        # check if w is unitary
+        check_w = w @ w.conj().T
+        passed = data.allclose(check_w, np.eye(data.aux_dim))
+
+    if not passed:
+        return False, "Resulting matrix should be identity"
+
+    with data.stage("reference"):
+        m = _apply_ref_dagger(v, data.ref_permutation)
+    with data.stage("tolerance", COMPLEX_FLOPS * data.main_dim**2):
+        generated_unitary = np.abs(m)
+        passed = data.allclose(generated_unitary, np.eye(data.main_dim))
+
+    if not passed:
+        return False, "Resulting matrix should be identity"
+    return True, ""
+
+
+# checks of all the classes, keyed by the class abbreviation
+_CHECKS: Dict[str, Callable[[_Intermediates], Tuple[bool, str]]] = {
+    "SCNW": _check_strict_clean_non_wasting,
+    "RCNW": _check_relative_clean_non_wasting,
+    "SDNW": _check_strict_dirty_non_wasting,
+    "RDNW": _check_relative_dirty_non_wasting,
+    "SCWE": _check_strict_clean_wasting_entangled,
+    "SCWS": _check_strict_clean_wasting_separable,
+    "RCWS": _check_relative_clean_wasting_separable,
+    "SDWE": _check_strict_dirty_wasting_entangled,
+    "SDWS": _check_strict_dirty_wasting_separable,
+    "RDWS": _check_relative_dirty_wasting_separable,
+}
+
+
+def _reference_anchor(data: _Intermediates) -> int:
+    """Returns the input ``b`` with ``pi(b) == 0``, which the strict checks take the
+    phase from."""
+    return int(np.flatnonzero(data.ref_permutation == 0)[0])
+
+
+def _prescreen_strict_clean_non_wasting(data: _Intermediates) -> bool:
+    entries = data.reference_entries[0]
+    phase = np.conjugate(entries[_reference_anchor(data)])
+    return data.allclose(entries * phase, 1.0)
+
+
+def _prescreen_relative_clean_non_wasting(data: _Intermediates) -> bool:
+    return data.allclose(abs(data.reference_entries[0]), 1.0)
+
+
+def _prescreen_strict_dirty_non_wasting(data: _Intermediates) -> bool:
+    entries = data.reference_entries
+    phase = np.conjugate(entries[0, _reference_anchor(data)])
+    return data.allclose(entries * phase, 1.0)
+
+
+def _prescreen_relative_dirty_non_wasting(data: _Intermediates) -> bool:
+    # the phases of the main system do not depend on the auxiliary state
+    entries = data.reference_entries
+    return data.allclose(abs(entries[0]), 1.0) and data.allclose(entries, entries[0])
+
+
+def _prescreen_wasting(data: _Intermediates) -> bool:
+    return data.allclose(data.clean_norms, 1.0, rtol=_NUMPY_RTOL)
+
+
+# necessary conditions of the classes read from O(d) entries of the tested matrix, and
+# the reason the full check gives when they fail
+_PRESCREENS: Dict[str, Tuple[Callable[[_Intermediates], bool], str]] = {
+    "SCNW": (_prescreen_strict_clean_non_wasting, "Generated matrix should be all 0"),
+    "RCNW": (_prescreen_relative_clean_non_wasting, "Generated matrix should be all 0"),
+    "SDNW": (_prescreen_strict_dirty_non_wasting, "Generated matrix should be all 0"),
+    "RDNW": (_prescreen_relative_dirty_non_wasting, "Matrix W should be identity"),
+    "SCWE": (_prescreen_wasting, "The length should be 1"),
+    "SCWS": (_prescreen_wasting, "The state should be a quantum state"),
+    "RCWS": (_prescreen_wasting, "Resulting matrix should be identity"),
+    "SDWE": (_prescreen_wasting, "The length should be 1"),
+    "SDWS": (_prescreen_wasting, "Not separable unitary matrix"),
+    "RDWS": (_prescreen_wasting, "Resulting matrix should be identity"),
+}
+
+
+def _prescreen(class_name: str, data: _Intermediates) -> Tuple[bool, str]:
+    """Checks the necessary conditions of a class in O(d), before the matrix products.
+
+    The absolute tolerance is loosened by _PRESCREEN_MARGIN, so that only clear
+    violations are rejected here and the borderline matrices are left to the full check.
+    """
+    condition, reason = _PRESCREENS[class_name]
+    with data.stage("prescreen", COMPLEX_FLOPS * data.global_dim):
+        scale = data.tolerance_scale
+        try:
+            data.tolerance_scale = scale * _PRESCREEN_MARGIN
+            passed = condition(data)
+        finally:
+            data.tolerance_scale = scale
+    if not passed:
+        return False, reason
+    return True, ""
+
+
+def _prescreened(
+    class_name: str, check: Callable[[_Intermediates], Tuple[bool, str]]
+) -> Callable[[_Intermediates], Tuple[bool, str]]:
+    """Wraps a check to run it only if the prescreen of the class passes."""
+
+    def prescreened(data: _Intermediates) -> Tuple[bool, str]:
+        flag, msg = _prescreen(class_name, data)
+        if not flag:
+            return flag, msg
+        return check(data)
+
+    return prescreened
+
+
+def _mixed_precision(
+    check: Callable[[_Intermediates], Tuple[bool, str]],
+    margin: float,
+    confirmation: Callable[[], _Intermediates],
+) -> Callable[[_Intermediates], Tuple[bool, str]]:
+    """Wraps a check run in single precision.
+
+    The answer is accepted if the check passes with the absolute tolerance divided by
+    ``margin``, and rejected if it fails with the absolute tolerance multiplied by it. In
+    between, rounding errors of complex64 could decide the answer, so the check is
+    recomputed in double precision with the same tolerances.
+    """
+
+    def mixed(data: _Intermediates) -> Tuple[bool, str]:
+        scale = data.tolerance_scale
+        try:
+            data.tolerance_scale = scale / margin
+            flag, msg = check(data)
+            if flag:
+                return flag, msg
+            data.tolerance_scale = scale * margin
+            flag, msg = check(data)
+            if not flag:
+                return flag, msg
+        finally:
+            data.tolerance_scale = scale
+        double_data = confirmation()
+        double_data.tolerance_scale = scale
+        return check(double_data)
+
+    return mixed
+
+
+def _before_deadline(
+    check: Callable[[_Intermediates], Tuple[bool, str]], deadline: Deadline
+) -> Callable[[_Intermediates], Tuple[bool, str]]:
+    """Wraps a check to raise _OutOfTime instead of starting it after the deadline."""
+
+    def timed(data: _Intermediates) -> Tuple[bool, str]:
+        deadline.check()
+        return check(data)
+
+    return timed
+
+
+def _measured(
+    check: Callable[[Any], Tuple[bool, str]],
+    class_name: str,
+    dim: int,
+    stats: VerificationStats,
+) -> Callable[[Any], Tuple[bool, str]]:
+    """Wraps a check to attribute its stages to the class in the statistics."""
+
+    def measured(data: Any) -> Tuple[bool, str]:
+        with stats.verifying(class_name, dim):
+            return check(data)
+
+    return measured
+
+
+def _prepare(
+    tested_matrix: AnyMatrix,
+    ref_unitary: AnyMatrix,
+    precision: str = "double",
+    margin: float = DEFAULT_PRECISION_MARGIN,
+    workspace: Optional[Workspace] = None,
+    stats: Optional[VerificationStats] = None,
+    deadline: Optional[Deadline] = None,
+    rng: Optional[np.random.Generator] = None,
+) -> Tuple[Any, Dict[str, Callable[[Any], Tuple[bool, str]]]]:
+    """Returns the shared intermediates and the checks of all the classes.
+
+    Monomial tested matrices are checked in O(d) by index arithmetic, other matrices by
+    the matrix checks, in single precision confirmed by double precision if requested.
+    The matrix checks first run the O(d) prescreen of their class, and skip the matrix
+    products and the reverse Kronecker product of the matrices it rejects.
+    With ``stats`` the checks record their stages in the statistics. With a ``deadline``
+    the matrix checks raise _OutOfTime if they start after it, or reach a costly stage
+    after it; the O(d) monomial checks always run to completion. An ``rng`` makes the
+    reverse Kronecker product, and so the answers, reproducible.
+    """
+    checks: Dict[str, Callable[[Any], Tuple[bool, str]]]
+    if isinstance(tested_matrix, MonomialMatrix):
+        data: Any = _MonomialIntermediates(tested_matrix, ref_unitary)
+        checks = dict(_MONOMIAL_CHECKS)
+    else:
+        data = _Intermediates(
+            tested_matrix, ref_unitary, precision, workspace, stats, deadline, rng
+        )
+        matrix_checks = {
+            class_name: _prescreened(class_name, check)
+            for class_name, check in _CHECKS.items()
+        }
+        if precision != "double":
+            # the double-precision intermediates are shared by all the confirmed checks
+            confirmation = lru_cache(maxsize=None)(
+                lambda: _Intermediates(
+                    tested_matrix,
+                    ref_unitary,
+                    workspace=data.workspace,
+                    stats=stats,
+                    deadline=deadline,
+                    rng=rng,
+                )
+            )
+            matrix_checks = {
+                class_name: _mixed_precision(check, margin, confirmation)
+                for class_name, check in matrix_checks.items()
+            }
+        if deadline is not None:
+            matrix_checks = {
+                class_name: _before_deadline(check, deadline)
+                for class_name, check in matrix_checks.items()
+            }
+        checks = dict(matrix_checks)
+    if stats is not None:
+        checks = {
+            class_name: _measured(check, class_name, tested_matrix.shape[0], stats)
+            for class_name, check in checks.items()
+        }
+    return data, checks
+
+
+@overload
+def _verify(
+    class_name: str,
+    tested_matrix: AnyMatrix,
+    ref_unitary: AnyMatrix,
+    precision: str = ...,
+    margin: float = ...,
+    workspace: Optional[Workspace] = ...,
+    stats: Optional[VerificationStats] = ...,
+    budget: None = ...,
 ) -> Tuple[bool, str]:
-    """Verifies if tested_matrix is strict dirty non-wasting based on reference matrix.
+    ...
+
+
+@overload
+def _verify(
+    class_name: str,
+    tested_matrix: AnyMatrix,
+    ref_unitary: AnyMatrix,
+    precision: str = ...,
+    margin: float = ...,
+    workspace: Optional[Workspace] = ...,
+    stats: Optional[VerificationStats] = ...,
+    budget: Optional[float] = ...,
+) -> Union[Tuple[bool, str], PartialResult]:
+    ...
+
+
+def _verify(
+    class_name: str,
+    tested_matrix: AnyMatrix,
+    ref_unitary: AnyMatrix,
+    precision: str = "double",
+    margin: float = DEFAULT_PRECISION_MARGIN,
+    workspace: Optional[Workspace] = None,
+    stats: Optional[VerificationStats] = None,
+    budget: Optional[float] = None,
+) -> Union[Tuple[bool, str], PartialResult]:
+    deadline = _deadline(budget)
+    data, checks = _prepare(
+        tested_matrix, ref_unitary, precision, margin, workspace, stats, deadline
+    )
+    if deadline is None:
+        return checks[class_name](data)
+    try:
+        answer = checks[class_name](data)
+    except _OutOfTime:
+        return PartialResult({}, (class_name,))
+    return PartialResult({class_name: answer}, overrun=deadline.overrun())
+
+
+# Strict Clean Non-Wasting
+def verify_circuit_strict_clean_non_wasting(
+    tested_matrix: AnyMatrix,
+    ref_unitary: AnyMatrix,
+    precision: str = "double",
+    margin: float = DEFAULT_PRECISION_MARGIN,
+    workspace: Optional[Workspace] = None,
+    stats: Optional[VerificationStats] = None,
+    budget: Optional[float] = None,
+) -> Union[Tuple[bool, str], PartialResult]:
+    """Verifies if tested_matrix is strict clean non-wasting based on reference matrix.
 
     Args:
-        tested_matrix (np.ndarray): the global matrix to be tested
-        ref_unitary (np.ndarray): true 0-1 unitary matrix
+        tested_matrix (AnyMatrix): the global matrix to be tested
+        ref_unitary (AnyMatrix): true 0-1 unitary matrix
+        precision (str): "double", or "single" to check in complex64 with the absolute
+            tolerance scaled by 1e4, and to recompute the answers within ``margin`` in
+            complex128
+        margin (float): factor of the tolerance deciding the single-precision answers
+        workspace (Optional[Workspace]): buffers of the dense checks, which batch callers
+            can reuse between calls
+        stats (Optional[VerificationStats]): collector of the time, FLOPs and memory of
+            the stages of the check
+        budget (Optional[float]): seconds the check may take, None for no limit; a
+            costly stage running past it is finished, and the overrun reported
 
     Returns:
-        Tuple[bool, str]: flag denoting if the tested matrix is of given class, and reason if
-            it is not.
+        Union[Tuple[bool, str], PartialResult]: flag denoting if the tested matrix is of
+            given class, and reason if it is not, or the PartialResult if a budget is
+            given.
     """
-    global_dim, _, aux_dim = _get_dims(tested_matrix, ref_unitary)
+    return _verify(
+        "SCNW", tested_matrix, ref_unitary, precision, margin, workspace, stats, budget
+    )
 
-    inverse_matrix = np.kron(np.eye(aux_dim), ref_unitary.conj().T)
 
-    m = tested_matrix @ inverse_matrix
-    generated_unitary = np.conjugate(m[0, 0]) * m - np.eye(global_dim)
+# Relative Clean Non-Wasting
+def verify_circuit_relative_clean_non_wasting(
+    tested_matrix: AnyMatrix,
+    ref_unitary: AnyMatrix,
+    precision: str = "double",
+    margin: float = DEFAULT_PRECISION_MARGIN,
+    workspace: Optional[Workspace] = None,
+    stats: Optional[VerificationStats] = None,
+    budget: Optional[float] = None,
+) -> Union[Tuple[bool, str], PartialResult]:
+    """Verifies if tested_matrix is relative clean non-wasting based on reference matrix.
 
-    if not np.allclose(generated_unitary, 0.0, atol=ABS_TOLERANCE, rtol=REL_TOLERANCE):
-        return False, "Generated matrix should be all 0"
+    Args:
+        tested_matrix (AnyMatrix): the global matrix to be tested
+        ref_unitary (AnyMatrix): true 0-1 unitary matrix
+        precision (str): "double", or "single" to check in complex64 with the absolute
+            tolerance scaled by 1e4, and to recompute the answers within ``margin`` in
+            complex128
+        margin (float): factor of the tolerance deciding the single-precision answers
+        workspace (Optional[Workspace]): buffers of the dense checks, which batch callers
+            can reuse between calls
+        stats (Optional[VerificationStats]): collector of the time, FLOPs and memory of
+            the stages of the check
+        budget (Optional[float]): seconds the check may take, None for no limit; a
+            costly stage running past it is finished, and the overrun reported
 
-    return True, ""
+    Returns:
+        Union[Tuple[bool, str], PartialResult]: flag denoting if the tested matrix is of
+            given class, and reason if it is not, or the PartialResult if a budget is
+            given.
+    """
+    return _verify(
+        "RCNW", tested_matrix, ref_unitary, precision, margin, workspace, stats, budget
+    )
 
 
-# Relative Dirty Non-Wasting
-def verify_circuit_relative_dirty_non_wasting(
-    tested_matrix: np.ndarray, ref_unitary: np.ndarray
-) -> Tuple[bool, str]:
-    """Verifies if tested_matrix is relative dirty non-wasting based on reference matrix.
+# Strict Dirty Non-Wasting
+def verify_circuit_strict_dirty_non_wasting(
+    tested_matrix: AnyMatrix,
+    ref_unitary: AnyMatrix,
+    precision: str = "double",
+    margin: float = DEFAULT_PRECISION_MARGIN,
+    workspace: Optional[Workspace] = None,
+    stats: Optional[VerificationStats] = None,
+    budget: Optional[float] = None,
+) -> Union[Tuple[bool, str], PartialResult]:
+    """Verifies if tested_matrix is strict dirty non-wasting based on reference matrix.
 
     Args:
-        tested_matrix (np.ndarray): the global matrix to be tested
-        ref_unitary (np.ndarray): true 0-1 unitary matrix
+        tested_matrix (AnyMatrix): the global matrix to be tested
+        ref_unitary (AnyMatrix): true 0-1 unitary matrix
+        precision (str): "double", or "single" to check in complex64 with the absolute
+            tolerance scaled by 1e4, and to recompute the answers within ``margin`` in
+            complex128
+        margin (float): factor of the tolerance deciding the single-precision answers
+        workspace (Optional[Workspace]): buffers of the dense checks, which batch callers
+            can reuse between calls
+        stats (Optional[VerificationStats]): collector of the time, FLOPs and memory of
+            the stages of the check
+        budget (Optional[float]): seconds the check may take, None for no limit; a
+            costly stage running past it is finished, and the overrun reported
 
     Returns:
-        Tuple[bool, str]: flag denoting if the tested matrix is of given class, and reason if
-            it is not.
+        Union[Tuple[bool, str], PartialResult]: flag denoting if the tested matrix is of
+            given class, and reason if it is not, or the PartialResult if a budget is
+            given.
     """
-    _, main_dim, aux_dim = _get_dims(tested_matrix, ref_unitary)
-
-    w, v = reverse_kronecker_product(tested_matrix, (aux_dim, aux_dim))
+    return _verify(
+        "SDNW", tested_matrix, ref_unitary, precision, margin, workspace, stats, budget
+    )
 
-    if not np.allclose(
-        np.conjugate(w[0, 0]) * w,
-        np.eye(aux_dim),
-        atol=ABS_TOLERANCE,
-        rtol=REL_TOLERANCE,
-    ):
-        return False, "Matrix W should be identity"
 
-    check_v = np.abs(v) @ ref_unitary.conj().T
-    generated_unitary = check_v - np.eye(main_dim)
+# Relative Dirty Non-Wasting
+def verify_circuit_relative_dirty_non_wasting(
+    tested_matrix: AnyMatrix,
+    ref_unitary: AnyMatrix,
+    precision: str = "double",
+    margin: float = DEFAULT_PRECISION_MARGIN,
+    workspace: Optional[Workspace] = None,
+    stats: Optional[VerificationStats] = None,
+    budget: Optional[float] = None,
+) -> Union[Tuple[bool, str], PartialResult]:
+    """Verifies if tested_matrix is relative dirty non-wasting based on reference matrix.
 
-    if not np.allclose(generated_unitary, 0.0, atol=ABS_TOLERANCE, rtol=REL_TOLERANCE):
-        return False, "Generated matrix V should be all 0"
+    Args:
+        tested_matrix (AnyMatrix): the global matrix to be tested
+        ref_unitary (AnyMatrix): true 0-1 unitary matrix
+        precision (str): "double", or "single" to check in complex64 with the absolute
+            tolerance scaled by 1e4, and to recompute the answers within ``margin`` in
+            complex128
+        margin (float): factor of the tolerance deciding the single-precision answers
+        workspace (Optional[Workspace]): buffers of the dense checks, which batch callers
+            can reuse between calls
+        stats (Optional[VerificationStats]): collector of the time, FLOPs and memory of
+            the stages of the check
+        budget (Optional[float]): seconds the check may take, None for no limit; a
+            costly stage running past it is finished, and the overrun reported
 
-    return True, ""
+    Returns:
+        Union[Tuple[bool, str], PartialResult]: flag denoting if the tested matrix is of
+            given class, and reason if it is not, or the PartialResult if a budget is
+            given.
+    """
+    return _verify(
+        "RDNW", tested_matrix, ref_unitary, precision, margin, workspace, stats, budget
+    )
 
 
 # Strict Clean Wasting-Entangled
 # Relative Clean Wasting-Entangled
 def verify_circuit_strict_clean_wasting_entangled(
-    tested_matrix: np.ndarray, ref_unitary: np.ndarray
-) -> Tuple[bool, str]:
+    tested_matrix: AnyMatrix,
+    ref_unitary: AnyMatrix,
+    precision: str = "double",
+    margin: float = DEFAULT_PRECISION_MARGIN,
+    workspace: Optional[Workspace] = None,
+    stats: Optional[VerificationStats] = None,
+    budget: Optional[float] = None,
+) -> Union[Tuple[bool, str], PartialResult]:
     """Verifies if tested_matrix is strict clean wasting entangled based on reference matrix.
 
     Args:
-        tested_matrix (np.ndarray): the global matrix to be tested
-        ref_unitary (np.ndarray): true 0-1 unitary matrix
+        tested_matrix (AnyMatrix): the global matrix to be tested
+        ref_unitary (AnyMatrix): true 0-1 unitary matrix
+        precision (str): "double", or "single" to check in complex64 with the absolute
+            tolerance scaled by 1e4, and to recompute the answers within ``margin`` in
+            complex128
+        margin (float): factor of the tolerance deciding the single-precision answers
+        workspace (Optional[Workspace]): buffers of the dense checks, which batch callers
+            can reuse between calls
+        stats (Optional[VerificationStats]): collector of the time, FLOPs and memory of
+            the stages of the check
+        budget (Optional[float]): seconds the check may take, None for no limit; a
+            costly stage running past it is finished, and the overrun reported
 
     Returns:
-        Tuple[bool, str]: flag denoting if the tested matrix is of given class, and reason if
-            it is not.
+        Union[Tuple[bool, str], PartialResult]: flag denoting if the tested matrix is of
+            given class, and reason if it is not, or the PartialResult if a budget is
+            given.
     """
-    _, main_dim, aux_dim = _get_dims(tested_matrix, ref_unitary)
-
-    i = np.eye(aux_dim)
-    ket_0 = ket0(aux_dim)
-
-    for idx in range(main_dim):
-        ket_b = np.zeros(main_dim)
-        ket_b[idx] = 1
-        b_0 = np.kron(ket_0, ket_b)
-        res = np.kron(i, ref_unitary @ ket_b) @ tested_matrix @ b_0
-        if not np.isclose(np.linalg.norm(res), 1.0):
-            return False, "The length should be 1"
-
-    return True, ""
+    return _verify(
+        "SCWE", tested_matrix, ref_unitary, precision, margin, workspace, stats, budget
+    )
 
 
 # Strict Dirty Wasting-Entangled
 def verify_circuit_strict_dirty_wasting_entangled(
-    tested_matrix: np.ndarray, ref_unitary: np.ndarray
-) -> Tuple[bool, str]:
+    tested_matrix: AnyMatrix,
+    ref_unitary: AnyMatrix,
+    precision: str = "double",
+    margin: float = DEFAULT_PRECISION_MARGIN,
+    workspace: Optional[Workspace] = None,
+    stats: Optional[VerificationStats] = None,
+    budget: Optional[float] = None,
+) -> Union[Tuple[bool, str], PartialResult]:
     """Verifies if tested_matrix is strict dirty wasting entangled based on reference matrix.
 
     Args:
-        tested_matrix (np.ndarray): the global matrix to be tested
-        ref_unitary (np.ndarray): true 0-1 unitary matrix
+        tested_matrix (AnyMatrix): the global matrix to be tested
+        ref_unitary (AnyMatrix): true 0-1 unitary matrix
+        precision (str): "double", or "single" to check in complex64 with the absolute
+            tolerance scaled by 1e4, and to recompute the answers within ``margin`` in
+            complex128
+        margin (float): factor of the tolerance deciding the single-precision answers
+        workspace (Optional[Workspace]): buffers of the dense checks, which batch callers
+            can reuse between calls
+        stats (Optional[VerificationStats]): collector of the time, FLOPs and memory of
+            the stages of the check
+        budget (Optional[float]): seconds the check may take, None for no limit; a
+            costly stage running past it is finished, and the overrun reported
 
     Returns:
-        Tuple[bool, str]: flag denoting if the tested matrix is of given class, and reason if
-            it is not.
+        Union[Tuple[bool, str], PartialResult]: flag denoting if the tested matrix is of
+            given class, and reason if it is not, or the PartialResult if a budget is
+            given.
     """
-
-    _, main_dim, aux_dim = _get_dims(tested_matrix, ref_unitary)
-
-    i = np.eye(aux_dim)
-
-    ket_b = np.zeros(main_dim)
-    ket_c = np.zeros(aux_dim)
-    for idx_b in range(main_dim):
-        ket_b[idx_b] = 1.0
-        ket_pib = np.kron(i, (ref_unitary @ ket_b))
-
-        for idx_c in range(aux_dim):
-            ket_c[idx_c] = 1.0
-            ket_bc = np.kron(ket_c, ket_b)
-            res = ket_pib @ tested_matrix @ ket_bc
-            if not np.isclose(np.linalg.norm(res), 1.0):
-                return False, "The length should be 1"
-            ket_c[idx_c] = 0.0
-        ket_b[idx_b] = 0.0
-    return True, ""
+    return _verify(
+        "SDWE", tested_matrix, ref_unitary, precision, margin, workspace, stats, budget
+    )
 
 
 # Strict Clean Wasting-Separable
 def verify_circuit_strict_clean_wasting_separable(
-    tested_matrix: np.ndarray, ref_unitary: np.ndarray
-) -> Tuple[bool, str]:
+    tested_matrix: AnyMatrix,
+    ref_unitary: AnyMatrix,
+    precision: str = "double",
+    margin: float = DEFAULT_PRECISION_MARGIN,
+    workspace: Optional[Workspace] = None,
+    stats: Optional[VerificationStats] = None,
+    budget: Optional[float] = None,
+) -> Union[Tuple[bool, str], PartialResult]:
     """Verifies if tested_matrix is strict clean wasting separable based on reference matrix.
 
     Args:
-        tested_matrix (np.ndarray): the global matrix to be tested
-        ref_unitary (np.ndarray): true 0-1 unitary matrix
+        tested_matrix (AnyMatrix): the global matrix to be tested
+        ref_unitary (AnyMatrix): true 0-1 unitary matrix
+        precision (str): "double", or "single" to check in complex64 with the absolute
+            tolerance scaled by 1e4, and to recompute the answers within ``margin`` in
+            complex128
+        margin (float): factor of the tolerance deciding the single-precision answers
+        workspace (Optional[Workspace]): buffers of the dense checks, which batch callers
+            can reuse between calls
+        stats (Optional[VerificationStats]): collector of the time, FLOPs and memory of
+            the stages of the check
+        budget (Optional[float]): seconds the check may take, None for no limit; a
+            costly stage running past it is finished, and the overrun reported
 
     Returns:
-        Tuple[bool, str]: flag denoting if the tested matrix is of given class, and reason if
-            it is not.
+        Union[Tuple[bool, str], PartialResult]: flag denoting if the tested matrix is of
+            given class, and reason if it is not, or the PartialResult if a budget is
+            given.
     """
-    _, main_dim, aux_dim = _get_dims(tested_matrix, ref_unitary)
-
-    i = np.eye(aux_dim)
-    ket_0 = ket0(aux_dim)
-
-    phi_0 = np.zeros(aux_dim)
-    for idx in range(main_dim):
-        ket_b = np.zeros(main_dim)
-        ket_b[idx] = 1
-        b_0 = np.kron(ket_0, ket_b)
-        res = np.kron(i, ref_unitary @ ket_b) @ tested_matrix @ b_0
-        # this is to get the |\phi_0>
-        if idx == 0:
-            phi_0 = res
-
-        if not np.isclose(np.vdot(phi_0, res), 1):
-            return False, "The state should be a quantum state"
-        ket_b[idx] = 0
-
-    return True, ""
+    return _verify(
+        "SCWS", tested_matrix, ref_unitary, precision, margin, workspace, stats, budget
+    )
 
 
 # Relative Clean Wasting-Separable
 def verify_circuit_relative_clean_wasting_separable(
-    tested_matrix: np.ndarray, ref_unitary: np.ndarray
-) -> Tuple[bool, str]:
+    tested_matrix: AnyMatrix,
+    ref_unitary: AnyMatrix,
+    precision: str = "double",
+    margin: float = DEFAULT_PRECISION_MARGIN,
+    workspace: Optional[Workspace] = None,
+    stats: Optional[VerificationStats] = None,
+    budget: Optional[float] = None,
+) -> Union[Tuple[bool, str], PartialResult]:
     """Verifies if tested_matrix is relative clean wasting separable based on reference matrix.
 
     Args:
-        tested_matrix (np.ndarray): the global matrix to be tested
-        ref_unitary (np.ndarray): true 0-1 unitary matrix
+        tested_matrix (AnyMatrix): the global matrix to be tested
+        ref_unitary (AnyMatrix): true 0-1 unitary matrix
+        precision (str): "double", or "single" to check in complex64 with the absolute
+            tolerance scaled by 1e4, and to recompute the answers within ``margin`` in
+            complex128
+        margin (float): factor of the tolerance deciding the single-precision answers
+        workspace (Optional[Workspace]): buffers of the dense checks, which batch callers
+            can reuse between calls
+        stats (Optional[VerificationStats]): collector of the time, FLOPs and memory of
+            the stages of the check
+        budget (Optional[float]): seconds the check may take, None for no limit; a
+            costly stage running past it is finished, and the overrun reported
 
     Returns:
-        Tuple[bool, str]: flag denoting if the tested matrix is of given class, and reason if
-            it is not.
+        Union[Tuple[bool, str], PartialResult]: flag denoting if the tested matrix is of
+            given class, and reason if it is not, or the PartialResult if a budget is
+            given.
     """
-    global_dim, main_dim, aux_dim = _get_dims(tested_matrix, ref_unitary)
-
-    i_c = np.eye(aux_dim)
-    i_b = np.eye(main_dim)
-    ket_0b = ket0(main_dim)
-    ket_0c = ket0(aux_dim)
-    ket_0bc = ket0(global_dim)
-
-    psi = np.kron(i_c, ref_unitary @ ket_0b) @ tested_matrix @ ket_0bc
-
-    generated_unitary = np.abs(
-        np.kron(psi.conj().T, i_b) @ tested_matrix @ np.kron(ket_0c, i_b).conj().T
+    return _verify(
+        "RCWS", tested_matrix, ref_unitary, precision, margin, workspace, stats, budget
     )
 
-    if not np.allclose(
-        generated_unitary, ref_unitary, atol=ABS_TOLERANCE, rtol=REL_TOLERANCE
-    ):
-        return False, "Resulting matrix should be identity"
-    return True, ""
-
 
 # Strict Dirty Wasting-Separable
 def verify_circuit_strict_dirty_wasting_separable(
-    tested_matrix: np.ndarray, ref_unitary: np.ndarray
-) -> Tuple[bool, str]:
+    tested_matrix: AnyMatrix,
+    ref_unitary: AnyMatrix,
+    precision: str = "double",
+    margin: float = DEFAULT_PRECISION_MARGIN,
+    workspace: Optional[Workspace] = None,
+    stats: Optional[VerificationStats] = None,
+    budget: Optional[float] = None,
+) -> Union[Tuple[bool, str], PartialResult]:
     """Verifies if tested_matrix is strict dirty wasting separable based on reference matrix.
 
     Args:
-        tested_matrix (np.ndarray): the global matrix to be tested
-        ref_unitary (np.ndarray): true 0-1 unitary matrix
+        tested_matrix (AnyMatrix): the global matrix to be tested
+        ref_unitary (AnyMatrix): true 0-1 unitary matrix
+        precision (str): "double", or "single" to check in complex64 with the absolute
+            tolerance scaled by 1e4, and to recompute the answers within ``margin`` in
+            complex128
+        margin (float): factor of the tolerance deciding the single-precision answers
+        workspace (Optional[Workspace]): buffers of the dense checks, which batch callers
+            can reuse between calls
+        stats (Optional[VerificationStats]): collector of the time, FLOPs and memory of
+            the stages of the check
+        budget (Optional[float]): seconds the check may take, None for no limit; a
+            costly stage running past it is finished, and the overrun reported
 
     Returns:
-        Tuple[bool, str]: flag denoting if the tested matrix is of given class, and reason if
-            it is not.
+        Union[Tuple[bool, str], PartialResult]: flag denoting if the tested matrix is of
+            given class, and reason if it is not, or the PartialResult if a budget is
+            given.
     """
-    _, main_dim, aux_dim = _get_dims(tested_matrix, ref_unitary)
-
-    w, v = reverse_kronecker_product(tested_matrix, (aux_dim, aux_dim))
-    # check if w is unitary
-    check_w = w @ w.conj().T
-
-    if not np.allclose(
-        check_w, np.eye(aux_dim), atol=ABS_TOLERANCE, rtol=REL_TOLERANCE
-    ):
-        return False, "Not separable unitary matrix"
-
-    # X_1 * X_2^dagger * np.conj((X_1 * X_2^dagger)[0,0]) = I
-    m = v @ ref_unitary.T
-    generated_unitary = m * np.conjugate(m[0, 0])
-
-    if not np.allclose(
-        generated_unitary, np.eye(main_dim), atol=ABS_TOLERANCE, rtol=REL_TOLERANCE
-    ):
-        return False, "Resulting matrix should be an Identity"
-    return True, ""
+    return _verify(
+        "SDWS", tested_matrix, ref_unitary, precision, margin, workspace, stats, budget
+    )
 
 
 # Relative Dirty Wasting-Separable
 def verify_circuit_relative_dirty_wasting_separable(
-    tested_matrix: np.ndarray, ref_unitary: np.ndarray
-) -> Tuple[bool, str]:
+    tested_matrix: AnyMatrix,
+    ref_unitary: AnyMatrix,
+    precision: str = "double",
+    margin: float = DEFAULT_PRECISION_MARGIN,
+    workspace: Optional[Workspace] = None,
+    stats: Optional[VerificationStats] = None,
+    budget: Optional[float] = None,
+) -> Union[Tuple[bool, str], PartialResult]:
     """Verifies if tested_matrix is relative dirty wasting separable based on reference matrix.
 
     Args:
-        tested_matrix (np.ndarray): the global matrix to be tested
-        ref_unitary (np.ndarray): true 0-1 unitary matrix
+        tested_matrix (AnyMatrix): the global matrix to be tested
+        ref_unitary (AnyMatrix): true 0-1 unitary matrix
+        precision (str): "double", or "single" to check in complex64 with the absolute
+            tolerance scaled by 1e4, and to recompute the answers within ``margin`` in
+            complex128
+        margin (float): factor of the tolerance deciding the single-precision answers
+        workspace (Optional[Workspace]): buffers of the dense checks, which batch callers
+            can reuse between calls
+        stats (Optional[VerificationStats]): collector of the time, FLOPs and memory of
+            the stages of the check
+        budget (Optional[float]): seconds the check may take, None for no limit; a
+            costly stage running past it is finished, and the overrun reported
 
     Returns:
-        Tuple[bool, str]: flag denoting if the tested matrix is of given class, and reason if
-            it is not.
+        Union[Tuple[bool, str], PartialResult]: flag denoting if the tested matrix is of
+            given class, and reason if it is not, or the PartialResult if a budget is
+            given.
     """
-    _, main_dim, aux_dim = _get_dims(tested_matrix, ref_unitary)
-
-    w, v = reverse_kronecker_product(tested_matrix, (aux_dim, aux_dim))
-    # check if w is unitary
-    check_w = w @ w.conj().T
-
-    if not np.allclose(
-        check_w, np.eye(aux_dim), atol=ABS_TOLERANCE, rtol=REL_TOLERANCE
-    ):
-        return False, "Resulting matrix should be identity"
-
-    generated_unitary = np.abs(v @ ref_unitary.T)
-
-    if not np.allclose(
-        generated_unitary, np.eye(main_dim), atol=ABS_TOLERANCE, rtol=REL_TOLERANCE
-    ):
-        return False, "Resulting matrix should be identity"
-    return True, ""
+    return _verify(
+        "RDWS", tested_matrix, ref_unitary, precision, margin, workspace, stats, budget
+    )
@@ -0,0 +1,272 @@
+from typing import Callable, Dict, Tuple, Union
+
+import numpy as np
+from scipy import sparse
+
+from .functions import (
+    ABS_TOLERANCE,
+    REL_TOLERANCE,
+    MatrixLike,
+    _get_dims,
+    _ref_permutation,
+)
+
+
+class MonomialMatrix:
+    """Square matrix with a single nonzero entry in each row and column.
+
+    Column ``j`` has the entry ``phases[j]`` in row ``permutation[j]``. Compositions of
+    permutations and diagonal phases, such as strict and relative Toffoli constructions,
+    are stored in O(d) memory.
+
+    Args:
+        permutation (np.ndarray): integer array, row of the nonzero entry of each column
+        phases (np.ndarray): complex array, the nonzero entry of each column
+    """
+
+    def __init__(self, permutation: np.ndarray, phases: np.ndarray) -> None:
+        permutation = np.asarray(permutation, dtype=np.int64)
+        phases = np.asarray(phases, dtype=complex)
+        if permutation.shape != phases.shape or permutation.ndim != 1:
+            raise ValueError(
+                "Permutation and phases should be vectors of the same length"
+            )
+        if not np.array_equal(
+            np.bincount(permutation, minlength=len(permutation)),
+            np.ones(len(permutation)),
+        ):
+            raise ValueError("Not a permutation")
+        self.permutation = permutation
+        self.phases = phases
+
+    @property
+    def shape(self) -> Tuple[int, int]:
+        return len(self.permutation), len(self.permutation)
+
+    @classmethod
+    def from_matrix(cls, matrix: MatrixLike) -> "MonomialMatrix":
+        """Converts a dense or sparse monomial matrix.
+
+        Entries not exceeding ``ABS_TOLERANCE`` in modulus, e.g. rounding errors of a
+        simulated unitary, are treated as zeros.
+
+        Args:
+            matrix (MatrixLike): matrix with a single nonzero entry in each row and column
+
+        Returns:
+            MonomialMatrix: the same matrix in the monomial representation
+        """
+        entries = sparse.coo_matrix(matrix)
+        entries.data[np.abs(entries.data) <= ABS_TOLERANCE] = 0.0
+        entries.eliminate_zeros()
+        if matrix.shape[0] != matrix.shape[1] or not np.array_equal(
+            np.sort(entries.col), np.arange(matrix.shape[1])
+        ):
+            raise ValueError("Matrix should have a single nonzero entry in each column")
+        permutation = np.zeros(matrix.shape[1], dtype=np.int64)
+        phases = np.zeros(matrix.shape[1], dtype=complex)
+        permutation[entries.col] = entries.row
+        phases[entries.col] = entries.data
+        return cls(permutation, phases)
+
+    def tocsr(self) -> sparse.csr_matrix:
+        columns = np.arange(len(self.permutation))
+        return sparse.csr_matrix(
+            (self.phases, (self.permutation, columns)), shape=self.shape
+        )
+
+    def toarray(self) -> np.ndarray:
+        return self.tocsr().toarray()
+
+
+# matrices accepted by the verifiers
+AnyMatrix = Union[MatrixLike, MonomialMatrix]
+
+
+def mct_reference(controls_no: int) -> MonomialMatrix:
+    """Returns the multi-controlled X gate, the reference of the MCT implementations.
+
+    The controls are the qubits ``0, ..., controls_no - 1`` and the target is the qubit
+    ``controls_no``, in the little-endian order of qiskit. The gate swaps the two basis
+    states with all the controls set, so it is built in O(d) without any decompression
+    or dense matrix; ``toarray`` materializes it on request.
+
+    Args:
+        controls_no (int): number of controls
+
+    Returns:
+        MonomialMatrix: the permutation matrix of the gate
+    """
+    if controls_no < 1:
+        raise ValueError("Number of controls must be >= 1")
+    permutation = np.arange(2 ** (controls_no + 1))
+    controls = 2**controls_no - 1
+    permutation[[controls, controls + 2**controls_no]] = [
+        controls + 2**controls_no,
+        controls,
+    ]
+    return MonomialMatrix(permutation, np.ones(len(permutation)))
+
+
+def _monomial_permutation(ref_unitary: AnyMatrix) -> np.ndarray:
+    if isinstance(ref_unitary, MonomialMatrix):
+        if not np.allclose(ref_unitary.phases, 1.0):
+            raise ValueError("Reference matrix should be a 0-1 unitary matrix")
+        return ref_unitary.permutation
+    return _ref_permutation(ref_unitary)
+
+
+def _is_one(values: np.ndarray) -> bool:
+    return bool(np.all(np.abs(values - 1.0) <= ABS_TOLERANCE + REL_TOLERANCE))
+
+
+def _is_zero(values: np.ndarray) -> bool:
+    return bool(np.all(np.abs(values) <= ABS_TOLERANCE))
+
+
+class _MonomialIntermediates:
+    """Index arithmetic shared between the monomial checks, all arrays are O(d).
+
+    Args:
+        tested_matrix (MonomialMatrix): the global matrix to be tested
+        ref_unitary (AnyMatrix): true 0-1 unitary matrix
+    """
+
+    def __init__(self, tested_matrix: MonomialMatrix, ref_unitary: AnyMatrix) -> None:
+        self.global_dim, self.main_dim, self.aux_dim = _get_dims(
+            tested_matrix, ref_unitary
+        )
+        self.ref_permutation = _monomial_permutation(ref_unitary)
+        self.phases = tested_matrix.phases
+
+        # input column |c, b> is mapped to the row |aux_out, main_out>
+        columns = np.arange(self.global_dim)
+        self.aux_in, self.main_in = np.divmod(columns, self.main_dim)
+        self.aux_out, self.main_out = np.divmod(
+            tested_matrix.permutation, self.main_dim
+        )
+        # whether the main output of each column agrees with the reference
+        self.matches = self.main_out == self.ref_permutation[self.main_in]
+
+    @property
+    def clean_phase(self) -> complex:
+        """The entry of the clean-ancilla block in row 0 of the product with U^dagger."""
+        return self.phases[np.argmax(self.ref_permutation == 0)]
+
+    def non_wasting(self, columns: slice) -> bool:
+        """Whether the auxiliary system is left unchanged by the given columns."""
+        return bool(
+            np.all(self.matches[columns])
+            and np.array_equal(self.aux_out[columns], self.aux_in[columns])
+        )
+
+    def wasting_separable(self) -> bool:
+        """Whether each column |c, b> is mapped to |sigma(c), pi(b)>."""
+        sigma = self.aux_out[:: self.main_dim]
+        return bool(
+            np.all(self.matches) and np.array_equal(self.aux_out, sigma[self.aux_in])
+        )
+
+
+def _check_strict_clean_non_wasting(data: _MonomialIntermediates) -> Tuple[bool, str]:
+    clean = slice(0, data.main_dim)
+    phase = np.conjugate(data.clean_phase)
+    if not data.non_wasting(clean) or not _is_zero(data.phases[clean] * phase - 1.0):
+        return False, "Generated matrix should be all 0"
+    return True, ""
+
+
+def _check_relative_clean_non_wasting(data: _MonomialIntermediates) -> Tuple[bool, str]:
+    clean = slice(0, data.main_dim)
+    if not data.non_wasting(clean) or not _is_zero(np.abs(data.phases[clean]) - 1.0):
+        return False, "Generated matrix should be all 0"
+    return True, ""
+
+
+def _check_strict_dirty_non_wasting(data: _MonomialIntermediates) -> Tuple[bool, str]:
+    phase = np.conjugate(data.clean_phase)
+    if not data.non_wasting(slice(None)) or not _is_zero(data.phases * phase - 1.0):
+        return False, "Generated matrix should be all 0"
+    return True, ""
+
+
+def _check_relative_dirty_non_wasting(data: _MonomialIntermediates) -> Tuple[bool, str]:
+    if not data.non_wasting(slice(None)):
+        return False, "Matrix W should be identity"
+    phases = data.phases.reshape(data.aux_dim, data.main_dim)
+    if not _is_zero(phases - phases[0]):
+        return False, "Matrix W should be identity"
+    if not _is_zero(np.abs(phases[0]) - 1.0):
+        return False, "Generated matrix V should be all 0"
+    return True, ""
+
+
+def _check_strict_wasting_entangled(
+    data: _MonomialIntermediates, columns: slice
+) -> Tuple[bool, str]:
+    norms = np.where(data.matches[columns], np.abs(data.phases[columns]), 0.0)
+    if not np.allclose(norms, 1.0):
+        return False, "The length should be 1"
+    return True, ""
+
+
+def _clean_overlaps(data: _MonomialIntermediates) -> np.ndarray:
+    """Overlaps <phi_0|phi_b> of the clean-ancilla residual states."""
+    clean = slice(0, data.main_dim)
+    same_state = data.matches[clean] & (data.aux_out[clean] == data.aux_out[0])
+    overlaps = np.conjugate(data.phases[0]) * data.phases[clean]
+    return np.where(same_state & data.matches[0], overlaps, 0.0)
+
+
+def _check_strict_clean_wasting_separable(
+    data: _MonomialIntermediates,
+) -> Tuple[bool, str]:
+    if not np.allclose(_clean_overlaps(data), 1):
+        return False, "The state should be a quantum state"
+    return True, ""
+
+
+def _check_relative_clean_wasting_separable(
+    data: _MonomialIntermediates,
+) -> Tuple[bool, str]:
+    if not _is_one(np.abs(_clean_overlaps(data))):
+        return False, "Resulting matrix should be identity"
+    return True, ""
+
+
+def _check_strict_dirty_wasting_separable(
+    data: _MonomialIntermediates,
+) -> Tuple[bool, str]:
+    phases = data.phases.reshape(data.aux_dim, data.main_dim)
+    if not data.wasting_separable() or not _is_zero(np.abs(phases[:, 0]) - 1.0):
+        return False, "Not separable unitary matrix"
+    if not _is_zero(phases - phases[:, :1]):
+        return False, "Resulting matrix should be an Identity"
+    return True, ""
+
+
+def _check_relative_dirty_wasting_separable(
+    data: _MonomialIntermediates,
+) -> Tuple[bool, str]:
+    phases = data.phases.reshape(data.aux_dim, data.main_dim)
+    if not data.wasting_separable() or not _is_zero(np.abs(phases) - 1.0):
+        return False, "Resulting matrix should be identity"
+    # the phases have to factorize as w_c * v_b
+    if not _is_zero(phases * phases[0, 0] - np.outer(phases[:, 0], phases[0])):
+        return False, "Resulting matrix should be identity"
+    return True, ""
+
+
+# O(d) checks of all the classes, keyed by the class abbreviation
+_MONOMIAL_CHECKS: Dict[str, Callable[[_MonomialIntermediates], Tuple[bool, str]]] = {
+    "SCNW": _check_strict_clean_non_wasting,
+    "RCNW": _check_relative_clean_non_wasting,
+    "SDNW": _check_strict_dirty_non_wasting,
+    "RDNW": _check_relative_dirty_non_wasting,
+    "SCWE": lambda data: _check_strict_wasting_entangled(data, slice(0, data.main_dim)),
+    "SCWS": _check_strict_clean_wasting_separable,
+    "RCWS": _check_relative_clean_wasting_separable,
+    "SDWE": lambda data: _check_strict_wasting_entangled(data, slice(None)),
+    "SDWS": _check_strict_dirty_wasting_separable,
+    "RDWS": _check_relative_dirty_wasting_separable,
+}
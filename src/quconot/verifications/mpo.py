@@ -0,0 +1,601 @@
+from typing import TYPE_CHECKING, Callable, Dict, Iterable, List, Optional, Tuple, Union
+
+import numpy as np
+from qiskit import QuantumCircuit
+from scipy import sparse
+
+from .decision_diagram import _CLEAN_CLASSES, _flatten_controlled
+from .functions import ABS_TOLERANCE, MatrixLike, _split_dims
+from .streaming import _as_circuit
+
+if TYPE_CHECKING:
+    from ..implementations.mct_base import MCTBase
+
+# largest bond dimension allowed by default
+DEFAULT_MAX_BOND = 256
+
+# singular values below this fraction of the largest one at a bond are truncated
+_CUTOFF = 1e-12
+
+
+def _rank(singular_values: np.ndarray, max_bond: int) -> int:
+    """Returns the number of singular values kept, at least one."""
+    rank = max(1, int(np.sum(singular_values > _CUTOFF * singular_values[0])))
+    if rank > max_bond:
+        raise ValueError(f"Bond dimension {rank} exceeds the maximum of {max_bond}")
+    return rank
+
+
+def _decompose(
+    tensor: np.ndarray, dims: List[Tuple[int, int]], max_bond: int
+) -> List[np.ndarray]:
+    """Splits a tensor with the axes ``(o_0, i_0, o_1, i_1, ...)`` into site tensors."""
+    tensors = []
+    rest = tensor.reshape(1, -1)
+    for out_dim, in_dim in dims[:-1]:
+        left = rest.shape[0]
+        u, s, vh = np.linalg.svd(
+            rest.reshape(left * out_dim * in_dim, -1), full_matrices=False
+        )
+        rank = _rank(s, max_bond)
+        tensors.append(u[:, :rank].reshape(left, out_dim, in_dim, rank))
+        rest = s[:rank, None] * vh[:rank]
+    tensors.append(rest.reshape(rest.shape[0], dims[-1][0], dims[-1][1], 1))
+    return tensors
+
+
+def _left_canonical(tensors: List[np.ndarray], stop: int) -> List[np.ndarray]:
+    """Orthonormalizes the sites before ``stop`` by QR decompositions, moving the norm
+    to the site ``stop``."""
+    tensors = list(tensors)
+    for k in range(stop):
+        left, out_dim, in_dim, right = tensors[k].shape
+        q, r = np.linalg.qr(tensors[k].reshape(left * out_dim * in_dim, right))
+        tensors[k] = q.reshape(left, out_dim, in_dim, -1)
+        tensors[k + 1] = np.tensordot(r, tensors[k + 1], axes=(1, 0))
+    return tensors
+
+
+def _right_canonical(tensors: List[np.ndarray], stop: int) -> List[np.ndarray]:
+    """Orthonormalizes the sites after ``stop``, moving the norm to the site ``stop``."""
+    tensors = list(tensors)
+    for k in range(len(tensors) - 1, stop, -1):
+        left, out_dim, in_dim, right = tensors[k].shape
+        q, r = np.linalg.qr(tensors[k].reshape(left, out_dim * in_dim * right).T)
+        tensors[k] = q.T.reshape(-1, out_dim, in_dim, right)
+        tensors[k - 1] = np.tensordot(tensors[k - 1], r.T, axes=(3, 0))
+    return tensors
+
+
+def _compress(tensors: List[np.ndarray], max_bond: int) -> List[np.ndarray]:
+    """Truncates the bonds to the singular values above the cutoff."""
+    tensors = _left_canonical(tensors, len(tensors) - 1)
+    for k in range(len(tensors) - 1, 0, -1):
+        left, out_dim, in_dim, right = tensors[k].shape
+        u, s, vh = np.linalg.svd(
+            tensors[k].reshape(left, out_dim * in_dim * right), full_matrices=False
+        )
+        rank = _rank(s, max_bond)
+        tensors[k] = vh[:rank].reshape(rank, out_dim, in_dim, right)
+        tensors[k - 1] = np.tensordot(
+            tensors[k - 1], u[:, :rank] * s[:rank], axes=(3, 0)
+        )
+    return tensors
+
+
+def _multiply_sites(a: np.ndarray, b: np.ndarray) -> np.ndarray:
+    """Returns the site tensor of the product of two operators."""
+    product = np.einsum("aoxb,cxid->acoibd", a, b)
+    return product.reshape(
+        a.shape[0] * b.shape[0], a.shape[1], b.shape[2], a.shape[3] * b.shape[3]
+    )
+
+
+def _direct_sum(a: List[np.ndarray], b: List[np.ndarray]) -> List[np.ndarray]:
+    """Returns the site tensors of the sum of two operators."""
+    if len(a) == 1:
+        return [a[0] + b[0]]
+    tensors = [np.concatenate((a[0], b[0]), axis=3)]
+    for x, y in zip(a[1:-1], b[1:-1]):
+        left, right = x.shape[0], x.shape[3]
+        tensor = np.zeros(
+            (left + y.shape[0], x.shape[1], x.shape[2], right + y.shape[3]),
+            dtype=complex,
+        )
+        tensor[:left, :, :, :right] = x
+        tensor[left:, :, :, right:] = y
+        tensors.append(tensor)
+    tensors.append(np.concatenate((a[-1], b[-1]), axis=0))
+    return tensors
+
+
+def _identity_site(bond: int = 1) -> np.ndarray:
+    return np.einsum("lr,oi->loir", np.eye(bond), np.eye(2))
+
+
+def _gate_tensors(
+    matrix: np.ndarray, targets: Tuple[int, ...], controls: Dict[int, int]
+) -> Tuple[int, List[np.ndarray]]:
+    """Returns the first site and the site tensors of a gate on the sites it spans.
+
+    Args:
+        matrix (np.ndarray): matrix of the gate, little-endian in the targets
+        targets (Tuple[int, ...]): target qubits
+        controls (Dict[int, int]): control qubits and the values activating the gate
+
+    Returns:
+        Tuple[int, List[np.ndarray]]: first site, and the tensors up to the last site
+    """
+    # a controlled gate is I + |controls><controls| (x) (matrix - I)
+    block = matrix - np.eye(len(matrix)) if controls else matrix
+    arity = len(targets)
+    order = np.argsort(targets)
+    axes = [a for j in order for a in (arity - 1 - j, 2 * arity - 1 - j)]
+    target_tensors = iter(
+        _decompose(
+            block.reshape((2,) * (2 * arity)).transpose(axes),
+            [(2, 2)] * arity,
+            4**arity,
+        )
+    )
+
+    sites = sorted(set(targets) | set(controls))
+    tensors, bond = [], 1
+    for site in range(sites[0], sites[-1] + 1):
+        if site in targets:
+            tensor = next(target_tensors)
+            bond = tensor.shape[3]
+        elif site in controls:
+            projector = np.zeros((2, 2))
+            projector[controls[site], controls[site]] = 1.0
+            tensor = np.einsum("lr,oi->loir", np.eye(bond), projector)
+        else:
+            tensor = _identity_site(bond)
+        tensors.append(tensor)
+
+    if controls:
+        tensors = _direct_sum([_identity_site() for _ in tensors], tensors)
+    return sites[0], tensors
+
+
+class MatrixProductOperator:
+    """Operator on a chain of qubits as a product of site tensors.
+
+    The site ``k`` is the qubit ``k`` and holds a tensor with the axes (left bond, output,
+    input, right bond). Bonds are compressed by singular value decompositions after every
+    gate, so circuits with little operator entanglement between the two sides of any cut,
+    such as linear chains of Toffoli gates, are stored in memory polynomial in the number
+    of qubits. Inputs fixed to a basis state have dimension 1.
+
+    Args:
+        tensors (List[np.ndarray]): site tensors, from the least significant qubit
+        max_bond (int): largest bond dimension allowed
+    """
+
+    def __init__(
+        self, tensors: List[np.ndarray], max_bond: int = DEFAULT_MAX_BOND
+    ) -> None:
+        self.tensors = tensors
+        self.max_bond = max_bond
+
+    @property
+    def num_qubits(self) -> int:
+        return len(self.tensors)
+
+    @property
+    def bond_dimensions(self) -> List[int]:
+        return [tensor.shape[3] for tensor in self.tensors[:-1]]
+
+    @classmethod
+    def identity(
+        cls, num_qubits: int, max_bond: int = DEFAULT_MAX_BOND
+    ) -> "MatrixProductOperator":
+        return cls([_identity_site() for _ in range(num_qubits)], max_bond)
+
+    @classmethod
+    def from_circuit(
+        cls,
+        circuit: Union[QuantumCircuit, "MCTBase"],
+        clean_qubits: int = 0,
+        max_bond: int = DEFAULT_MAX_BOND,
+    ) -> "MatrixProductOperator":
+        """Builds the operator of a circuit gate by gate.
+
+        With ``clean_qubits`` the most significant qubits start in |0>, i.e. only the
+        columns ``U (|0> (x) I)`` are kept.
+
+        Args:
+            circuit (Union[QuantumCircuit, MCTBase]): the circuit or the MCT implementation
+            clean_qubits (int): number of most significant qubits starting in |0>
+            max_bond (int): largest bond dimension allowed
+
+        Returns:
+            MatrixProductOperator: the operator of the circuit
+
+        Raises:
+            ValueError: if a bond dimension exceeds ``max_bond``
+        """
+        circuit = _as_circuit(circuit)
+        gates, global_phase = _flatten_controlled(circuit)
+        num_qubits = circuit.num_qubits
+
+        zero = np.eye(2)[:, :1].reshape(1, 2, 1, 1)
+        tensors = [_identity_site() for _ in range(num_qubits - clean_qubits)]
+        tensors += [zero for _ in range(clean_qubits)]
+        for matrix, targets, controls in gates:
+            start, gate = _gate_tensors(matrix, targets, controls)
+            for site, tensor in enumerate(gate, start):
+                tensors[site] = _multiply_sites(tensor, tensors[site])
+            tensors = _compress(tensors, max_bond)
+        tensors[0] = np.exp(1j * global_phase) * tensors[0]
+        return cls(tensors, max_bond)
+
+    @classmethod
+    def from_matrix(
+        cls, matrix: MatrixLike, max_bond: int = DEFAULT_MAX_BOND
+    ) -> "MatrixProductOperator":
+        """Decomposes a matrix of size a power of two.
+
+        Args:
+            matrix (MatrixLike): the matrix
+            max_bond (int): largest bond dimension allowed
+
+        Returns:
+            MatrixProductOperator: the operator of the matrix
+        """
+        if sparse.issparse(matrix):
+            matrix = sparse.csr_matrix(matrix).toarray()
+        num_qubits = int(np.log2(matrix.shape[0]))
+        # axes (o_{n-1}, ..., o_0, i_{n-1}, ..., i_0) in the order (o_0, i_0, o_1, ...)
+        axes = [
+            a
+            for q in range(num_qubits)
+            for a in (num_qubits - 1 - q, 2 * num_qubits - 1 - q)
+        ]
+        tensor = np.asarray(matrix, dtype=complex).reshape((2,) * (2 * num_qubits))
+        return cls(
+            _decompose(tensor.transpose(axes), [(2, 2)] * num_qubits, max_bond),
+            max_bond,
+        )
+
+    def __matmul__(self, other: "MatrixProductOperator") -> "MatrixProductOperator":
+        if self.num_qubits != other.num_qubits:
+            raise ValueError("Operators should have the same number of qubits")
+        tensors = [_multiply_sites(a, b) for a, b in zip(self.tensors, other.tensors)]
+        return MatrixProductOperator(_compress(tensors, self.max_bond), self.max_bond)
+
+    def __add__(self, other: "MatrixProductOperator") -> "MatrixProductOperator":
+        return MatrixProductOperator(
+            _direct_sum(self.tensors, other.tensors), self.max_bond
+        )
+
+    def __sub__(self, other: "MatrixProductOperator") -> "MatrixProductOperator":
+        return self + other * -1.0
+
+    def __mul__(self, scalar: complex) -> "MatrixProductOperator":
+        return MatrixProductOperator(
+            [scalar * self.tensors[0]] + self.tensors[1:], self.max_bond
+        )
+
+    def adjoint(self) -> "MatrixProductOperator":
+        return MatrixProductOperator(
+            [tensor.conj().transpose(0, 2, 1, 3) for tensor in self.tensors],
+            self.max_bond,
+        )
+
+    def extended(self, other: "MatrixProductOperator") -> "MatrixProductOperator":
+        """Returns ``other (x) self``, with ``other`` on more significant qubits."""
+        return MatrixProductOperator(self.tensors + other.tensors, self.max_bond)
+
+    def fixed(
+        self,
+        sites: Iterable[int],
+        output: Optional[int] = None,
+        input: Optional[int] = None,
+    ) -> "MatrixProductOperator":
+        """Restricts the output, the input, or both, of the sites to a basis state."""
+        tensors = list(self.tensors)
+        for site in sites:
+            if output is not None:
+                tensors[site] = tensors[site][:, [output]]
+            if input is not None:
+                tensors[site] = tensors[site][:, :, [input]]
+        return MatrixProductOperator(tensors, self.max_bond)
+
+    def projected(self, sites: Iterable[int]) -> "MatrixProductOperator":
+        """Returns ``(|0><0| (x) I) @ self`` for the projector on |0> of the sites."""
+        tensors = list(self.tensors)
+        for site in sites:
+            tensors[site] = tensors[site] * np.array([1.0, 0.0])[None, :, None, None]
+        return MatrixProductOperator(tensors, self.max_bond)
+
+    def with_identity(self, sites: Iterable[int]) -> "MatrixProductOperator":
+        """Replaces the sites with fixed output and input by the identity, scaled by the
+        fixed entry, e.g. ``I (x) phi`` of the restriction to ``<0| . |0> (x) phi``."""
+        tensors = list(self.tensors)
+        for site in sites:
+            tensors[site] = np.einsum("lr,oi->loir", tensors[site][:, 0, 0], np.eye(2))
+        return MatrixProductOperator(tensors, self.max_bond)
+
+    def diagonal(self, sites: Iterable[int]) -> "MatrixProductOperator":
+        """Returns the operator with the entries changing the given sites set to 0."""
+        tensors = list(self.tensors)
+        for site in sites:
+            tensors[site] = tensors[site] * np.eye(2)[None, :, :, None]
+        return MatrixProductOperator(tensors, self.max_bond)
+
+    def norm(self) -> float:
+        """Frobenius norm, computed on the left-canonical form for accuracy."""
+        return float(
+            np.linalg.norm(_left_canonical(self.tensors, self.num_qubits - 1)[-1])
+        )
+
+    def trace(self) -> complex:
+        result = np.ones(1)
+        for tensor in self.tensors:
+            result = result @ np.einsum("loor->lr", tensor)
+        return complex(result[0])
+
+    def split(
+        self, cut: int, tolerance: float
+    ) -> Optional[Tuple["MatrixProductOperator", "MatrixProductOperator"]]:
+        """Splits the operator into ``right (x) left`` at the bond before the site ``cut``.
+
+        The operator Schmidt values at the bond are those of the rearranged matrix of the
+        reverse Kronecker product, so the split exists iff all but the first vanish.
+
+        Args:
+            cut (int): first site of the more significant factor
+            tolerance (float): largest Frobenius norm of the neglected remainder
+
+        Returns:
+            Optional[Tuple[MatrixProductOperator, MatrixProductOperator]]: the less and the
+                more significant factors, or None if the operator is not a product
+        """
+        tensors = _right_canonical(_left_canonical(self.tensors, cut), cut)
+        left, out_dim, in_dim, right = tensors[cut].shape
+        u, s, vh = np.linalg.svd(
+            tensors[cut].reshape(left, out_dim * in_dim * right), full_matrices=False
+        )
+        if np.sqrt(np.sum(s[1:] ** 2)) > tolerance:
+            return None
+        tensors[cut - 1] = np.tensordot(tensors[cut - 1], u[:, :1] * s[0], axes=(3, 0))
+        tensors[cut] = vh[:1].reshape(1, out_dim, in_dim, right)
+        return (
+            MatrixProductOperator(tensors[:cut], self.max_bond),
+            MatrixProductOperator(tensors[cut:], self.max_bond),
+        )
+
+    def toarray(self) -> np.ndarray:
+        # axes (rows, columns, bond), the next site is more significant
+        result = np.ones((1, 1, 1), dtype=complex)
+        for tensor in self.tensors:
+            rows, columns = result.shape[0], result.shape[1]
+            result = np.einsum("rcl,loid->oricd", result, tensor).reshape(
+                tensor.shape[1] * rows, tensor.shape[2] * columns, tensor.shape[3]
+            )
+        return result[:, :, 0]
+
+
+def _tolerance(mpo: MatrixProductOperator) -> float:
+    """Frobenius tolerance of an operator, ``ABS_TOLERANCE`` per column."""
+    columns = np.prod([float(tensor.shape[2]) for tensor in mpo.tensors])
+    return ABS_TOLERANCE * float(np.sqrt(columns))
+
+
+def _is_zero(mpo: MatrixProductOperator) -> bool:
+    return mpo.norm() <= _tolerance(mpo)
+
+
+def _phase(value: complex) -> complex:
+    return value / abs(value) if abs(value) > 0 else 1.0
+
+
+def _scaled_identity_difference(
+    mpo: MatrixProductOperator,
+) -> MatrixProductOperator:
+    """Returns ``mpo - e^{i theta} I`` for the phase of the trace, where sites with an
+    input fixed to |0> have the identity restricted to it."""
+    identity = MatrixProductOperator(
+        [
+            np.eye(*tensor.shape[1:3]).reshape(1, *tensor.shape[1:3], 1)
+            for tensor in mpo.tensors
+        ],
+        mpo.max_bond,
+    )
+    square = mpo.fixed(
+        [
+            k
+            for k, tensor in enumerate(mpo.tensors)
+            if tensor.shape[1] != tensor.shape[2]
+        ],
+        output=0,
+    )
+    return mpo - identity * _phase(square.trace())
+
+
+def _aux_sites(product: MatrixProductOperator, main_qubits: int) -> range:
+    return range(main_qubits, product.num_qubits)
+
+
+def _mpo_strict_clean_non_wasting(
+    product: MatrixProductOperator, main_qubits: int
+) -> Tuple[bool, str]:
+    block = product.fixed(_aux_sites(product, main_qubits), output=0)
+    if not _is_zero(_scaled_identity_difference(block)):
+        return False, "Generated matrix should be all 0"
+    return True, ""
+
+
+def _mpo_relative_clean_non_wasting(
+    product: MatrixProductOperator, main_qubits: int
+) -> Tuple[bool, str]:
+    block = product.projected(_aux_sites(product, main_qubits))
+    # the clean columns are |0> (x) D, D diagonal, and unitarity gives |D| = I
+    if not _is_zero(product - block.diagonal(range(main_qubits))):
+        return False, "Generated matrix should be all 0"
+    return True, ""
+
+
+def _mpo_strict_dirty_non_wasting(
+    product: MatrixProductOperator, main_qubits: int
+) -> Tuple[bool, str]:
+    if not _is_zero(_scaled_identity_difference(product)):
+        return False, "Generated matrix should be all 0"
+    return True, ""
+
+
+def _mpo_relative_dirty_non_wasting(
+    product: MatrixProductOperator, main_qubits: int
+) -> Tuple[bool, str]:
+    aux_sites = _aux_sites(product, main_qubits)
+    block = product.fixed(aux_sites, output=0, input=0)
+    if not _is_zero(product - block.with_identity(aux_sites)):
+        return False, "Matrix W should be identity"
+    if not _is_zero(block - block.diagonal(range(main_qubits))):
+        return False, "Generated matrix V should be all 0"
+    return True, ""
+
+
+def _mpo_strict_wasting_entangled(
+    product: MatrixProductOperator, main_qubits: int
+) -> Tuple[bool, str]:
+    # each column |c, b> is mapped to |phi_{c,b}> (x) |b>
+    if not _is_zero(product - product.diagonal(range(main_qubits))):
+        return False, "The length should be 1"
+    return True, ""
+
+
+def _residual_states(
+    product: MatrixProductOperator, main_qubits: int
+) -> MatrixProductOperator:
+    """Returns ``I (x) phi_0`` for the residual state of the column 0."""
+    main_sites = range(main_qubits)
+    return product.fixed(main_sites, output=0, input=0).with_identity(main_sites)
+
+
+def _mpo_strict_clean_wasting_separable(
+    product: MatrixProductOperator, main_qubits: int
+) -> Tuple[bool, str]:
+    if not _is_zero(product - _residual_states(product, main_qubits)):
+        return False, "The state should be a quantum state"
+    return True, ""
+
+
+def _mpo_relative_clean_wasting_separable(
+    product: MatrixProductOperator, main_qubits: int
+) -> Tuple[bool, str]:
+    states = _residual_states(product, main_qubits)
+    norm = states.norm() / np.sqrt(2.0**main_qubits)
+    if norm <= ABS_TOLERANCE:
+        return False, "Resulting matrix should be identity"
+    states = states * (1.0 / norm)
+    # (I (x) |psi><psi|) applied to the clean columns has to be D (x) |psi>, D diagonal
+    projection = (states @ states.adjoint()) @ product
+    if not _is_zero(product - projection.diagonal(range(main_qubits))):
+        return False, "Resulting matrix should be identity"
+    return True, ""
+
+
+def _mpo_wasting_separable(
+    product: MatrixProductOperator, main_qubits: int
+) -> Optional[MatrixProductOperator]:
+    """Returns the main factor of ``W (x) V``, normalized as a unitary, or None."""
+    if main_qubits == product.num_qubits:
+        return product
+    factors = product.split(main_qubits, _tolerance(product))
+    if factors is None:
+        return None
+    main = factors[0]
+    norm = main.norm()
+    if norm <= ABS_TOLERANCE:
+        return None
+    return main * (np.sqrt(2.0**main_qubits) / norm)
+
+
+def _mpo_strict_dirty_wasting_separable(
+    product: MatrixProductOperator, main_qubits: int
+) -> Tuple[bool, str]:
+    main = _mpo_wasting_separable(product, main_qubits)
+    if main is None:
+        return False, "Not separable unitary matrix"
+    if not _is_zero(_scaled_identity_difference(main)):
+        return False, "Resulting matrix should be an Identity"
+    return True, ""
+
+
+def _mpo_relative_dirty_wasting_separable(
+    product: MatrixProductOperator, main_qubits: int
+) -> Tuple[bool, str]:
+    main = _mpo_wasting_separable(product, main_qubits)
+    if main is None or not _is_zero(main - main.diagonal(range(main_qubits))):
+        return False, "Resulting matrix should be identity"
+    return True, ""
+
+
+_MPO_CHECKS: Dict[str, Callable[[MatrixProductOperator, int], Tuple[bool, str]]] = {
+    "SCNW": _mpo_strict_clean_non_wasting,
+    "RCNW": _mpo_relative_clean_non_wasting,
+    "SDNW": _mpo_strict_dirty_non_wasting,
+    "RDNW": _mpo_relative_dirty_non_wasting,
+    "SCWE": _mpo_strict_wasting_entangled,
+    "SCWS": _mpo_strict_clean_wasting_separable,
+    "RCWS": _mpo_relative_clean_wasting_separable,
+    "SDWE": _mpo_strict_wasting_entangled,
+    "SDWS": _mpo_strict_dirty_wasting_separable,
+    "RDWS": _mpo_relative_dirty_wasting_separable,
+}
+
+
+def verify_circuit_mpo(
+    circuit: Union[QuantumCircuit, "MCTBase"],
+    ref_unitary: Union[QuantumCircuit, MatrixLike],
+    class_name: str,
+    max_bond: int = DEFAULT_MAX_BOND,
+) -> Tuple[bool, str]:
+    """Verifies if the circuit is of the given class on matrix product operators.
+
+    The operator ``(I (x) U_ref^dagger) U`` is built as an MPO with the auxiliary qubits
+    as the last sites, and the class conditions are checked by contractions: blocks of
+    clean auxiliary qubits are projections of their sites on |0>, and the separability of
+    the wasting-separable classes is the operator Schmidt rank at the bond between the
+    main and the auxiliary sites. Identities are checked in the Frobenius norm, with a
+    tolerance of ``ABS_TOLERANCE`` per column.
+
+    Args:
+        circuit (Union[QuantumCircuit, MCTBase]): the circuit or the MCT implementation
+        ref_unitary (Union[QuantumCircuit, MatrixLike]): the reference circuit, or its
+            true 0-1 unitary matrix
+        class_name (str): class abbreviation, e.g. "SCNW" or "RDWS"
+        max_bond (int): largest bond dimension allowed
+
+    Returns:
+        Tuple[bool, str]: flag denoting if the circuit is of given class, and reason if
+            it is not.
+
+    Raises:
+        ValueError: if a bond dimension exceeds ``max_bond``
+    """
+    if class_name not in _MPO_CHECKS:
+        raise ValueError(f"Unknown class {class_name}")
+
+    circuit = _as_circuit(circuit)
+    if isinstance(ref_unitary, QuantumCircuit):
+        main_qubits = ref_unitary.num_qubits
+    else:
+        main_qubits = int(np.log2(ref_unitary.shape[0]))
+    _split_dims(2**circuit.num_qubits, 2**main_qubits)
+    clean_qubits = (
+        circuit.num_qubits - main_qubits if class_name in _CLEAN_CLASSES else 0
+    )
+
+    tested = MatrixProductOperator.from_circuit(circuit, clean_qubits, max_bond)
+    if isinstance(ref_unitary, QuantumCircuit):
+        reference = MatrixProductOperator.from_circuit(ref_unitary, max_bond=max_bond)
+    else:
+        reference = MatrixProductOperator.from_matrix(ref_unitary, max_bond)
+
+    # I (x) U_ref^dagger, the auxiliary qubits are the most significant ones
+    identity = MatrixProductOperator.identity(circuit.num_qubits - main_qubits)
+    lifted = reference.adjoint().extended(identity)
+    return _MPO_CHECKS[class_name](lifted @ tested, main_qubits)
@@ -0,0 +1,116 @@
+import json
+import os
+from typing import TYPE_CHECKING, Tuple, Union
+
+import numpy as np
+from qiskit import QuantumCircuit
+
+from .cache import circuit_fingerprint
+from .monomial import AnyMatrix
+from .simulation import DEFAULT_BLOCK_SIZE, _apply_gates, _flatten
+from .streaming import _as_circuit, verify_matrix_streaming
+
+if TYPE_CHECKING:
+    from ..implementations.mct_base import MCTBase
+
+
+def _checkpoint_path(path: str) -> str:
+    return path + ".checkpoint"
+
+
+def _read_checkpoint(path: str, fingerprint: str) -> int:
+    """Returns the number of columns already built for the circuit, 0 if none."""
+    try:
+        with open(_checkpoint_path(path), encoding="utf-8") as file:
+            checkpoint = json.load(file)
+    except (FileNotFoundError, json.JSONDecodeError):
+        return 0
+    if checkpoint.get("fingerprint") != fingerprint or not os.path.exists(path):
+        return 0
+    return int(checkpoint.get("columns", 0))
+
+
+def _write_checkpoint(path: str, fingerprint: str, columns: int) -> None:
+    temporary = _checkpoint_path(path) + ".tmp"
+    with open(temporary, "w", encoding="utf-8") as file:
+        json.dump({"fingerprint": fingerprint, "columns": columns}, file)
+    os.replace(temporary, _checkpoint_path(path))
+
+
+def build_unitary_memmap(
+    circuit: Union[QuantumCircuit, "MCTBase"],
+    path: Union[str, "os.PathLike[str]"],
+    block_size: int = DEFAULT_BLOCK_SIZE,
+) -> np.memmap:
+    """Builds the unitary of a circuit into a memory-mapped file, block by block.
+
+    Columns are simulated in blocks of ``block_size`` basis states and written to a
+    column-major ``complex128`` array in ``path``, so memory holds a single block of
+    state vectors while the file holds the ``2**n x 2**n`` unitary. After every block the
+    file is flushed and the number of finished columns is recorded in
+    ``path + ".checkpoint"`` with the fingerprint of the circuit, so a build interrupted
+    by a crash resumes from the last finished block of the same circuit.
+
+    Args:
+        circuit (Union[QuantumCircuit, MCTBase]): the circuit or the MCT implementation
+        path (Union[str, os.PathLike]): file of the unitary
+        block_size (int): number of columns simulated at once
+
+    Returns:
+        np.memmap: the unitary, opened read-only
+    """
+    circuit = _as_circuit(circuit)
+    path = os.fspath(path)
+    global_dim = 2**circuit.num_qubits
+    shape: Tuple[int, int] = (global_dim, global_dim)
+    fingerprint = circuit_fingerprint(circuit)
+
+    done = _read_checkpoint(path, fingerprint)
+    if done < global_dim:
+        unitary = np.memmap(
+            path,
+            dtype=np.complex128,
+            mode="r+" if done else "w+",
+            shape=shape,
+            order="F",
+        )
+        gates, global_phase = _flatten(circuit)
+        for start in range(done, global_dim, block_size):
+            stop = min(start + block_size, global_dim)
+            states = np.zeros((global_dim, stop - start))
+            states[np.arange(start, stop), np.arange(stop - start)] = 1.0
+            unitary[:, start:stop] = _apply_gates(
+                gates, global_phase, states, circuit.num_qubits
+            )
+            unitary.flush()
+            _write_checkpoint(path, fingerprint, stop)
+        del unitary
+    return np.memmap(path, dtype=np.complex128, mode="r", shape=shape, order="F")
+
+
+def verify_circuit_out_of_core(
+    circuit: Union[QuantumCircuit, "MCTBase"],
+    ref_unitary: AnyMatrix,
+    class_name: str,
+    path: Union[str, "os.PathLike[str]"],
+    block_size: int = DEFAULT_BLOCK_SIZE,
+) -> Tuple[bool, str]:
+    """Verifies if the circuit is of the given class through its unitary stored on disk.
+
+    The unitary is built, or its interrupted build resumed, by build_unitary_memmap, and
+    then read in blocks by verify_matrix_streaming. The file is kept, so the other
+    classes are verified without simulating the circuit again.
+
+    Args:
+        circuit (Union[QuantumCircuit, MCTBase]): the circuit or the MCT implementation
+        ref_unitary (AnyMatrix): true 0-1 unitary matrix
+        class_name (str): class abbreviation, e.g. "SCNW" or "RDWS"
+        path (Union[str, os.PathLike]): file of the unitary
+        block_size (int): number of columns simulated and read at once
+
+    Returns:
+        Tuple[bool, str]: flag denoting if the circuit is of given class, and reason if
+            it is not.
+    """
+    unitary = build_unitary_memmap(circuit, path, block_size)
+    return verify_matrix_streaming(unitary, ref_unitary, class_name, block_size)
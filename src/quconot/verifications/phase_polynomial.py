@@ -0,0 +1,357 @@
+from typing import TYPE_CHECKING, Dict, FrozenSet, List, Set, Tuple, Union
+
+import numpy as np
+from qiskit import QuantumCircuit
+from qiskit.circuit import Instruction
+from scipy import sparse
+
+from .monomial import (
+    _MONOMIAL_CHECKS,
+    AnyMatrix,
+    MonomialMatrix,
+    _MonomialIntermediates,
+)
+from .simulation import _small_matrix, _visit_operations
+from .streaming import _as_circuit
+
+if TYPE_CHECKING:
+    from ..implementations.mct_base import MCTBase
+
+# polynomial over GF(2): the set of its monomials, each a bit mask of the variables it
+# multiplies, the empty mask is the constant 1
+BooleanPolynomial = FrozenSet[int]
+
+# angles closer than this to a multiple of 2 pi are dropped
+_ANGLE_TOLERANCE = 1e-9
+
+
+def _wrap(angle: float) -> float:
+    """Returns the angle modulo 2 pi, in [-pi, pi)."""
+    return (angle + np.pi) % (2 * np.pi) - np.pi
+
+
+def _is_pi(angle: float) -> bool:
+    return abs(abs(_wrap(angle)) - np.pi) <= _ANGLE_TOLERANCE
+
+
+def _toggle(monomials: Set[int], monomial: int) -> None:
+    if monomial in monomials:
+        monomials.remove(monomial)
+    else:
+        monomials.add(monomial)
+
+
+def _multiply(a: BooleanPolynomial, b: BooleanPolynomial) -> BooleanPolynomial:
+    """Returns the product of two Boolean polynomials."""
+    product: Set[int] = set()
+    for left in a:
+        for right in b:
+            _toggle(product, left | right)
+    return frozenset(product)
+
+
+def _evaluate(values: np.ndarray, polynomial: BooleanPolynomial) -> np.ndarray:
+    """Returns the Boolean polynomial on the assignments of the variables in ``values``."""
+    result = np.zeros(len(values), dtype=bool)
+    for monomial in polynomial:
+        result ^= (values & monomial) == monomial
+    return result
+
+
+class PhasePolynomial:
+    """Sum-over-paths form of a circuit: Boolean outputs and a phase polynomial.
+
+    The basis state ``|x>`` is mapped to ``2**(-s/2) sum_y exp(i f(x, y)) |A(x, y)>``,
+    where ``y`` are the path variables introduced by Hadamard-like gates, each output bit
+    of ``A`` is a polynomial over GF(2), and ``f`` is a real multilinear polynomial taken
+    modulo 2 pi, whose coefficients are unique. A gate only updates the outputs of its
+    qubits and the phase of their products, so the cost of CNOT, Toffoli, T and relative
+    Toffoli gates depends on the size of these polynomials and not on d. Path variables
+    no longer in the outputs are summed over by the rule
+    ``sum_y (-1)^(y (z + Q)) = 2 [z = Q]`` for a path variable ``z``, so Hadamard gates
+    around Toffoli constructions leave no paths.
+
+    Args:
+        num_qubits (int): number of qubits
+    """
+
+    def __init__(self, num_qubits: int) -> None:
+        self.num_qubits = num_qubits
+        # output of each qubit, the variable i is the input bit of qubit i
+        self.outputs: List[BooleanPolynomial] = [
+            frozenset({1 << q}) for q in range(num_qubits)
+        ]
+        # angles of the non-constant monomials, and the global phase
+        self.terms: Dict[int, float] = {}
+        self.global_phase = 0.0
+        # bit masks of the path variables, the amplitudes are multiplied by 2**(-scale/2)
+        self.paths: Set[int] = set()
+        self.scale = 0
+        self._next_variable = num_qubits
+
+    @property
+    def num_paths(self) -> int:
+        return len(self.paths)
+
+    @classmethod
+    def from_circuit(
+        cls, circuit: Union[QuantumCircuit, "MCTBase"]
+    ) -> "PhasePolynomial":
+        """Builds the phase polynomial of a circuit.
+
+        Gates on at most three qubits that permute the basis states up to phases, e.g. X,
+        CNOT, Toffoli, T or relative Toffoli gates, and single-qubit gates with all
+        entries of modulus 1/sqrt(2), e.g. H, U2 or U3 with an angle of pi/2, are applied
+        directly. Other gates are decomposed.
+
+        Args:
+            circuit (Union[QuantumCircuit, MCTBase]): the circuit or the MCT implementation
+
+        Returns:
+            PhasePolynomial: the phase polynomial of the circuit
+        """
+        circuit = _as_circuit(circuit)
+        polynomial = cls(circuit.num_qubits)
+
+        # the gates add their phases while visited, so the sum is taken afterwards
+        global_phase = _visit_operations(circuit, polynomial._apply)
+        polynomial.global_phase += global_phase
+        polynomial._reduce_paths()
+        return polynomial
+
+    def _add_term(self, monomial: int, angle: float) -> None:
+        if monomial == 0:
+            self.global_phase += angle
+            return
+        angle = _wrap(self.terms.get(monomial, 0.0) + angle)
+        if abs(angle) > _ANGLE_TOLERANCE:
+            self.terms[monomial] = angle
+        else:
+            self.terms.pop(monomial, None)
+
+    def _add_phase(self, angle: float, polynomial: BooleanPolynomial) -> None:
+        """Adds the phase ``angle`` to the assignments where the polynomial is 1."""
+        # a + m = a + m - 2 a m over the reals for Boolean a and m
+        lifted: Dict[int, float] = {}
+        for monomial in polynomial:
+            update = {monomial: angle}
+            for other, coefficient in lifted.items():
+                product = other | monomial
+                update[product] = update.get(product, 0.0) - 2 * coefficient
+            for key, value in update.items():
+                # the coefficients are kept modulo 2 pi, so high degrees of T gates vanish
+                value = _wrap(lifted.get(key, 0.0) + value)
+                if abs(value) > _ANGLE_TOLERANCE:
+                    lifted[key] = value
+                else:
+                    lifted.pop(key, None)
+        for monomial, coefficient in lifted.items():
+            self._add_term(monomial, coefficient)
+
+    def _apply_monomial(
+        self, permutation: np.ndarray, angles: np.ndarray, qubits: Tuple[int, ...]
+    ) -> None:
+        """Applies the gate mapping ``|x>`` to ``exp(i angles[x]) |permutation[x]>``."""
+        arity = len(qubits)
+        # products of the outputs of the gate qubits, for each subset of them
+        products = [frozenset({0})]
+        for subset in range(1, 1 << arity):
+            low = subset & -subset
+            factor = self.outputs[qubits[low.bit_length() - 1]]
+            products.append(_multiply(products[subset ^ low], factor))
+
+        # multilinear coefficients of the angles over the reals and of the output bits
+        # over GF(2), by Moebius inversion
+        coefficients = angles.astype(float)
+        bits = (permutation[:, None] >> np.arange(arity)) & 1
+        for j in range(arity):
+            for x in range(1 << arity):
+                if (x >> j) & 1:
+                    coefficients[x] -= coefficients[x ^ (1 << j)]
+                    bits[x] ^= bits[x ^ (1 << j)]
+
+        for subset, coefficient in enumerate(coefficients):
+            if abs(_wrap(coefficient)) > _ANGLE_TOLERANCE:
+                self._add_phase(coefficient, products[subset])
+        for i, qubit in enumerate(qubits):
+            output: Set[int] = set()
+            for term in np.flatnonzero(bits[:, i]):
+                for monomial in products[term]:
+                    _toggle(output, monomial)
+            self.outputs[qubit] = frozenset(output)
+
+    def _add_hadamard(self, qubit: int) -> None:
+        # H |w> = 2^(-1/2) sum_y (-1)^(w y) |y>
+        variable = 1 << self._next_variable
+        self._next_variable += 1
+        for monomial in self.outputs[qubit]:
+            self._add_term(monomial | variable, np.pi)
+        self.outputs[qubit] = frozenset({variable})
+        self.paths.add(variable)
+        self.scale += 1
+        self._reduce_paths()
+
+    def _substitute(self, variable: int, polynomial: BooleanPolynomial) -> None:
+        """Replaces a variable by a Boolean polynomial not containing it."""
+        moved = [(m, self.terms.pop(m)) for m in list(self.terms) if m & variable]
+        for monomial, angle in moved:
+            self._add_phase(
+                angle, _multiply(frozenset({monomial ^ variable}), polynomial)
+            )
+        for qubit, output in enumerate(self.outputs):
+            replaced = {monomial for monomial in output if monomial & variable}
+            if replaced:
+                kept = set(output - replaced)
+                for monomial in replaced:
+                    for other in polynomial:
+                        _toggle(kept, (monomial ^ variable) | other)
+                self.outputs[qubit] = frozenset(kept)
+
+    def _reduce(self, variable: int) -> bool:
+        """Sums over a path variable not in the outputs, returns whether it succeeded."""
+        masks = [m for m in self.terms if m & variable]
+        if not masks:
+            # sum_y 1 = 2
+            self.paths.remove(variable)
+            self.scale -= 2
+            return True
+        if not all(_is_pi(self.terms[m]) for m in masks):
+            return False
+
+        # the phase is pi y Q, and sum_y (-1)^(y Q) = 2 [Q = 0] fixes a path variable of Q
+        condition = frozenset(m ^ variable for m in masks)
+        partner = next(
+            (
+                path
+                for path in sorted(self.paths)
+                if path in condition and not any(m & path for m in condition - {path})
+            ),
+            None,
+        )
+        if partner is None:
+            return False
+        for m in masks:
+            del self.terms[m]
+        self._substitute(partner, condition - {partner})
+        self.paths -= {variable, partner}
+        self.scale -= 2
+        return True
+
+    def _reduce_paths(self) -> None:
+        """Sums over the path variables not in the outputs, while possible."""
+        while True:
+            used = 0
+            for output in self.outputs:
+                for monomial in output:
+                    used |= monomial
+            free = [path for path in sorted(self.paths) if not path & used]
+            if not any(self._reduce(path) for path in free):
+                return
+
+    def _apply(self, operation: Instruction, qubits: Tuple[int, ...]) -> bool:
+        """Applies a gate if it is supported directly, returns whether it was applied."""
+        matrix = _small_matrix(operation)
+        if matrix is None:
+            return False
+
+        if len(qubits) == 1 and np.allclose(np.abs(matrix), np.sqrt(0.5)):
+            # P(phi) H P(lambda), up to the global phase of the first entry
+            angles = np.angle(matrix)
+            identity = np.arange(2)
+            self._apply_monomial(identity, angles[0], qubits)
+            self._add_hadamard(qubits[0])
+            self._apply_monomial(
+                identity, np.array([0.0, angles[1, 0] - angles[0, 0]]), qubits
+            )
+            return True
+
+        try:
+            gate = MonomialMatrix.from_matrix(matrix)
+        except ValueError:
+            return False
+        self._apply_monomial(gate.permutation, np.angle(gate.phases), qubits)
+        return True
+
+    def to_monomial(self) -> MonomialMatrix:
+        """Evaluates the phase polynomial on all the basis states.
+
+        Without path variables, the permutation and the phases are evaluated directly from
+        the outputs and the phase polynomial, in O(d) per monomial. Remaining path
+        variables are summed over, which costs O(d 2^h) for ``h`` variables.
+
+        Returns:
+            MonomialMatrix: the unitary of the circuit
+
+        Raises:
+            ValueError: if the unitary is not a permutation up to phases, or there are more
+                than 62 qubits and path variables
+        """
+        num_paths = len(self.paths)
+        if self.num_qubits + num_paths > 62:
+            raise ValueError("Too many variables to evaluate the phase polynomial")
+        # the remaining path variables are numbered after the qubits
+        bits = {
+            path: 1 << (self.num_qubits + i)
+            for i, path in enumerate(sorted(self.paths))
+        }
+
+        def renumber(monomial: int) -> int:
+            result = monomial & ((1 << self.num_qubits) - 1)
+            for path, bit in bits.items():
+                if monomial & path:
+                    result |= bit
+            return result
+
+        outputs = [frozenset(map(renumber, output)) for output in self.outputs]
+        terms = [(renumber(monomial), angle) for monomial, angle in self.terms.items()]
+
+        global_dim = 2**self.num_qubits
+        inputs = np.arange(global_dim, dtype=np.int64)
+        rows, amplitudes = [], []
+        for path in range(2**num_paths):
+            values = inputs | (path << self.num_qubits)
+            states = np.zeros(global_dim, dtype=np.int64)
+            for qubit, output in enumerate(outputs):
+                states |= _evaluate(values, output).astype(np.int64) << qubit
+            angles = np.full(global_dim, self.global_phase)
+            for monomial, angle in terms:
+                angles += angle * ((values & monomial) == monomial)
+            rows.append(states)
+            amplitudes.append(np.exp(1j * angles) * 2 ** (-self.scale / 2))
+
+        if num_paths == 0:
+            return MonomialMatrix(rows[0], amplitudes[0])
+        columns = np.tile(inputs, 2**num_paths)
+        matrix = sparse.coo_matrix(
+            (np.concatenate(amplitudes), (np.concatenate(rows), columns)),
+            shape=(global_dim, global_dim),
+        ).tocsr()
+        # amplitudes of the paths ending in the same state are summed, and may cancel
+        return MonomialMatrix.from_matrix(matrix)
+
+
+def verify_circuit_phase_polynomial(
+    circuit: Union[QuantumCircuit, "MCTBase"], ref_unitary: AnyMatrix, class_name: str
+) -> Tuple[bool, str]:
+    """Verifies if the circuit is of the given class from its phase polynomial.
+
+    The permutation and the diagonal phase profile of the circuit are evaluated from the
+    phase polynomial in O(d) memory and checked as a MonomialMatrix, so neither the
+    unitary nor its columns are simulated.
+
+    Args:
+        circuit (Union[QuantumCircuit, MCTBase]): the circuit or the MCT implementation
+        ref_unitary (AnyMatrix): true 0-1 unitary matrix
+        class_name (str): class abbreviation, e.g. "SCNW" or "RDWS"
+
+    Returns:
+        Tuple[bool, str]: flag denoting if the circuit is of given class, and reason if
+            it is not.
+    """
+    if class_name not in _MONOMIAL_CHECKS:
+        raise ValueError(f"Unknown class {class_name}")
+
+    tested_matrix = PhasePolynomial.from_circuit(circuit).to_monomial()
+    return _MONOMIAL_CHECKS[class_name](
+        _MonomialIntermediates(tested_matrix, ref_unitary)
+    )
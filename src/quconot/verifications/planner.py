@@ -0,0 +1,270 @@
+import os
+from typing import TYPE_CHECKING, List, Optional, Tuple, Union
+
+import numpy as np
+from qiskit import QuantumCircuit
+from qiskit.quantum_info import Operator
+
+from .classification import _CHECK_COSTS, CLASS_NAMES
+from .functions import _split_dims
+from .functions_testing import _verify
+from .monomial import AnyMatrix, _monomial_permutation
+from .reversible import simulate_permutation
+from .sampling import _flatten_sparse
+from .simulation import DEFAULT_BLOCK_SIZE, _flatten, simulate_sparse
+from .stats import COMPLEX_FLOPS
+from .streaming import _STREAM_CHECKS, _as_circuit, verify_circuit_streaming
+
+if TYPE_CHECKING:
+    from ..implementations.mct_base import MCTBase
+
+# verification backends, in the order they are preferred at equal predicted time
+BACKENDS = ("monomial", "streaming", "sparse", "dense")
+
+# share of the physical memory given to a verification by default
+DEFAULT_MEMORY_SHARE = 0.5
+
+# assumed physical memory where it cannot be read
+_FALLBACK_MEMORY = 4 * 2**30
+
+# rough sustained floating-point operations per second, to convert costs to seconds
+OPERATIONS_PER_SECOND = 1e9
+
+# classes whose dense check computes the reverse Kronecker product, copying the matrix
+_RKP_CLASSES = frozenset({"RDNW", "SDWS", "RDWS"})
+
+_COMPLEX_BYTES = np.dtype(complex).itemsize
+
+
+class BackendEstimate:
+    """Predicted peak memory and runtime of verifying a circuit with a backend.
+
+    The predictions are upper bounds up to constant factors, derived from the qubit
+    count, the gates of the circuit and the class, not measurements.
+
+    Attributes:
+        backend (str): name of the backend, one of BACKENDS
+        peak_bytes (int): predicted peak memory in bytes
+        seconds (float): predicted runtime in seconds
+        supported (bool): whether the backend can verify the circuit at all
+        reason (str): why the backend is not supported, empty if it is
+    """
+
+    def __init__(
+        self,
+        backend: str,
+        peak_bytes: int,
+        seconds: float,
+        supported: bool = True,
+        reason: str = "",
+    ) -> None:
+        self.backend = backend
+        self.peak_bytes = peak_bytes
+        self.seconds = seconds
+        self.supported = supported
+        self.reason = reason
+
+    def __repr__(self) -> str:
+        return (
+            f"BackendEstimate({self.backend!r}, peak_bytes={self.peak_bytes}, "
+            f"seconds={self.seconds:.3g}, supported={self.supported})"
+        )
+
+
+def default_memory_budget() -> int:
+    """Returns DEFAULT_MEMORY_SHARE of the physical memory, in bytes."""
+    try:
+        memory = os.sysconf("SC_PHYS_PAGES") * os.sysconf("SC_PAGE_SIZE")
+    except (AttributeError, ValueError, OSError):
+        memory = _FALLBACK_MEMORY
+    return int(DEFAULT_MEMORY_SHARE * memory)
+
+
+def _gate_costs(circuit: QuantumCircuit) -> Tuple[int, int, bool, int]:
+    """Returns the gate count, the work per amplitude, whether all the gates are
+    monomial, and a bound on the nonzero entries of a column of the unitary.
+
+    Applying a gate on k qubits to a state costs ``2**k`` multiply-adds per amplitude in
+    the simulation, which decomposes multi-controlled X gates. For the gate count and the
+    support, multi-controlled X gates are kept whole, as in the monomial simulation, and
+    a gate on k qubits multiplies the nonzero amplitudes of a column by at most ``2**k``,
+    or not at all if it is monomial.
+    """
+    work = sum(len(matrix) for matrix, _ in _flatten(circuit)[0])
+    gates, _ = _flatten_sparse(circuit)
+    global_dim = 2**circuit.num_qubits
+    support = 1
+    monomial = True
+    for gate in gates:
+        if gate[0] == "dense":
+            monomial = False
+            support = min(global_dim, support * len(gate[1]))
+    return len(gates), work, monomial, support
+
+
+def estimate_backends(
+    circuit: Union[QuantumCircuit, "MCTBase"],
+    ref_unitary: AnyMatrix,
+    class_name: str,
+    block_size: int = DEFAULT_BLOCK_SIZE,
+) -> List[BackendEstimate]:
+    """Predicts the peak memory and runtime of verifying a circuit with each backend.
+
+    The backends are "monomial", simulating the basis states of a circuit of monomial
+    gates as a permutation with phases, "streaming", checking the columns as they are
+    simulated, "sparse", building the unitary as a sparse matrix, and "dense", building
+    it with qiskit's Operator.
+
+    Args:
+        circuit (Union[QuantumCircuit, MCTBase]): the circuit or the MCT implementation
+        ref_unitary (AnyMatrix): true 0-1 unitary matrix
+        class_name (str): class abbreviation, e.g. "SCNW" or "RDWS"
+        block_size (int): number of columns simulated at once
+
+    Returns:
+        List[BackendEstimate]: estimates of the backends, in the order of BACKENDS
+    """
+    if class_name not in CLASS_NAMES:
+        raise ValueError(f"Unknown class {class_name}")
+
+    circuit = _as_circuit(circuit)
+    global_dim, main_dim, aux_dim = _split_dims(
+        2**circuit.num_qubits, ref_unitary.shape[0]
+    )
+    gates_no, work, monomial, support = _gate_costs(circuit)
+
+    def seconds(operations: float) -> float:
+        return operations / OPERATIONS_PER_SECOND
+
+    def simulation(columns: int) -> float:
+        return COMPLEX_FLOPS * columns * global_dim * work
+
+    # the input, the contraction and the moved axes of a block of states
+    block_bytes = 3 * _COMPLEX_BYTES * global_dim * min(block_size, global_dim)
+    check = COMPLEX_FLOPS * _CHECK_COSTS[class_name](global_dim, main_dim, aux_dim)
+
+    estimates = [
+        # 64-bit states, bit masks and the local indices, and the phases
+        BackendEstimate(
+            "monomial",
+            (3 * 8 + 2 * _COMPLEX_BYTES) * global_dim,
+            seconds(4 * gates_no * global_dim),
+            monomial,
+            "" if monomial else "The circuit has gates which are not monomial",
+        )
+    ]
+
+    try:
+        _monomial_permutation(ref_unitary)
+        streaming_reason = ""
+    except ValueError:
+        streaming_reason = "The reference is not a permutation matrix"
+    clean = _STREAM_CHECKS[class_name][1]
+    estimates.append(
+        BackendEstimate(
+            "streaming",
+            block_bytes + 4 * _COMPLEX_BYTES * global_dim,
+            seconds(simulation(main_dim if clean else global_dim)),
+            not streaming_reason,
+            streaming_reason,
+        )
+    )
+
+    # data and row indices, kept in the blocks, in the matrix and in the check copies
+    nonzeros = support * global_dim
+    estimates.append(
+        BackendEstimate(
+            "sparse",
+            block_bytes + 3 * (_COMPLEX_BYTES + 4) * nonzeros,
+            seconds(simulation(global_dim) + COMPLEX_FLOPS * 10 * nonzeros),
+        )
+    )
+
+    # Operator composes the gates into the matrix, and the check reindexes it
+    copies = 3 if class_name in _RKP_CLASSES else 2
+    estimates.append(
+        BackendEstimate(
+            "dense",
+            copies * _COMPLEX_BYTES * global_dim**2,
+            seconds(COMPLEX_FLOPS * global_dim**2 * work + check),
+        )
+    )
+    return estimates
+
+
+def plan_verification(
+    circuit: Union[QuantumCircuit, "MCTBase"],
+    ref_unitary: AnyMatrix,
+    class_name: str,
+    memory_budget: Optional[int] = None,
+    block_size: int = DEFAULT_BLOCK_SIZE,
+) -> BackendEstimate:
+    """Picks the backend with the least predicted runtime fitting the memory budget.
+
+    Args:
+        circuit (Union[QuantumCircuit, MCTBase]): the circuit or the MCT implementation
+        ref_unitary (AnyMatrix): true 0-1 unitary matrix
+        class_name (str): class abbreviation, e.g. "SCNW" or "RDWS"
+        memory_budget (Optional[int]): bytes available, default_memory_budget() if None
+        block_size (int): number of columns simulated at once
+
+    Returns:
+        BackendEstimate: the estimate of the chosen backend
+    """
+    if memory_budget is None:
+        memory_budget = default_memory_budget()
+    estimates = estimate_backends(circuit, ref_unitary, class_name, block_size)
+    fitting = [
+        estimate
+        for estimate in estimates
+        if estimate.supported and estimate.peak_bytes <= memory_budget
+    ]
+    if not fitting:
+        smallest = min(
+            (estimate for estimate in estimates if estimate.supported),
+            key=lambda estimate: estimate.peak_bytes,
+        )
+        raise ValueError(
+            f"No verification backend fits the memory budget of {memory_budget} bytes,"
+            f" the smallest is {smallest.backend} with {smallest.peak_bytes} bytes"
+        )
+    return min(
+        fitting,
+        key=lambda estimate: (estimate.seconds, BACKENDS.index(estimate.backend)),
+    )
+
+
+def verify_circuit_planned(
+    circuit: Union[QuantumCircuit, "MCTBase"],
+    ref_unitary: AnyMatrix,
+    class_name: str,
+    memory_budget: Optional[int] = None,
+    block_size: int = DEFAULT_BLOCK_SIZE,
+) -> Tuple[bool, str]:
+    """Verifies if the circuit is of the given class with the backend picked by the plan.
+
+    Unlike the verifiers of a matrix, which need the dense unitary, a circuit too large
+    for the memory budget is rejected with a ValueError before anything is allocated.
+
+    Args:
+        circuit (Union[QuantumCircuit, MCTBase]): the circuit or the MCT implementation
+        ref_unitary (AnyMatrix): true 0-1 unitary matrix
+        class_name (str): class abbreviation, e.g. "SCNW" or "RDWS"
+        memory_budget (Optional[int]): bytes available, default_memory_budget() if None
+        block_size (int): number of columns simulated at once
+
+    Returns:
+        Tuple[bool, str]: flag denoting if the circuit is of given class, and reason if
+            it is not.
+    """
+    circuit = _as_circuit(circuit)
+    backend = plan_verification(
+        circuit, ref_unitary, class_name, memory_budget, block_size
+    ).backend
+    if backend == "monomial":
+        return _verify(class_name, simulate_permutation(circuit), ref_unitary)
+    if backend == "streaming":
+        return verify_circuit_streaming(circuit, ref_unitary, class_name)
+    if backend == "sparse":
+        return _verify(class_name, simulate_sparse(circuit, block_size), ref_unitary)
+    return _verify(class_name, Operator(circuit).data, ref_unitary)
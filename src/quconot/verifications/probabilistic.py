@@ -0,0 +1,324 @@
+from typing import Callable, Dict, Optional, Tuple, Union
+
+import numpy as np
+from scipy import sparse
+
+from .budget import Deadline, PartialResult, _deadline, _OutOfTime
+from .functions import (
+    ABS_TOLERANCE,
+    MatrixLike,
+    _clean_columns,
+    _clean_subspace,
+    _dense_vector,
+    _get_dims,
+    _kron,
+)
+from .functions_testing import _Intermediates, _prepare, _prescreen
+from .monomial import (
+    _MONOMIAL_CHECKS,
+    AnyMatrix,
+    MonomialMatrix,
+    _MonomialIntermediates,
+)
+
+# default number of random probe vectors
+DEFAULT_PROBES = 30
+
+
+def _random_probes(dim: int, probes: int, rng: np.random.Generator) -> np.ndarray:
+    """Returns ``probes`` random sign vectors of length ``dim`` stacked as columns."""
+    return rng.choice(np.array([-1.0, 1.0]), size=(dim, probes))
+
+
+def _row_products(matrix: MatrixLike, other: np.ndarray) -> np.ndarray:
+    """Returns ``sum_k matrix[i, k] * other[i, k]`` for each row ``i``."""
+    if sparse.issparse(matrix):
+        return _dense_vector(sparse.csr_matrix(matrix).multiply(other).sum(axis=1))
+    return np.einsum("ik,ik->i", matrix, other)
+
+
+def _probe_zero(
+    apply_error: Callable[[np.ndarray], np.ndarray],
+    dim: int,
+    probes: int,
+    rng: np.random.Generator,
+    deadline: Optional[Deadline] = None,
+) -> Tuple[bool, float]:
+    """Freivalds test for ``E == 0``, where only the action ``X -> E @ X`` is available.
+
+    If some entry of ``E`` exceeds ``ABS_TOLERANCE`` in modulus, each random sign probe
+    accepts with probability at most 1/2, since flipping the sign of the corresponding
+    probe entry moves the result by more than twice the tolerance.
+
+    Args:
+        apply_error (Callable[[np.ndarray], np.ndarray]): computes ``E @ X``
+        dim (int): dimension of the probed space
+        probes (int): number of random probe vectors
+        rng (np.random.Generator): random number generator
+        deadline (Optional[Deadline]): if given, the probes are applied one at a time and
+            _OutOfTime is raised with the number of probes passed once it is over
+
+    Returns:
+        Tuple[bool, float]: flag denoting if all probes passed, and the false-accept bound
+    """
+    x = _random_probes(dim, probes, rng)
+    if deadline is None:
+        passed = bool(np.all(np.abs(apply_error(x)) <= ABS_TOLERANCE))
+        return passed, 2.0**-probes
+    for probe in range(probes):
+        deadline.check(probe)
+        if not np.all(np.abs(apply_error(x[:, [probe]])) <= ABS_TOLERANCE):
+            return False, 2.0**-probes
+    return True, 2.0**-probes
+
+
+def _probe_strict_clean_non_wasting(
+    tested_matrix: MatrixLike,
+    ref_unitary: np.ndarray,
+    probes: int,
+    rng: np.random.Generator,
+    deadline: Optional[Deadline] = None,
+) -> Tuple[bool, str, float]:
+    _, main_dim, _ = _get_dims(tested_matrix, ref_unitary)
+    block = _clean_subspace(tested_matrix, main_dim)
+    ref_dagger = ref_unitary.conj().T
+
+    phase = np.conjugate(_dense_vector(block[0]) @ ref_dagger[:, 0])
+    passed, bound = _probe_zero(
+        lambda x: phase * (block @ (ref_dagger @ x)) - x,
+        main_dim,
+        probes,
+        rng,
+        deadline,
+    )
+    if not passed:
+        return False, "Generated matrix should be all 0", 0.0
+    return True, "", bound
+
+
+def _probe_relative_clean_non_wasting(
+    tested_matrix: MatrixLike,
+    ref_unitary: np.ndarray,
+    probes: int,
+    rng: np.random.Generator,
+    deadline: Optional[Deadline] = None,
+) -> Tuple[bool, str, float]:
+    _, main_dim, _ = _get_dims(tested_matrix, ref_unitary)
+    block = _clean_subspace(tested_matrix, main_dim)
+
+    return _probe_relative_identity(block, ref_unitary, main_dim, probes, rng, deadline)
+
+
+def _probe_relative_identity(
+    matrix: MatrixLike,
+    ref_unitary: np.ndarray,
+    main_dim: int,
+    probes: int,
+    rng: np.random.Generator,
+    deadline: Optional[Deadline] = None,
+) -> Tuple[bool, str, float]:
+    """Probes ``|matrix @ ref_unitary^dagger| == I``.
+
+    This holds iff the product is diagonal with unit-modulus diagonal. The diagonal is
+    computed exactly and the off-diagonal part is probed.
+    """
+    ref_dagger = ref_unitary.conj().T
+    diagonal = _row_products(matrix, ref_unitary.conj())
+
+    if not np.allclose(np.abs(diagonal), 1.0, atol=ABS_TOLERANCE, rtol=0.0):
+        return False, "Generated matrix should be all 0", 0.0
+
+    passed, bound = _probe_zero(
+        lambda x: matrix @ (ref_dagger @ x) - diagonal[:, None] * x,
+        main_dim,
+        probes,
+        rng,
+        deadline,
+    )
+    if not passed:
+        return False, "Generated matrix should be all 0", 0.0
+    return True, "", bound
+
+
+def _probe_strict_dirty_non_wasting(
+    tested_matrix: MatrixLike,
+    ref_unitary: np.ndarray,
+    probes: int,
+    rng: np.random.Generator,
+    deadline: Optional[Deadline] = None,
+) -> Tuple[bool, str, float]:
+    global_dim, main_dim, aux_dim = _get_dims(tested_matrix, ref_unitary)
+
+    def apply_inverse(x: np.ndarray) -> np.ndarray:
+        # kron(I, U^dagger) @ x, without building the Kronecker product
+        x = x.reshape(aux_dim, main_dim, -1)
+        return np.einsum("mk,imp->ikp", ref_unitary.conj(), x).reshape(global_dim, -1)
+
+    first_row = _dense_vector(tested_matrix[0, :main_dim])
+    phase = np.conjugate(first_row @ ref_unitary[0].conj())
+    passed, bound = _probe_zero(
+        lambda x: phase * (tested_matrix @ apply_inverse(x)) - x,
+        global_dim,
+        probes,
+        rng,
+        deadline,
+    )
+    if not passed:
+        return False, "Generated matrix should be all 0", 0.0
+    return True, "", bound
+
+
+def _probe_relative_clean_wasting_separable(
+    tested_matrix: MatrixLike,
+    ref_unitary: np.ndarray,
+    probes: int,
+    rng: np.random.Generator,
+    deadline: Optional[Deadline] = None,
+) -> Tuple[bool, str, float]:
+    _, main_dim, aux_dim = _get_dims(tested_matrix, ref_unitary)
+    columns = _clean_columns(tested_matrix, main_dim)
+
+    first_column = _dense_vector(columns[:, 0]).reshape(aux_dim, main_dim)
+    psi = first_column @ ref_unitary[:, 0]
+    # (<psi| (x) I) restricted to the clean columns, contracted over the auxiliary system
+    if sparse.issparse(columns):
+        matrix = _kron(psi.conj()[None, :], sparse.identity(main_dim)) @ columns
+    else:
+        matrix = np.einsum(
+            "i,imb->mb", psi.conj(), columns.reshape(aux_dim, main_dim, main_dim)
+        )
+
+    flag, msg, bound = _probe_relative_identity(
+        matrix, ref_unitary, main_dim, probes, rng, deadline
+    )
+    if not flag:
+        return False, "Resulting matrix should be identity", 0.0
+    return flag, msg, bound
+
+
+# verifier of a class on the tested matrix, the reference, the number of probes, the
+# random number generator and the deadline
+_ProbabilisticVerifier = Callable[
+    [MatrixLike, np.ndarray, int, np.random.Generator, Optional[Deadline]],
+    Tuple[bool, str, float],
+]
+
+
+def _exact(class_name: str) -> _ProbabilisticVerifier:
+    """Wraps the deterministic check of a class, which has no false accepts."""
+
+    def wrapped(
+        tested_matrix: MatrixLike,
+        ref_unitary: np.ndarray,
+        probes: int,
+        rng: np.random.Generator,
+        deadline: Optional[Deadline] = None,
+    ) -> Tuple[bool, str, float]:
+        data, checks = _prepare(tested_matrix, ref_unitary, deadline=deadline, rng=rng)
+        flag, msg = checks[class_name](data)
+        return flag, msg, 0.0
+
+    return wrapped
+
+
+_PROBABILISTIC_VERIFIERS: Dict[str, _ProbabilisticVerifier] = {
+    "SCNW": _probe_strict_clean_non_wasting,
+    "RCNW": _probe_relative_clean_non_wasting,
+    "SDNW": _probe_strict_dirty_non_wasting,
+    "RDNW": _exact("RDNW"),
+    "SCWE": _exact("SCWE"),
+    "SCWS": _exact("SCWS"),
+    "RCWS": _probe_relative_clean_wasting_separable,
+    "SDWE": _exact("SDWE"),
+    "SDWS": _exact("SDWS"),
+    "RDWS": _exact("RDWS"),
+}
+
+
+def verify_circuit_probabilistic(
+    tested_matrix: AnyMatrix,
+    ref_unitary: AnyMatrix,
+    class_name: str,
+    probes: int = DEFAULT_PROBES,
+    seed: Optional[int] = None,
+    budget: Optional[float] = None,
+) -> Union[Tuple[bool, str, float], PartialResult]:
+    """Verifies if tested_matrix is of the given class using random probe vectors.
+
+    Matrix identities of the non-wasting and relative clean wasting-separable classes are
+    tested on ``probes`` random sign vectors, which costs O(probes * d^2) instead of the
+    O(d^3) matrix products, and O(probes * nnz) for a sparse tested matrix. Up to
+    rounding, rejections are always correct. The bound is the probability of accepting a
+    matrix for which the deterministic identity is violated by more than
+    ``ABS_TOLERANCE`` in some entry. Classes whose checks are already linear in the size
+    of the input, or dominated by the reverse Kronecker product, are verified exactly and
+    report a bound of 0, as do all the classes for a MonomialMatrix and the matrices
+    rejected by the O(d) prescreen of the class.
+
+    With a ``budget`` the probes are applied one at a time until the deadline, and the
+    result is a PartialResult. If the deadline passes while probing, the class is pending
+    with the number of probes passed, and ``1 - 2**-checked`` as the confidence.
+
+    Args:
+        tested_matrix (AnyMatrix): the global matrix to be tested
+        ref_unitary (AnyMatrix): true 0-1 unitary matrix
+        class_name (str): class abbreviation, e.g. "SCNW" or "RDWS"
+        probes (int): number of random probe vectors
+        seed (Optional[int]): seed of the random number generator of the probes and of
+            the starting vector of the reverse Kronecker product
+        budget (Optional[float]): seconds the verification may take, None for no limit
+
+    Returns:
+        Union[Tuple[bool, str, float], PartialResult]: flag denoting if the tested matrix
+            is of given class, reason if it is not, and the false-accept probability
+            bound, or the PartialResult if a budget is given.
+    """
+    if class_name not in _PROBABILISTIC_VERIFIERS:
+        raise ValueError(f"Unknown class {class_name}")
+    if probes < 1:
+        raise ValueError("Number of probes must be >= 1")
+
+    deadline = _deadline(budget)
+    if isinstance(tested_matrix, MonomialMatrix):
+        data = _MonomialIntermediates(tested_matrix, ref_unitary)
+        flag, msg = _MONOMIAL_CHECKS[class_name](data)
+        return _probabilistic_result(class_name, flag, msg, 0.0, deadline, probes)
+    # the reference is small next to the tested matrix
+    if isinstance(ref_unitary, MonomialMatrix):
+        reference = ref_unitary.toarray()
+    elif sparse.issparse(ref_unitary):
+        reference = sparse.csr_matrix(ref_unitary).toarray()
+    else:
+        reference = ref_unitary
+    if sparse.issparse(tested_matrix):
+        tested_matrix = sparse.csr_matrix(tested_matrix)
+
+    try:
+        screened = _Intermediates(tested_matrix, reference, deadline=deadline)
+        flag, msg = _prescreen(class_name, screened)
+        bound = 0.0
+        if flag:
+            rng = np.random.default_rng(seed)
+            flag, msg, bound = _PROBABILISTIC_VERIFIERS[class_name](
+                tested_matrix, reference, probes, rng, deadline
+            )
+    except _OutOfTime as error:
+        confidence = 1.0 - 2.0**-error.checked if error.checked else 0.0
+        return PartialResult({}, (class_name,), error.checked, probes, confidence)
+    return _probabilistic_result(class_name, flag, msg, bound, deadline, probes)
+
+
+def _probabilistic_result(
+    class_name: str,
+    flag: bool,
+    msg: str,
+    bound: float,
+    deadline: Optional[Deadline],
+    probes: int,
+) -> Union[Tuple[bool, str, float], PartialResult]:
+    """Returns the answer, as a PartialResult if the verification has a deadline."""
+    if deadline is None:
+        return flag, msg, bound
+    return PartialResult(
+        {class_name: (flag, msg)}, (), probes, probes, 1.0 - bound, deadline.overrun()
+    )
@@ -1,43 +1,106 @@
+from typing import Optional, Tuple, Union
+
 import numpy as np
+from scipy import sparse
+from scipy.sparse.linalg import LinearOperator, svds
+
+# below this size of the rearranged matrix a thin SVD is cheaper than ARPACK
+_DENSE_SVD_MAX_DIM = 16
+
 
+def _rearrange(A, B_shape, C_shape):
+    """Rearranges A to the A^(m1n1 x m2n2) matrix, for which kron(B, C) is rank-one.
 
-def reverse_kronecker_product(A, B_shape):
+    Row ``j * m1 + i`` holds the raveled block ``(i, j)`` of A. Dense matrices are
+    rearranged with reshape and transpose, sparse ones from COO indices.
+    """
+    if sparse.issparse(A):
+        entries = sparse.coo_matrix(A)
+        block_row, row = np.divmod(entries.row, C_shape[0])
+        block_col, col = np.divmod(entries.col, C_shape[1])
+        return sparse.csr_matrix(
+            (
+                entries.data,
+                (block_col * B_shape[0] + block_row, row * C_shape[1] + col),
+            ),
+            shape=(B_shape[0] * B_shape[1], C_shape[0] * C_shape[1]),
+        )
+
+    blocks = np.asarray(A).reshape(B_shape[0], C_shape[0], B_shape[1], C_shape[1])
+    return blocks.transpose(2, 0, 1, 3).reshape(
+        B_shape[0] * B_shape[1], C_shape[0] * C_shape[1]
+    )
+
+
+def leading_singular_triplet(
+    R: Union[np.ndarray, sparse.spmatrix, LinearOperator],
+    rng: Optional[np.random.Generator] = None,
+) -> Tuple[np.ndarray, float, np.ndarray]:
+    """Computes the leading singular triplet of a matrix.
+
+    Only the largest singular value is computed, with ARPACK (``svds``), unless the
+    matrix is small enough for a thin SVD. The matrix can be given matrix-free, as a
+    LinearOperator providing ``matvec`` and ``rmatvec``. ARPACK starts from a random
+    vector, which is drawn from ``rng`` if given, so that the result is reproducible.
+
+    Args:
+        R (Union[np.ndarray, sparse.spmatrix, LinearOperator]): m x n matrix
+        rng (Optional[np.random.Generator]): generator of the ARPACK starting vector
+
+    Returns:
+        Tuple[np.ndarray, float, np.ndarray]: left singular vector, singular value, and
+            conjugated right singular vector, such that ``R ~ s * outer(u, vh)``
+    """
+    if isinstance(R, LinearOperator):
+        if min(R.shape) == 1:
+            # svds requires k < min(shape), the decomposition of a vector is trivial
+            if R.shape[0] == 1:
+                row = np.conjugate(np.asarray(R.rmatvec(np.ones(1)))).ravel()
+                norm = float(np.linalg.norm(row))
+                return np.ones(1), norm, row / norm if norm > 0 else row
+            column = np.asarray(R.matvec(np.ones(1))).ravel()
+            norm = float(np.linalg.norm(column))
+            return column / norm if norm > 0 else column, norm, np.ones(1)
+    elif min(R.shape) <= _DENSE_SVD_MAX_DIM:
+        dense = sparse.csr_matrix(R).toarray() if sparse.issparse(R) else R
+        W, singular_values, V = np.linalg.svd(dense, full_matrices=False)
+        return W[:, 0], float(singular_values[0]), V[0]
+
+    v0 = None if rng is None else rng.standard_normal(min(R.shape))
+    W, s, V = svds(R, k=1, v0=v0)
+    return W[:, 0], s[0], V[0]
+
+
+def reverse_kronecker_product(A, B_shape, rng=None):
     """Reverse Kronecker Product (RKP) to a matrix.
     Given a matrix A and a shape, solves the problem
     min || A - kron(B, C) ||_{Fro}^2
     where the minimization is over B with (the specified shape) and C.
+    Only the leading singular triplet of the rearranged matrix is computed. If A is a
+    scipy.sparse matrix, it is not densified; the returned factors are dense.
     Args:
     A: m x n matrix
     B_shape: pair of ints (a, b) where a divides m and b divides n
+    rng: optional np.random.Generator making the singular triplet reproducible
     Returns:
     Approximating factors (B, C)
     """
-    blocks = map(
-        lambda blockcol: np.split(blockcol, B_shape[0], 0), np.split(A, B_shape[1], 1)
-    )
-
-    # rearrange matrix A to A^(m1n1 x m2n2) matrix
-    R_A = np.vstack([block.ravel() for blockcol in blocks for block in blockcol])
-
-    # get the SVD from R_A
-    W, s, V = np.linalg.svd(R_A)
-
     # approximate the C matrix shape
     C_shape = A.shape[0] // B_shape[0], A.shape[1] // B_shape[1]
 
-    # get the largest singular value
-    idx = np.argmax(s)
+    # rearrange matrix A to A^(m1n1 x m2n2) matrix and get its largest singular value
+    u, s, vh = leading_singular_triplet(_rearrange(A, B_shape, C_shape), rng)
 
     # throw an error if we don't find any largest singular value
-    if s[idx] <= 0:
+    if s <= 0:
         raise Exception("No largest singular value exist, RKP cannot be proceed")
 
-    # get matrix B back from the computation
-    Vec_B = np.sqrt(s[idx]) * W[:, idx]
-    B = Vec_B.reshape(B_shape).T
+    # get matrix B back from the computation, rows of A^(m1n1 x m2n2) are column-major
+    Vec_B = np.sqrt(s) * u
+    B = Vec_B.reshape(B_shape[1], B_shape[0]).T
 
     # get matrix C back from the computation
-    Vec_C = np.sqrt(s[idx]) * V[idx, :]
+    Vec_C = np.sqrt(s) * vh
     C = Vec_C.reshape(C_shape)
 
     B /= np.linalg.norm(B[:, 0], ord=2)
@@ -0,0 +1,301 @@
+from typing import TYPE_CHECKING, List, Optional, Tuple, Type, Union
+
+import numpy as np
+from qiskit import QuantumCircuit
+from qiskit.circuit import ControlledGate, Instruction
+
+from .classification import CLASS_NAMES
+from .monomial import MonomialMatrix
+from .simulation import _small_matrix, _visit_operations
+from .streaming import _as_circuit
+
+if TYPE_CHECKING:
+    from ..implementations.mct_base import MCTBase
+
+# multi-controlled X: control mask, control values and target mask on the basis indices
+_ControlledX = Tuple[int, int, int]
+
+# small monomial gate: permutation and phases of the gate matrix, and its qubits
+_SmallGate = Tuple[np.ndarray, np.ndarray, Tuple[int, ...]]
+
+
+def _controlled_x(
+    operation: Instruction, qubits: Tuple[int, ...]
+) -> Optional[_ControlledX]:
+    """Returns the bit masks of X and multi-controlled X gates without auxiliary qubits."""
+    if operation.name == "x":
+        return 0, 0, 1 << qubits[0]
+    if (
+        isinstance(operation, ControlledGate)
+        and operation.base_gate.name == "x"
+        and operation.num_qubits == operation.num_ctrl_qubits + 1
+    ):
+        controls, target = qubits[:-1], qubits[-1]
+        mask = sum(1 << q for q in controls)
+        values = sum(
+            ((operation.ctrl_state >> i) & 1) << q for i, q in enumerate(controls)
+        )
+        return mask, values, 1 << target
+    return None
+
+
+def _small_gate(
+    operation: Instruction, qubits: Tuple[int, ...]
+) -> Optional[_SmallGate]:
+    """Returns the monomial form of a gate on at most ``_MAX_GATE_QUBITS`` qubits."""
+    matrix = _small_matrix(operation)
+    if matrix is None:
+        return None
+    try:
+        gate = MonomialMatrix.from_matrix(matrix)
+    except ValueError as error:
+        raise ValueError(
+            f"Operation {operation.name} is not a permutation up to phases"
+        ) from error
+    return gate.permutation, gate.phases, qubits
+
+
+def _flatten_reversible(
+    circuit: QuantumCircuit,
+) -> Tuple[List[Union[_ControlledX, _SmallGate]], float]:
+    """Flattens a circuit into multi-controlled X gates and small monomial gates.
+
+    Args:
+        circuit (QuantumCircuit): circuit without measurements
+
+    Returns:
+        Tuple[List[Union[_ControlledX, _SmallGate]], float]: gates in the order of
+            application, and the global phase collected from the decomposed definitions
+    """
+    gates: List[Union[_ControlledX, _SmallGate]] = []
+
+    def apply(operation: Instruction, qubits: Tuple[int, ...]) -> bool:
+        gate = _controlled_x(operation, qubits) or _small_gate(operation, qubits)
+        if gate is None:
+            return False
+        gates.append(gate)
+        return True
+
+    return gates, _visit_operations(circuit, apply)
+
+
+def simulate_permutation(circuit: Union[QuantumCircuit, "MCTBase"]) -> MonomialMatrix:
+    """Computes the unitary of a reversible circuit as a permutation table.
+
+    All the ``2**n`` basis inputs are evolved at once as integer bit-vectors: X, CX, CCX
+    and multi-controlled X gates flip the target bit where the control bits match, other
+    small gates permuting the basis states up to phases, such as relative Toffoli gates,
+    are applied through their permutation and phases. Memory and time are O(2^n) per gate
+    instead of the O(4^n) of the unitary. Phases are kept only once some gate has a
+    phase different from 1.
+
+    Args:
+        circuit (Union[QuantumCircuit, MCTBase]): the circuit or the MCT implementation
+
+    Returns:
+        MonomialMatrix: the unitary of the circuit, the permutation table is its
+            ``permutation``
+    """
+    circuit = _as_circuit(circuit)
+    gates, global_phase = _flatten_reversible(circuit)
+
+    # output basis index of each input column, 32-bit integers halve the memory traffic
+    dtype: Type[np.signedinteger] = np.int32
+    if circuit.num_qubits >= 31:
+        dtype = np.int64
+    states = np.arange(2**circuit.num_qubits, dtype=dtype)
+    phases: Optional[np.ndarray] = None
+    local, bits = np.empty_like(states), np.empty_like(states)
+    for gate in gates:
+        if isinstance(gate[0], int):
+            mask, values, target = gate
+            np.bitwise_and(states, mask, out=bits)
+            states ^= np.where(bits == values, dtype(target), dtype(0))
+            continue
+
+        permutation, gate_phases, qubits = gate
+        # index of the basis state of the gate qubits, and the bits it flips
+        local.fill(0)
+        for position, qubit in enumerate(qubits):
+            np.right_shift(states, qubit, out=bits)
+            np.bitwise_and(bits, 1, out=bits)
+            np.left_shift(bits, position, out=bits)
+            local |= bits
+        changes = np.arange(len(permutation)) ^ permutation
+        flipped = np.zeros_like(changes)
+        for position, qubit in enumerate(qubits):
+            flipped |= ((changes >> position) & 1) << qubit
+        states ^= flipped.astype(dtype)[local]
+        if not np.allclose(gate_phases, 1.0):
+            if phases is None:
+                phases = np.ones(len(states), dtype=complex)
+            phases *= gate_phases[local]
+
+    if phases is None:
+        phases = np.ones(len(states), dtype=complex)
+    return MonomialMatrix(states, np.exp(1j * global_phase) * phases)
+
+
+# default number of uniformly random bitstrings checked besides the adversarial ones
+DEFAULT_BITSTRINGS = 256
+
+# multi-controlled X on bit slices: controls expected 1, controls expected 0, target
+_SlicedX = Tuple[List[int], List[int], int]
+
+
+def _set_bits(mask: int) -> List[int]:
+    bits = []
+    while mask:
+        lowest = mask & -mask
+        bits.append(lowest.bit_length() - 1)
+        mask ^= lowest
+    return bits
+
+
+def _bit_slices(bitstrings: np.ndarray) -> List[int]:
+    """Transposes bitstrings into bit slices.
+
+    Args:
+        bitstrings (np.ndarray): boolean array, the bits of each sample in a row
+
+    Returns:
+        List[int]: for each qubit, the integer whose bit ``s`` is the qubit in sample ``s``
+    """
+    packed = np.packbits(bitstrings, axis=0, bitorder="little")
+    return [
+        int.from_bytes(packed[:, qubit].tobytes(), "little")
+        for qubit in range(bitstrings.shape[1])
+    ]
+
+
+def _apply_bit_slices(
+    gates: List[Union[_ControlledX, _SmallGate]], slices: List[int], ones: int
+) -> None:
+    """Applies the gates to all the bitstring samples at once, in place.
+
+    A multi-controlled X flips the target in the samples where the controls match, an
+    AND of the control slices, so the cost is O(gates) big-integer operations for any
+    number of samples. Small monomial gates flip each of their bits in the samples whose
+    local basis state is moved to one with that bit changed; their phases are ignored.
+    """
+    for gate in gates:
+        if isinstance(gate[0], int):
+            mask, values, target = gate
+            condition = ones
+            for qubit in _set_bits(mask):
+                if (values >> qubit) & 1:
+                    condition &= slices[qubit]
+                else:
+                    condition &= ones ^ slices[qubit]
+            slices[target.bit_length() - 1] ^= condition
+            continue
+
+        permutation, _, qubits = gate
+        inputs = [slices[qubit] for qubit in qubits]
+        flips = [0] * len(qubits)
+        for local, image in enumerate(permutation):
+            changes = local ^ int(image)
+            if not changes:
+                continue
+            matching = ones
+            for position, bits in enumerate(inputs):
+                matching &= bits if (local >> position) & 1 else ones ^ bits
+            for position in _set_bits(changes):
+                flips[position] |= matching
+        for position, qubit in enumerate(qubits):
+            slices[qubit] ^= flips[position]
+
+
+def verify_mct_bitstrings(
+    circuit: Union[QuantumCircuit, "MCTBase"],
+    controls_no: int,
+    class_name: str,
+    samples: int = DEFAULT_BITSTRINGS,
+    seed: Optional[int] = None,
+) -> Tuple[bool, str]:
+    """Checks the classical action of a Toffoli circuit implementing an MCT gate.
+
+    Basis inputs are pushed through the gates as bitstrings, with the controls on the
+    qubits ``0, ..., controls_no - 1``, the target on the qubit ``controls_no`` and the
+    auxiliary qubits above, as in ``mct_reference``. The samples are the adversarial
+    inputs, all the controls set with both target values, every pattern with a single
+    control unset, and all the qubits unset, followed by ``samples`` uniformly random
+    inputs. The auxiliary qubits are 0 for the clean classes, and random, besides the
+    all-ones auxiliary state, for the dirty ones. The samples are stored as bit slices,
+    one integer per qubit, so the whole check takes O(gates) big-integer operations and
+    circuits with thousands of qubits are checked in a fraction of a second.
+
+    Only necessary conditions of the class are checked: the target is flipped exactly
+    when all the controls are set, the controls are kept, and for the non-wasting
+    classes the auxiliary qubits are restored. Phases, e.g. of relative-phase Toffoli
+    gates, and superpositions are not checked, see verify_circuit_sampled for those.
+
+    Args:
+        circuit (Union[QuantumCircuit, MCTBase]): circuit of X, multi-controlled X and
+            small gates permuting the basis states up to phases
+        controls_no (int): number of controls of the MCT gate
+        class_name (str): class abbreviation, e.g. "SCNW" or "RDWS"
+        samples (int): number of uniformly random bitstrings
+        seed (Optional[int]): seed of the random number generator
+
+    Returns:
+        Tuple[bool, str]: flag denoting if all the bitstrings are mapped as by the MCT
+            gate, and reason if they are not.
+    """
+    if class_name not in CLASS_NAMES:
+        raise ValueError(f"Unknown class {class_name}")
+    if samples < 0:
+        raise ValueError("Number of samples must be >= 0")
+
+    circuit = _as_circuit(circuit)
+    qubits_no = circuit.num_qubits
+    if not 1 <= controls_no < qubits_no:
+        raise ValueError("The circuit has no qubits for the controls and the target")
+    gates, _ = _flatten_reversible(circuit)
+    rng = np.random.default_rng(seed)
+    dirty = class_name[1] == "D"
+    wasting = class_name[2] == "W"
+
+    # adversarial patterns of the controls, then the random bitstrings
+    controls = np.ones((controls_no + 3, controls_no), dtype=bool)
+    controls[np.arange(controls_no), np.arange(controls_no)] = False
+    controls[-1] = False
+    target = np.zeros((controls_no + 3, 1), dtype=bool)
+    target[controls_no + 1] = True
+    target[:controls_no] = rng.integers(2, size=(controls_no, 1), dtype=bool)
+    main = np.vstack(
+        (
+            np.hstack((controls, target)),
+            rng.integers(2, size=(samples, controls_no + 1), dtype=bool),
+        )
+    )
+    auxiliary_shape = (len(main), qubits_no - controls_no - 1)
+    if dirty:
+        auxiliary = rng.integers(2, size=auxiliary_shape, dtype=bool)
+        auxiliary[[controls_no, controls_no + 1]] = True
+    else:
+        auxiliary = np.zeros(auxiliary_shape, dtype=bool)
+    bitstrings = np.hstack((main, auxiliary))
+
+    slices = _bit_slices(bitstrings)
+    ones = (1 << len(bitstrings)) - 1
+    expected = list(slices)
+    all_set = ones
+    for qubit in range(controls_no):
+        all_set &= slices[qubit]
+    expected[controls_no] ^= all_set
+    _apply_bit_slices(gates, slices, ones)
+
+    errors = 0
+    for qubit in range(controls_no + 1):
+        errors |= slices[qubit] ^ expected[qubit]
+    if errors:
+        sample = (errors & -errors).bit_length() - 1
+        return False, f"The main qubits are not mapped as by MCT on bitstring {sample}"
+    if not wasting:
+        for qubit in range(controls_no + 1, qubits_no):
+            errors |= slices[qubit] ^ expected[qubit]
+        if errors:
+            sample = (errors & -errors).bit_length() - 1
+            return False, f"The auxiliary qubits are not restored on bitstring {sample}"
+    return True, ""
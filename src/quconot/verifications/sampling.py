@@ -0,0 +1,362 @@
+from typing import TYPE_CHECKING, Callable, Dict, List, Optional, Tuple, Union
+
+import numpy as np
+from qiskit import QuantumCircuit
+from qiskit.circuit import Instruction
+
+from .budget import PartialResult, _deadline
+from .functions import ABS_TOLERANCE, REL_TOLERANCE, _split_dims
+from .monomial import AnyMatrix, MonomialMatrix, _monomial_permutation
+from .reversible import _controlled_x
+from .simulation import _DROP_TOLERANCE, _small_matrix, _visit_operations
+from .streaming import _STREAM_CHECKS, _as_circuit
+
+if TYPE_CHECKING:
+    from ..implementations.mct_base import MCTBase
+
+# default number of sampled inputs
+DEFAULT_SAMPLES = 64
+
+# default number of qubits of a product input in random superpositions
+DEFAULT_PRODUCT_QUBITS = 6
+
+# default share of the inputs violating the class which the confidence refers to
+DEFAULT_FRACTION = 0.01
+
+# sparse state: basis indices and their amplitudes
+State = Tuple[np.ndarray, np.ndarray]
+
+# gate of the sparse simulation: ("x", masks), ("monomial", permutation, phases,
+# qubits) or ("dense", matrix, qubits)
+_SparseGate = Tuple
+
+
+def _flatten_sparse(circuit: QuantumCircuit) -> Tuple[List[_SparseGate], float]:
+    """Flattens a circuit into multi-controlled X gates and small gate matrices.
+
+    Unlike the dense simulation, multi-controlled X gates are kept whole, so that large
+    Toffoli gates do not decompose into gates creating superpositions.
+    """
+    gates: List[_SparseGate] = []
+
+    def apply(operation: Instruction, qubits: Tuple[int, ...]) -> bool:
+        controlled_x = _controlled_x(operation, qubits)
+        if controlled_x is not None:
+            gates.append(("x", controlled_x))
+            return True
+        matrix = _small_matrix(operation)
+        if matrix is None:
+            return False
+        try:
+            gate = MonomialMatrix.from_matrix(matrix)
+            gates.append(("monomial", gate.permutation, gate.phases, qubits))
+        except ValueError:
+            gates.append(("dense", matrix, qubits))
+        return True
+
+    return gates, _visit_operations(circuit, apply)
+
+
+def _local_indices(indices: np.ndarray, qubits: Tuple[int, ...]) -> np.ndarray:
+    """Returns the basis index of the gate qubits in each of the basis indices."""
+    local = np.zeros_like(indices)
+    for position, qubit in enumerate(qubits):
+        local |= ((indices >> qubit) & 1) << position
+    return local
+
+
+def _scatter(local: np.ndarray, qubits: Tuple[int, ...]) -> np.ndarray:
+    """Returns the bits of the local indices placed at the gate qubits."""
+    bits = np.zeros_like(local)
+    for position, qubit in enumerate(qubits):
+        bits |= ((local >> position) & 1) << qubit
+    return bits
+
+
+def _apply_sparse(gates: List[_SparseGate], global_phase: float, state: State) -> State:
+    """Applies the gates to a state stored by its nonzero amplitudes.
+
+    Monomial gates only move and rotate the amplitudes, other gates spread each of them
+    over the basis states of their qubits, and the amplitudes landing on the same basis
+    state are summed and dropped if they cancel.
+    """
+    indices, amplitudes = state
+    for gate in gates:
+        if gate[0] == "x":
+            mask, values, target = gate[1]
+            flip = (indices & mask) == values
+            indices = np.where(flip, indices ^ target, indices)
+        elif gate[0] == "monomial":
+            _, permutation, phases, qubits = gate
+            local = _local_indices(indices, qubits)
+            changes = _scatter(local ^ permutation[local], qubits)
+            indices = indices ^ changes
+            amplitudes = amplitudes * phases[local]
+        else:
+            _, matrix, qubits = gate
+            local = _local_indices(indices, qubits)
+            base = indices ^ _scatter(local, qubits)
+            outputs = np.arange(len(matrix))
+            spread = (base[None, :] | _scatter(outputs, qubits)[:, None]).ravel()
+            values = (matrix[:, local] * amplitudes[None, :]).ravel()
+            indices, positions = np.unique(spread, return_inverse=True)
+            amplitudes = np.zeros(len(indices), dtype=complex)
+            np.add.at(amplitudes, positions.ravel(), values)
+            kept = np.abs(amplitudes) > _DROP_TOLERANCE
+            indices, amplitudes = indices[kept], amplitudes[kept]
+    return indices, np.exp(1j * global_phase) * amplitudes
+
+
+def _product_state(
+    base: int, superposed: np.ndarray, rng: np.random.Generator
+) -> State:
+    """Returns the basis state ``base`` with the given qubits in random states."""
+    indices = np.array([base & ~int(sum(1 << int(q) for q in superposed))])
+    amplitudes = np.ones(1, dtype=complex)
+    for qubit in superposed:
+        qubit_state = rng.normal(size=2) + 1j * rng.normal(size=2)
+        qubit_state /= np.linalg.norm(qubit_state)
+        indices = np.concatenate((indices, indices | (1 << int(qubit))))
+        amplitudes = np.concatenate(
+            (amplitudes * qubit_state[0], amplitudes * qubit_state[1])
+        )
+    return indices, amplitudes
+
+
+class _Sample:
+    """Input ``beta (x) alpha`` and output of the circuit, as dense arrays over the basis
+    states of the auxiliary and main systems in their supports.
+
+    Args:
+        beta (State): state of the auxiliary system
+        alpha (State): state of the main system
+        output (State): output of the circuit
+        permutation (np.ndarray): permutation of the reference
+        main_dim (int): dimension of the main system
+        anchor (Optional[State]): auxiliary state learnt from the input |0, 0>, the zero
+            vector if None
+    """
+
+    def __init__(
+        self,
+        beta: State,
+        alpha: State,
+        output: State,
+        permutation: np.ndarray,
+        main_dim: int,
+        anchor: Optional[State] = None,
+    ) -> None:
+        out_aux, out_main = np.divmod(output[0], main_dim)
+        mapped = permutation[alpha[0]]
+        aux_keys = [out_aux, beta[0]] + ([] if anchor is None else [anchor[0]])
+        self.aux_keys = np.unique(np.concatenate(aux_keys))
+        self.main_keys = np.unique(np.concatenate((out_main, mapped)))
+
+        self.matrix = np.zeros((len(self.aux_keys), len(self.main_keys)), dtype=complex)
+        self.matrix[
+            np.searchsorted(self.aux_keys, out_aux),
+            np.searchsorted(self.main_keys, out_main),
+        ] = output[1]
+        self.beta = self._dense(self.aux_keys, beta)
+        # R alpha, the main input mapped by the reference
+        self.mapped = self._dense(self.main_keys, (mapped, alpha[1]))
+        self.anchor = np.zeros(len(self.aux_keys), dtype=complex)
+        if anchor is not None:
+            self.anchor = self._dense(self.aux_keys, anchor)
+
+    @staticmethod
+    def _dense(keys: np.ndarray, state: State) -> np.ndarray:
+        vector = np.zeros(len(keys), dtype=complex)
+        vector[np.searchsorted(keys, state[0])] = state[1]
+        return vector
+
+
+def _close(a: np.ndarray, b: np.ndarray) -> bool:
+    return np.allclose(a, b, atol=ABS_TOLERANCE, rtol=REL_TOLERANCE)
+
+
+def _leading_factors(matrix: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """Returns ``x, y`` with ``matrix == outer(x, y)`` if the matrix has rank one."""
+    i, j = np.unravel_index(np.argmax(np.abs(matrix)), matrix.shape)
+    return matrix[:, j], matrix[i, :] / matrix[i, j]
+
+
+def _sample_strict_non_wasting(sample: _Sample, phase: complex) -> bool:
+    return _close(sample.matrix, phase * np.outer(sample.beta, sample.mapped))
+
+
+def _sample_relative_non_wasting(sample: _Sample, phase: complex) -> bool:
+    y = sample.beta.conj() @ sample.matrix
+    return _close(sample.matrix, np.outer(sample.beta, y)) and _close(
+        np.abs(y), np.abs(sample.mapped)
+    )
+
+
+def _sample_wasting_entangled(sample: _Sample, phase: complex) -> bool:
+    return _close(np.linalg.norm(sample.matrix, axis=0), np.abs(sample.mapped))
+
+
+def _sample_strict_clean_wasting_separable(sample: _Sample, phase: complex) -> bool:
+    return _close(sample.matrix, np.outer(sample.anchor, sample.mapped))
+
+
+def _sample_relative_clean_wasting_separable(sample: _Sample, phase: complex) -> bool:
+    y = sample.anchor.conj() @ sample.matrix
+    return _close(sample.matrix, np.outer(sample.anchor, y)) and _close(
+        np.abs(y), np.abs(sample.mapped)
+    )
+
+
+def _sample_strict_dirty_wasting_separable(sample: _Sample, phase: complex) -> bool:
+    x = sample.matrix @ sample.mapped.conj()
+    return _close(sample.matrix, np.outer(x, sample.mapped))
+
+
+def _sample_relative_dirty_wasting_separable(sample: _Sample, phase: complex) -> bool:
+    x, y = _leading_factors(sample.matrix)
+    return _close(sample.matrix, np.outer(x, y)) and _close(
+        np.abs(y) * np.linalg.norm(x), np.abs(sample.mapped)
+    )
+
+
+# condition of each class on a sample, given the phase learnt from the input |0, 0>
+_SAMPLE_CHECKS: Dict[str, Callable[[_Sample, complex], bool]] = {
+    "SCNW": _sample_strict_non_wasting,
+    "RCNW": _sample_relative_non_wasting,
+    "SDNW": _sample_strict_non_wasting,
+    "RDNW": _sample_relative_non_wasting,
+    "SCWE": _sample_wasting_entangled,
+    "SCWS": _sample_strict_clean_wasting_separable,
+    "RCWS": _sample_relative_clean_wasting_separable,
+    "SDWE": _sample_wasting_entangled,
+    "SDWS": _sample_strict_dirty_wasting_separable,
+    "RDWS": _sample_relative_dirty_wasting_separable,
+}
+
+
+def _random_base(
+    dim: int, active: np.ndarray, rng: np.random.Generator
+) -> Tuple[int, bool]:
+    """Returns a random basis index, half of the time one of the active ones, and whether
+    it was drawn uniformly."""
+    if len(active) and rng.random() < 0.5:
+        return int(rng.choice(active)), False
+    return int(rng.integers(dim)), True
+
+
+def verify_circuit_sampled(
+    circuit: Union[QuantumCircuit, "MCTBase"],
+    ref_unitary: AnyMatrix,
+    class_name: str,
+    samples: int = DEFAULT_SAMPLES,
+    product_qubits: int = DEFAULT_PRODUCT_QUBITS,
+    fraction: float = DEFAULT_FRACTION,
+    seed: Optional[int] = None,
+    budget: Optional[float] = None,
+) -> Union[Tuple[bool, str, float], PartialResult]:
+    """Verifies the class conditions on randomly sampled inputs of the circuit.
+
+    The inputs are simulated as sparse state vectors, so the cost depends on the number
+    of gates and on the superpositions they create, not on the ``2**n`` dimension, and
+    circuits far beyond dense unitaries are checked in seconds. Half of the samples are
+    computational basis states and half are product states, with up to
+    ``product_qubits`` qubits in random single-qubit states, which tests the coherence
+    between ``2**product_qubits`` columns at once. The auxiliary qubits are in |0> for the
+    clean classes and in random basis or product states for the dirty ones. Half of the
+    main inputs are drawn around the basis states moved by the reference, e.g. the ones
+    with all the controls set, and half uniformly. The input |0, 0> is always simulated
+    first, to learn the phase or the auxiliary state that the strict and the separable
+    classes compare the other samples with.
+
+    Rejections are certain up to rounding. For an accepted circuit, the confidence is
+    the probability that some of the uniform samples would have hit an input violating
+    the class, if a share ``fraction`` of the uniform inputs did, i.e.
+    ``1 - (1 - fraction)**uniform_samples``. With a ``budget`` the deadline is checked
+    before each sample, and the result is a PartialResult with the samples checked and
+    the confidence they give.
+
+    Args:
+        circuit (Union[QuantumCircuit, MCTBase]): the circuit or the MCT implementation
+        ref_unitary (AnyMatrix): true 0-1 unitary matrix
+        class_name (str): class abbreviation, e.g. "SCNW" or "RDWS"
+        samples (int): number of sampled inputs besides |0, 0>
+        product_qubits (int): maximal number of qubits in superposition in the inputs
+        fraction (float): share of the violating inputs the confidence refers to
+        seed (Optional[int]): seed of the random number generator
+        budget (Optional[float]): seconds the verification may take, None for no limit
+
+    Returns:
+        Union[Tuple[bool, str, float], PartialResult]: flag denoting if the circuit
+            passed all the samples, reason if it did not, and the confidence of the
+            answer, or the PartialResult if a budget is given.
+    """
+    if class_name not in _SAMPLE_CHECKS:
+        raise ValueError(f"Unknown class {class_name}")
+    if samples < 1:
+        raise ValueError("Number of samples must be >= 1")
+
+    deadline = _deadline(budget)
+    circuit = _as_circuit(circuit)
+    _, main_dim, aux_dim = _split_dims(2**circuit.num_qubits, ref_unitary.shape[0])
+    main_qubits = main_dim.bit_length() - 1
+    aux_qubits = circuit.num_qubits - main_qubits
+    permutation = _monomial_permutation(ref_unitary)
+    active = np.flatnonzero(permutation != np.arange(main_dim))
+    clean = _STREAM_CHECKS[class_name][1]
+    check = _SAMPLE_CHECKS[class_name]
+    gates, global_phase = _flatten_sparse(circuit)
+    rng = np.random.default_rng(seed)
+
+    def run(beta: State, alpha: State) -> State:
+        indices = (beta[0][:, None] * main_dim + alpha[0][None, :]).ravel()
+        amplitudes = (beta[1][:, None] * alpha[1][None, :]).ravel()
+        return _apply_sparse(gates, global_phase, (indices, amplitudes))
+
+    def result(
+        flag: bool, msg: str, confidence: float, checked: int
+    ) -> Union[Tuple[bool, str, float], PartialResult]:
+        if deadline is None:
+            return flag, msg, confidence
+        return PartialResult(
+            {class_name: (flag, msg)},
+            (),
+            checked,
+            samples,
+            confidence,
+            deadline.overrun(),
+        )
+
+    zero = (np.zeros(1, dtype=np.int64), np.ones(1, dtype=complex))
+    output = run(zero, zero)
+    out_aux, out_main = np.divmod(output[0], main_dim)
+    at_anchor = out_main == permutation[0]
+    anchor = (out_aux[at_anchor], output[1][at_anchor])
+    phase = complex(np.sum(output[1][output[0] == permutation[0]]))
+    if not check(_Sample(zero, zero, output, permutation, main_dim, anchor), phase):
+        return result(False, "The class condition fails on the input |0, 0>", 1.0, 0)
+
+    uniform = 0
+    for sample in range(samples):
+        if deadline is not None and deadline.expired():
+            confidence = 1.0 - (1.0 - fraction) ** uniform
+            return PartialResult(
+                {}, (class_name,), sample, samples, confidence, deadline.overrun()
+            )
+        product = sample % 2 == 1
+        base, drawn_uniformly = _random_base(main_dim, active, rng)
+        uniform += drawn_uniformly
+        qubits_no = min(product_qubits, main_qubits) if product else 0
+        superposed = rng.choice(main_qubits, size=qubits_no, replace=False)
+        alpha = _product_state(base, superposed, rng)
+        beta = zero
+        if not clean and aux_qubits:
+            qubits_no = min(product_qubits, aux_qubits) if product else 0
+            superposed = rng.choice(aux_qubits, size=qubits_no, replace=False)
+            beta = _product_state(int(rng.integers(aux_dim)), superposed, rng)
+
+        data = _Sample(beta, alpha, run(beta, alpha), permutation, main_dim, anchor)
+        if not check(data, phase):
+            kind = "product" if product else "basis"
+            msg = f"The class condition fails on the {kind} sample {sample}"
+            return result(False, msg, 1.0, sample + 1)
+    return result(True, "", 1.0 - (1.0 - fraction) ** uniform, samples)
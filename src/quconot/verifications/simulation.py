@@ -0,0 +1,187 @@
+from typing import Callable, Iterable, Iterator, List, Optional, Sequence, Tuple
+
+import numpy as np
+from qiskit import QuantumCircuit
+from qiskit.circuit import Instruction
+from qiskit.exceptions import QiskitError
+from qiskit.quantum_info import Operator
+from scipy import sparse
+
+# gates on at most this many qubits are applied as dense matrices, larger are decomposed
+_MAX_GATE_QUBITS = 3
+
+# default number of columns simulated at once
+DEFAULT_BLOCK_SIZE = 32
+
+# simulated amplitudes of at most this modulus are rounding errors of zeros
+_DROP_TOLERANCE = 1e-12
+
+# gate matrix and the qubits it acts on, in the little-endian order of qiskit
+Gate = Tuple[np.ndarray, Tuple[int, ...]]
+
+
+def _visit_operations(
+    circuit: QuantumCircuit, apply: Callable[[Instruction, Tuple[int, ...]], bool]
+) -> float:
+    """Passes the operations of a circuit to ``apply`` in the order of application.
+
+    Operations for which ``apply`` returns False are replaced by their definitions,
+    recursively. Barriers are skipped.
+
+    Args:
+        circuit (QuantumCircuit): circuit without measurements
+        apply (Callable[[Instruction, Tuple[int, ...]], bool]): callback taking an
+            operation and the qubits it acts on, and returning whether it was accepted
+
+    Returns:
+        float: the global phase collected from the circuit and the decomposed definitions
+    """
+    global_phase = 0.0
+
+    def visit(circ: QuantumCircuit, qubits: Tuple[int, ...]) -> None:
+        nonlocal global_phase
+        global_phase += float(circ.global_phase)
+        for instruction in circ.data:
+            operation = instruction.operation
+            if operation.name == "barrier":
+                continue
+            targets = tuple(
+                qubits[circ.find_bit(qubit).index] for qubit in instruction.qubits
+            )
+            if apply(operation, targets):
+                continue
+            if operation.definition is None:
+                raise ValueError(f"Operation {operation.name} cannot be simulated")
+            visit(operation.definition, targets)
+
+    visit(circuit, tuple(range(circuit.num_qubits)))
+    return global_phase
+
+
+def _small_matrix(operation: Instruction) -> Optional[np.ndarray]:
+    """Returns the matrix of an operation on at most _MAX_GATE_QUBITS qubits, or None."""
+    if operation.num_qubits > _MAX_GATE_QUBITS:
+        return None
+    try:
+        return Operator(operation).data
+    except QiskitError:
+        return None
+
+
+def _flatten(circuit: QuantumCircuit) -> Tuple[List[Gate], float]:
+    """Flattens a circuit into a list of small gate matrices.
+
+    Args:
+        circuit (QuantumCircuit): circuit without measurements
+
+    Returns:
+        Tuple[List[Gate], float]: gates in the order of application, and the global phase
+            collected from the decomposed definitions
+    """
+    gates: List[Gate] = []
+
+    def apply(operation: Instruction, qubits: Tuple[int, ...]) -> bool:
+        matrix = _small_matrix(operation)
+        if matrix is None:
+            return False
+        gates.append((matrix, qubits))
+        return True
+
+    return gates, _visit_operations(circuit, apply)
+
+
+def _apply_gates(
+    gates: Sequence[Gate], global_phase: float, states: np.ndarray, num_qubits: int
+) -> np.ndarray:
+    """Applies the gates to a block of state vectors stored as columns.
+
+    Args:
+        gates (Sequence[Gate]): gates in the order of application
+        global_phase (float): global phase of the circuit
+        states (np.ndarray): ``2**num_qubits x k`` matrix of states
+        num_qubits (int): number of qubits
+
+    Returns:
+        np.ndarray: evolved states, of the same shape
+    """
+    block = states.shape[1]
+    tensor = states.astype(complex).reshape((2,) * num_qubits + (block,))
+    for matrix, qubits in gates:
+        arity = len(qubits)
+        # axis of qubit q is num_qubits - 1 - q, the gate matrix is little-endian too
+        axes = [num_qubits - 1 - q for q in reversed(qubits)]
+        gate = matrix.reshape((2,) * (2 * arity))
+        tensor = np.tensordot(gate, tensor, axes=(list(range(arity, 2 * arity)), axes))
+        tensor = np.moveaxis(tensor, list(range(arity)), axes)
+    return np.exp(1j * global_phase) * tensor.reshape(states.shape)
+
+
+def simulate_columns(
+    circuit: QuantumCircuit,
+    indices: Iterable[int],
+    block_size: int = DEFAULT_BLOCK_SIZE,
+) -> Iterator[Tuple[int, np.ndarray]]:
+    """Yields the columns of the circuit unitary without building the unitary.
+
+    Basis states are simulated in blocks of ``block_size`` columns, so at most a block of
+    state vectors is kept in memory and stopping the iteration stops the simulation.
+
+    Args:
+        circuit (QuantumCircuit): simulated circuit
+        indices (Iterable[int]): indices of the columns, i.e. of the input basis states
+        block_size (int): number of columns simulated at once
+
+    Yields:
+        Tuple[int, np.ndarray]: column index and the column
+    """
+    gates, global_phase = _flatten(circuit)
+    global_dim = 2**circuit.num_qubits
+    indices = iter(indices)
+    while True:
+        chunk = [index for _, index in zip(range(block_size), indices)]
+        if not chunk:
+            return
+        states = np.zeros((global_dim, len(chunk)))
+        states[chunk, np.arange(len(chunk))] = 1.0
+        evolved = _apply_gates(gates, global_phase, states, circuit.num_qubits)
+        for position, index in enumerate(chunk):
+            yield index, evolved[:, position]
+
+
+def simulate_sparse(
+    circuit: QuantumCircuit, block_size: int = DEFAULT_BLOCK_SIZE
+) -> sparse.csc_matrix:
+    """Computes the unitary of a circuit as a sparse matrix.
+
+    Columns are simulated in blocks of ``block_size`` basis states and only their
+    entries exceeding ``_DROP_TOLERANCE`` in modulus are kept, so memory is proportional
+    to the number of nonzero entries of the unitary instead of its ``4**n`` entries.
+
+    Args:
+        circuit (QuantumCircuit): simulated circuit
+        block_size (int): number of columns simulated at once
+
+    Returns:
+        sparse.csc_matrix: the unitary of the circuit
+    """
+    gates, global_phase = _flatten(circuit)
+    global_dim = 2**circuit.num_qubits
+    data: List[np.ndarray] = []
+    rows: List[np.ndarray] = []
+    counts: List[np.ndarray] = []
+    for start in range(0, global_dim, block_size):
+        stop = min(start + block_size, global_dim)
+        states = np.zeros((global_dim, stop - start))
+        states[np.arange(start, stop), np.arange(stop - start)] = 1.0
+        evolved = _apply_gates(gates, global_phase, states, circuit.num_qubits).T
+        # transposed, the nonzero entries come sorted by column and then by row
+        columns, column_rows = np.nonzero(np.abs(evolved) > _DROP_TOLERANCE)
+        data.append(evolved[columns, column_rows])
+        rows.append(column_rows)
+        counts.append(np.bincount(columns, minlength=stop - start))
+    indptr = np.zeros(global_dim + 1, dtype=np.int64)
+    np.cumsum(np.concatenate(counts), out=indptr[1:])
+    return sparse.csc_matrix(
+        (np.concatenate(data), np.concatenate(rows), indptr),
+        shape=(global_dim, global_dim),
+    )
@@ -0,0 +1,136 @@
+import time
+import tracemalloc
+from contextlib import contextmanager
+from typing import Dict, Iterator, List, Optional, Tuple
+
+# stages of the dense verifiers, in the order they run
+STAGES = ("prescreen", "projection", "reference", "rkp", "tolerance")
+
+# estimated real floating-point operations of a complex multiply-add
+COMPLEX_FLOPS = 8
+
+
+class StageStats:
+    """Totals of a stage over the verifier calls.
+
+    Attributes:
+        calls (int): number of times the stage ran
+        seconds (float): wall time
+        flops (int): estimated floating-point operations
+        peak_bytes (int): largest memory allocated on top of the memory in use when the
+            stage started, 0 if the memory is not tracked
+    """
+
+    def __init__(self) -> None:
+        self.calls = 0
+        self.seconds = 0.0
+        self.flops = 0
+        self.peak_bytes = 0
+
+    def as_dict(self) -> Dict[str, float]:
+        return {
+            "calls": self.calls,
+            "seconds": self.seconds,
+            "flops": self.flops,
+            "peak_bytes": self.peak_bytes,
+        }
+
+
+class VerificationStats:
+    """Collector of per-stage statistics of the verifiers.
+
+    Statistics are aggregated by the class abbreviation and the dimension of the tested
+    matrix. Every verifier call records the stage "total", and the dense verifiers also
+    the stages of STAGES: the O(d) "prescreen" of necessary conditions, "projection"
+    onto the clean-ancilla or residual states, "reference" multiplication by the inverse
+    of the reference, "rkp" for the reverse Kronecker product and its SVD, and the
+    "tolerance" check. Intermediates shared by
+    several classes, e.g. in classify, are recorded in the class that computed them
+    first. FLOPs are estimated from the dimensions, counting a complex multiply-add as
+    COMPLEX_FLOPS.
+
+    Args:
+        track_memory (bool): record the peak bytes allocated, with tracemalloc, which is
+            started for the duration of each verifier call unless already tracing
+    """
+
+    def __init__(self, track_memory: bool = False) -> None:
+        self.track_memory = track_memory
+        self.stages: Dict[Tuple[str, int], Dict[str, StageStats]] = {}
+        self._current: Optional[Tuple[str, int]] = None
+        # memory in use at the start and largest peak seen of the running stages
+        self._memory: List[List[int]] = []
+
+    @contextmanager
+    def verifying(self, class_name: str, dim: int) -> Iterator[None]:
+        """Attributes the stages run in the context to the class and dimension."""
+        previous, self._current = self._current, (class_name, dim)
+        started = self.track_memory and not tracemalloc.is_tracing()
+        if started:
+            tracemalloc.start()
+        try:
+            with self.stage("total"):
+                yield
+        finally:
+            if started:
+                tracemalloc.stop()
+            self._current = previous
+
+    @contextmanager
+    def stage(self, name: str, flops: int = 0) -> Iterator[None]:
+        """Records the wall time, FLOPs and peak memory of the stage run in the context."""
+        key = ("", 0) if self._current is None else self._current
+        stats = self.stages.setdefault(key, {}).setdefault(name, StageStats())
+        tracing = self.track_memory and tracemalloc.is_tracing()
+        if tracing:
+            # the peak of tracemalloc is reset, the peak of the outer stages is kept here
+            current, peak = tracemalloc.get_traced_memory()
+            if self._memory:
+                self._memory[-1][1] = max(self._memory[-1][1], peak)
+            self._memory.append([current, current])
+            tracemalloc.reset_peak()
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            stats.seconds += time.perf_counter() - start
+            stats.calls += 1
+            stats.flops += flops
+            if tracing:
+                baseline, seen = self._memory.pop()
+                peak = max(tracemalloc.get_traced_memory()[1], seen)
+                stats.peak_bytes = max(stats.peak_bytes, peak - baseline)
+                if self._memory:
+                    self._memory[-1][1] = max(self._memory[-1][1], peak)
+
+    def report(self) -> Dict[Tuple[str, int], Dict[str, Dict[str, float]]]:
+        """Returns the statistics of the stages, keyed by the class and the dimension.
+
+        Returns:
+            Dict[Tuple[str, int], Dict[str, Dict[str, float]]]: for each class
+                abbreviation and dimension, the calls, seconds, flops and peak_bytes of
+                each stage
+        """
+        return {
+            key: {name: stats.as_dict() for name, stats in stages.items()}
+            for key, stages in sorted(self.stages.items())
+        }
+
+    def __str__(self) -> str:
+        lines: List[str] = [
+            f"{'class':<6}{'dim':>8}  {'stage':<11}{'calls':>7}{'seconds':>12}"
+            f"{'GFLOP':>10}{'peak MiB':>10}"
+        ]
+        for (class_name, dim), stages in sorted(self.stages.items()):
+            for name in sorted(stages, key=_stage_order):
+                stats = stages[name]
+                lines.append(
+                    f"{class_name:<6}{dim:>8}  {name:<11}{stats.calls:>7}"
+                    f"{stats.seconds:>12.6f}{stats.flops / 1e9:>10.3f}"
+                    f"{stats.peak_bytes / 2**20:>10.2f}"
+                )
+        return "\n".join(lines)
+
+
+def _stage_order(name: str) -> int:
+    return STAGES.index(name) if name in STAGES else len(STAGES)
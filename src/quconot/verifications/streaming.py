@@ -0,0 +1,331 @@
+from functools import partial
+from typing import (
+    TYPE_CHECKING,
+    Callable,
+    Dict,
+    Iterator,
+    Optional,
+    Tuple,
+    Union,
+    overload,
+)
+
+import numpy as np
+from qiskit import QuantumCircuit
+
+from .budget import Deadline, PartialResult, _OutOfTime, _Timed
+from .functions import ABS_TOLERANCE, REL_TOLERANCE, _split_dims
+from .monomial import AnyMatrix, _monomial_permutation
+from .simulation import DEFAULT_BLOCK_SIZE, simulate_columns
+
+if TYPE_CHECKING:
+    from ..implementations.mct_base import MCTBase
+
+# stream of (column index, column of the global unitary)
+Columns = Iterator[Tuple[int, np.ndarray]]
+
+
+def _as_circuit(circuit: Union[QuantumCircuit, "MCTBase"]) -> QuantumCircuit:
+    if isinstance(circuit, QuantumCircuit):
+        return circuit
+    return circuit.generate_circuit()
+
+
+def _close(a: np.ndarray, b: Union[np.ndarray, float]) -> bool:
+    return np.allclose(a, b, atol=ABS_TOLERANCE, rtol=REL_TOLERANCE)
+
+
+def _basis(dim: int, index: int) -> np.ndarray:
+    ket = np.zeros(dim)
+    ket[index] = 1.0
+    return ket
+
+
+def _stream_strict_clean_non_wasting(
+    columns: Columns, permutation: np.ndarray, main_dim: int, aux_dim: int
+) -> Tuple[bool, str]:
+    phase = 0.0
+    for b, column in columns:
+        block = column[:main_dim]
+        if b == 0:
+            phase = block[permutation[0]]
+            if not np.isclose(abs(phase), 1.0, atol=ABS_TOLERANCE, rtol=REL_TOLERANCE):
+                return False, "Generated matrix should be all 0"
+        if not _close(block, phase * _basis(main_dim, permutation[b])):
+            return False, f"Generated matrix should be all 0, column {b} differs"
+    return True, ""
+
+
+def _stream_relative_clean_non_wasting(
+    columns: Columns, permutation: np.ndarray, main_dim: int, aux_dim: int
+) -> Tuple[bool, str]:
+    for b, column in columns:
+        block = column[:main_dim]
+        entry = block[permutation[b]]
+        if not np.isclose(
+            abs(entry), 1.0, atol=ABS_TOLERANCE, rtol=REL_TOLERANCE
+        ) or not _close(block, entry * _basis(main_dim, permutation[b])):
+            return False, f"Generated matrix should be all 0, column {b} differs"
+    return True, ""
+
+
+def _stream_strict_dirty_non_wasting(
+    columns: Columns, permutation: np.ndarray, main_dim: int, aux_dim: int
+) -> Tuple[bool, str]:
+    phase = 0.0
+    for index, column in columns:
+        c, b = divmod(index, main_dim)
+        if index == 0:
+            phase = column[permutation[0]]
+            if not np.isclose(abs(phase), 1.0, atol=ABS_TOLERANCE, rtol=REL_TOLERANCE):
+                return False, "Generated matrix should be all 0"
+        expected = phase * _basis(main_dim * aux_dim, c * main_dim + permutation[b])
+        if not _close(column, expected):
+            return False, f"Generated matrix should be all 0, column {index} differs"
+    return True, ""
+
+
+def _stream_relative_dirty_non_wasting(
+    columns: Columns, permutation: np.ndarray, main_dim: int, aux_dim: int
+) -> Tuple[bool, str]:
+    # the relative phases are learnt from the columns with auxiliary input |0>
+    phases = np.zeros(main_dim, dtype=complex)
+    for index, column in columns:
+        c, b = divmod(index, main_dim)
+        if c == 0:
+            phases[b] = column[permutation[b]]
+            if not np.isclose(
+                abs(phases[b]), 1.0, atol=ABS_TOLERANCE, rtol=REL_TOLERANCE
+            ):
+                return (
+                    False,
+                    f"Generated matrix V should be all 0, column {index} differs",
+                )
+        expected = phases[b] * _basis(main_dim * aux_dim, c * main_dim + permutation[b])
+        if not _close(column, expected):
+            return False, f"Matrix W should be identity, column {index} differs"
+    return True, ""
+
+
+def _residual(
+    column: np.ndarray, permutation: np.ndarray, b: int, main_dim: int
+) -> np.ndarray:
+    """Returns (I (x) <pi(b)|) applied to the column of input |c, b>."""
+    return column.reshape(-1, main_dim)[:, permutation[b]]
+
+
+def _stream_strict_wasting_entangled(
+    columns: Columns, permutation: np.ndarray, main_dim: int, aux_dim: int
+) -> Tuple[bool, str]:
+    for index, column in columns:
+        res = _residual(column, permutation, index % main_dim, main_dim)
+        if not np.isclose(np.linalg.norm(res), 1.0):
+            return False, f"The length should be 1, column {index} differs"
+    return True, ""
+
+
+def _stream_strict_clean_wasting_separable(
+    columns: Columns, permutation: np.ndarray, main_dim: int, aux_dim: int
+) -> Tuple[bool, str]:
+    phi_0 = np.zeros(aux_dim)
+    for b, column in columns:
+        res = _residual(column, permutation, b, main_dim)
+        # this is to get the |\phi_0>
+        if b == 0:
+            phi_0 = res
+        if not np.isclose(np.vdot(phi_0, res), 1):
+            return False, f"The state should be a quantum state, column {b} differs"
+    return True, ""
+
+
+def _stream_relative_clean_wasting_separable(
+    columns: Columns, permutation: np.ndarray, main_dim: int, aux_dim: int
+) -> Tuple[bool, str]:
+    psi = np.zeros(aux_dim)
+    for b, column in columns:
+        if b == 0:
+            psi = _residual(column, permutation, 0, main_dim)
+        generated = np.abs(psi.conj() @ column.reshape(aux_dim, main_dim))
+        if not _close(generated, _basis(main_dim, permutation[b])):
+            return False, f"Resulting matrix should be identity, column {b} differs"
+    return True, ""
+
+
+def _stream_dirty_wasting_separable(
+    columns: Columns,
+    permutation: np.ndarray,
+    main_dim: int,
+    aux_dim: int,
+    relative: bool,
+) -> Tuple[bool, str]:
+    # column |c, b> has to be w_c (x) lambda_b |pi(b)>, where lambda_b = 1 for strict
+    # classes and lambda_b are learnt from the columns with auxiliary input |0> otherwise
+    factors = np.ones(main_dim, dtype=complex)
+    w_c = np.zeros(aux_dim)
+    w_0 = np.zeros(aux_dim)
+    for index, column in columns:
+        c, b = divmod(index, main_dim)
+        res = _residual(column, permutation, b, main_dim)
+        if b == 0:
+            w_c = res
+            if c == 0:
+                w_0 = res
+            if not np.isclose(np.linalg.norm(res), 1.0):
+                return False, f"Not separable unitary matrix, column {index} differs"
+        elif relative and c == 0:
+            factors[b] = np.vdot(w_0, res)
+        expected = np.kron(factors[b] * w_c, _basis(main_dim, permutation[b]))
+        if not _close(column, expected):
+            return (
+                False,
+                f"Resulting matrix should be an Identity, column {index} differs",
+            )
+    return True, ""
+
+
+_StreamCheck = Callable[[Columns, np.ndarray, int, int], Tuple[bool, str]]
+
+# stream checks of all the classes, and whether they need only the clean-ancilla columns
+_STREAM_CHECKS: Dict[str, Tuple[_StreamCheck, bool]] = {
+    "SCNW": (_stream_strict_clean_non_wasting, True),
+    "RCNW": (_stream_relative_clean_non_wasting, True),
+    "SDNW": (_stream_strict_dirty_non_wasting, False),
+    "RDNW": (_stream_relative_dirty_non_wasting, False),
+    "SCWE": (_stream_strict_wasting_entangled, True),
+    "SCWS": (_stream_strict_clean_wasting_separable, True),
+    "RCWS": (_stream_relative_clean_wasting_separable, True),
+    "SDWE": (_stream_strict_wasting_entangled, False),
+    "SDWS": (partial(_stream_dirty_wasting_separable, relative=False), False),
+    "RDWS": (partial(_stream_dirty_wasting_separable, relative=True), False),
+}
+
+
+@overload
+def verify_circuit_streaming(
+    circuit: Union[QuantumCircuit, "MCTBase"],
+    ref_unitary: AnyMatrix,
+    class_name: str,
+    budget: None = ...,
+) -> Tuple[bool, str]:
+    ...
+
+
+@overload
+def verify_circuit_streaming(
+    circuit: Union[QuantumCircuit, "MCTBase"],
+    ref_unitary: AnyMatrix,
+    class_name: str,
+    budget: Optional[float] = ...,
+) -> Union[Tuple[bool, str], PartialResult]:
+    ...
+
+
+def verify_circuit_streaming(
+    circuit: Union[QuantumCircuit, "MCTBase"],
+    ref_unitary: AnyMatrix,
+    class_name: str,
+    budget: Optional[float] = None,
+) -> Union[Tuple[bool, str], PartialResult]:
+    """Verifies if the circuit is of the given class without building its unitary.
+
+    Columns of the circuit unitary are simulated in small blocks of basis states and
+    checked against the reference as they arrive, stopping at the first violation.
+    Clean-ancilla classes need only the ``main_dim`` columns with auxiliary qubits in |0>,
+    and at most a block of state vectors is kept in memory. The checks require the
+    reference matrix to be a permutation matrix.
+
+    With a ``budget`` the deadline is checked before each column, and the result is a
+    PartialResult with the number of columns checked, whose share of all the columns is
+    the confidence of a pending answer.
+
+    Args:
+        circuit (Union[QuantumCircuit, MCTBase]): the circuit or the MCT implementation
+        ref_unitary (AnyMatrix): true 0-1 unitary matrix
+        class_name (str): class abbreviation, e.g. "SCNW" or "RDWS"
+        budget (Optional[float]): seconds the verification may take, None for no limit
+
+    Returns:
+        Union[Tuple[bool, str], PartialResult]: flag denoting if the circuit is of given
+            class, and reason if it is not, or the PartialResult if a budget is given.
+    """
+    if class_name not in _STREAM_CHECKS:
+        raise ValueError(f"Unknown class {class_name}")
+
+    circuit = _as_circuit(circuit)
+    global_dim, main_dim, aux_dim = _split_dims(
+        2**circuit.num_qubits, ref_unitary.shape[0]
+    )
+    permutation = _monomial_permutation(ref_unitary)
+
+    check, clean = _STREAM_CHECKS[class_name]
+    total = main_dim if clean else global_dim
+    columns = simulate_columns(circuit, range(total))
+    if budget is None:
+        return check(columns, permutation, main_dim, aux_dim)
+
+    deadline = Deadline(budget)
+    timed = _Timed(columns, deadline)
+    try:
+        flag, msg = check(timed, permutation, main_dim, aux_dim)
+    except _OutOfTime as error:
+        return PartialResult(
+            {},
+            (class_name,),
+            error.checked,
+            total,
+            error.checked / total,
+            deadline.overrun(),
+        )
+    return PartialResult(
+        {class_name: (flag, msg)},
+        (),
+        timed.checked,
+        total,
+        overrun=deadline.overrun(),
+    )
+
+
+def _stored_columns(matrix: np.ndarray, stop: int, block_size: int) -> Columns:
+    """Yields the first ``stop`` columns of a stored matrix, read in blocks."""
+    for start in range(0, stop, block_size):
+        end = min(start + block_size, stop)
+        block = np.asarray(matrix[:, start:end])
+        for offset in range(block.shape[1]):
+            yield start + offset, block[:, offset]
+
+
+def verify_matrix_streaming(
+    tested_matrix: np.ndarray,
+    ref_unitary: AnyMatrix,
+    class_name: str,
+    block_size: int = DEFAULT_BLOCK_SIZE,
+) -> Tuple[bool, str]:
+    """Verifies a stored matrix with the checks of verify_circuit_streaming.
+
+    The matrix, e.g. a ``numpy.memmap`` built by build_unitary_memmap, is read in blocks
+    of ``block_size`` columns, so only a block is held in memory. Column-major storage
+    makes each block a contiguous read.
+
+    Args:
+        tested_matrix (np.ndarray): the global matrix to be tested
+        ref_unitary (AnyMatrix): true 0-1 unitary matrix
+        class_name (str): class abbreviation, e.g. "SCNW" or "RDWS"
+        block_size (int): number of columns read at once
+
+    Returns:
+        Tuple[bool, str]: flag denoting if the tested matrix is of given class, and reason
+            if it is not.
+    """
+    if class_name not in _STREAM_CHECKS:
+        raise ValueError(f"Unknown class {class_name}")
+
+    global_dim, main_dim, aux_dim = _split_dims(
+        tested_matrix.shape[0], ref_unitary.shape[0]
+    )
+    permutation = _monomial_permutation(ref_unitary)
+
+    check, clean = _STREAM_CHECKS[class_name]
+    columns = _stored_columns(
+        tested_matrix, main_dim if clean else global_dim, block_size
+    )
+    return check(columns, permutation, main_dim, aux_dim)
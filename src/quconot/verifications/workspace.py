@@ -0,0 +1,180 @@
+from typing import Dict, Iterator, Tuple
+
+import numpy as np
+
+# default size of a block of rows reduced at once, in bytes
+DEFAULT_BLOCK_BYTES = 4 * 2**20
+
+
+class Workspace:
+    """Reusable buffers of the dense verifiers.
+
+    The dense checks reduce the tested matrix block of rows by block of rows, with the
+    arithmetic done in place in the buffers of the workspace, so a check allocates a
+    couple of blocks instead of several full matrices. A workspace passed to many calls
+    keeps its buffers between them. It is not safe to share one between threads.
+
+    Args:
+        block_bytes (int): size of a block of rows reduced at once, in bytes
+    """
+
+    def __init__(self, block_bytes: int = DEFAULT_BLOCK_BYTES) -> None:
+        self.block_bytes = block_bytes
+        self._buffers: Dict[Tuple[str, np.dtype], np.ndarray] = {}
+
+    @property
+    def nbytes(self) -> int:
+        """Total size of the buffers held, in bytes."""
+        return sum(buffer.nbytes for buffer in self._buffers.values())
+
+    def buffer(self, name: str, shape: Tuple[int, ...], dtype: np.dtype) -> np.ndarray:
+        """Returns an uninitialized array backed by the named buffer, grown if needed."""
+        dtype = np.dtype(dtype)
+        size = int(np.prod(shape))
+        stored = self._buffers.get((name, dtype))
+        if stored is None or stored.size < size:
+            stored = np.empty(size, dtype=dtype)
+            self._buffers[(name, dtype)] = stored
+        return stored[:size].reshape(shape)
+
+    def row_blocks(self, rows_no: int, row_bytes: int) -> Iterator[Tuple[int, int]]:
+        """Yields the ranges of the blocks of rows of a matrix, as (start, stop)."""
+        step = max(1, self.block_bytes // max(1, row_bytes))
+        for start in range(0, rows_no, step):
+            yield start, min(start + step, rows_no)
+
+
+def _complex_dtype(dtype: np.dtype) -> np.dtype:
+    return np.result_type(dtype, np.complex64)
+
+
+def _take_columns(
+    matrix: np.ndarray, start: int, stop: int, columns: np.ndarray, out: np.ndarray
+) -> np.ndarray:
+    """Copies ``matrix[start:stop, columns]`` into ``out``."""
+    rows = matrix[start:stop]
+    if rows.dtype == out.dtype:
+        return np.take(rows, columns, axis=1, out=out)
+    out[...] = np.take(rows, columns, axis=1)
+    return out
+
+
+def _identity_deviation(
+    block: np.ndarray, start: int, targets: np.ndarray, rtol: float, real: np.ndarray
+) -> float:
+    """Returns the largest ``|block - E| - rtol * |E|`` of a block of rows, in place.
+
+    ``E`` is the block of the 0-1 matrix with the ones of row ``r`` in column
+    ``targets[r]``. The block is overwritten, and the magnitudes are written to ``real``.
+    """
+    stop = start + block.shape[0]
+    rows = np.arange(block.shape[0])
+    columns = targets[start:stop]
+    block[rows, columns] -= 1
+    np.abs(block, out=real)
+    real[rows, columns] -= rtol
+    return float(real.max()) if real.size else 0.0
+
+
+def _max_deviation(
+    matrix: np.ndarray,
+    columns: np.ndarray,
+    targets: np.ndarray,
+    workspace: Workspace,
+    scale: complex = 1.0,
+    absolute: bool = False,
+    rtol: float = 0.0,
+    limit: float = np.inf,
+) -> float:
+    """Returns the largest deviation of ``f(matrix[:, columns])`` from a 0-1 matrix.
+
+    ``f`` multiplies by ``scale``, or takes the magnitudes if ``absolute`` is set. The
+    matrix is reduced block of rows by block of rows in the buffers of the workspace, and
+    the reduction stops at the first block deviating by more than ``limit``.
+
+    Args:
+        matrix (np.ndarray): dense matrix
+        columns (np.ndarray): columns of the matrix taken, in order
+        targets (np.ndarray): column of the entry 1 of the 0-1 matrix, for each row
+        workspace (Workspace): buffers of the blocks
+        scale (complex): factor of the entries
+        absolute (bool): compare the magnitudes of the entries instead
+        rtol (float): relative tolerance, subtracted from the deviation of the ones
+        limit (float): deviation above which the reduction stops
+
+    Returns:
+        float: largest ``|f(matrix[:, columns]) - E| - rtol * |E|``
+    """
+    dtype = _complex_dtype(matrix.dtype)
+    real_dtype = np.finfo(dtype).dtype
+    worst = 0.0
+    for start, stop in workspace.row_blocks(
+        matrix.shape[0], len(columns) * dtype.itemsize
+    ):
+        shape = (stop - start, len(columns))
+        block = _take_columns(
+            matrix, start, stop, columns, workspace.buffer("block", shape, dtype)
+        )
+        real = workspace.buffer("real", shape, real_dtype)
+        if absolute:
+            np.abs(block, out=real)
+            block = real
+        elif scale != 1.0:
+            block *= scale
+        deviation = _identity_deviation(block, start, targets, rtol, real)
+        # written so that a NaN deviation is kept
+        if not deviation <= worst:
+            worst = deviation
+        if not worst <= limit:
+            break
+    return worst
+
+
+def _max_combined_deviation(
+    matrix: np.ndarray,
+    weights: np.ndarray,
+    targets: np.ndarray,
+    workspace: Workspace,
+    rtol: float = 0.0,
+    limit: float = np.inf,
+) -> float:
+    """Returns the largest deviation of ``|sum_c weights[c] * U_c|`` from a 0-1 matrix.
+
+    ``U_c`` are the ``main_dim x main_dim`` blocks ``matrix[c * main_dim + i, j]`` of a
+    ``(len(weights) * main_dim) x main_dim`` matrix, so the sum is the partial inner
+    product of the auxiliary system with the state of amplitudes ``weights``. It is
+    accumulated block of rows by block of rows in the buffers of the workspace, and the
+    reduction stops at the first block deviating by more than ``limit``.
+
+    Args:
+        matrix (np.ndarray): dense matrix of the stacked blocks
+        weights (np.ndarray): factors of the blocks
+        targets (np.ndarray): column of the entry 1 of the 0-1 matrix, for each row
+        workspace (Workspace): buffers of the blocks
+        rtol (float): relative tolerance, subtracted from the deviation of the ones
+        limit (float): deviation above which the reduction stops
+
+    Returns:
+        float: largest ``|abs(sum_c weights[c] * U_c) - E| - rtol * |E|``
+    """
+    main_dim = matrix.shape[1]
+    dtype = _complex_dtype(np.result_type(matrix.dtype, weights.dtype))
+    real_dtype = np.finfo(dtype).dtype
+    worst = 0.0
+    for start, stop in workspace.row_blocks(main_dim, main_dim * dtype.itemsize):
+        shape = (stop - start, main_dim)
+        total = workspace.buffer("block", shape, dtype)
+        term = workspace.buffer("term", shape, dtype)
+        total[...] = 0.0
+        for c, weight in enumerate(weights):
+            first, last = c * main_dim + start, c * main_dim + stop
+            np.multiply(matrix[first:last], weight, out=term)
+            total += term
+        real = workspace.buffer("real", shape, real_dtype)
+        np.abs(total, out=real)
+        deviation = _identity_deviation(real, start, targets, rtol, real)
+        if not deviation <= worst:
+            worst = deviation
+        if not worst <= limit:
+            break
+    return worst
@@ -0,0 +1,162 @@
+import time
+
+import numpy as np
+import pytest
+from qiskit.quantum_info import Operator
+
+from quconot.implementations import MCTBarenco74Dirty, MCTVChain
+from quconot.verifications import (
+    CLASS_NAMES,
+    PartialResult,
+    VerificationCache,
+    budget,
+    classify,
+    functions_testing,
+    mct_reference,
+    verify_circuit_probabilistic,
+    verify_circuit_relative_dirty_wasting_separable,
+    verify_circuit_sampled,
+    verify_circuit_streaming,
+)
+
+
+def _tested_matrix():
+    return Operator(MCTBarenco74Dirty(5).generate_circuit()).data
+
+
+def _expire_after(monkeypatch, calls):
+    """Lets the deadline pass after the given number of checks."""
+    remaining = [calls]
+
+    def expired(self):
+        remaining[0] -= 1
+        return remaining[0] < 0
+
+    monkeypatch.setattr(budget.Deadline, "expired", expired)
+
+
+@pytest.mark.parametrize("prune", [False, True])
+def test_classify_within_budget(prune):
+    tested_matrix = _tested_matrix()
+    expected = classify(tested_matrix, mct_reference(5), prune=prune)
+
+    result = classify(tested_matrix, mct_reference(5), prune=prune, budget=60.0)
+    assert isinstance(result, PartialResult)
+    assert result.complete and result.confidence == 1.0
+    assert result.decided == expected
+
+
+@pytest.mark.parametrize("prune", [False, True])
+def test_classify_out_of_time(monkeypatch, prune):
+    tested_matrix = _tested_matrix()
+    expected = classify(tested_matrix, mct_reference(5), prune=prune)
+    _expire_after(monkeypatch, 1)
+
+    result = classify(tested_matrix, mct_reference(5), prune=prune, budget=60.0)
+    assert not result.complete and result.confidence == 0.0
+    assert 0 < len(result.decided) < len(CLASS_NAMES)
+    assert set(result.decided) | set(result.pending) == set(CLASS_NAMES)
+    for class_name, answer in result.decided.items():
+        assert answer == expected[class_name]
+
+
+def test_verifier_out_of_time():
+    result = verify_circuit_relative_dirty_wasting_separable(
+        _tested_matrix(), mct_reference(5), budget=0.0
+    )
+    assert result.decided == {} and result.pending == ("RDWS",)
+
+    result = verify_circuit_relative_dirty_wasting_separable(
+        _tested_matrix(), mct_reference(5), budget=60.0
+    )
+    assert result.decided == {"RDWS": (True, "")}
+
+
+def test_overrunning_stage_is_finished(monkeypatch):
+    reverse_kronecker_product = functions_testing.reverse_kronecker_product
+
+    def slow(*args):
+        time.sleep(0.5)
+        return reverse_kronecker_product(*args)
+
+    monkeypatch.setattr(functions_testing, "reverse_kronecker_product", slow)
+
+    # the deadline passes during the reverse Kronecker product, whose check is finished
+    result = verify_circuit_relative_dirty_wasting_separable(
+        _tested_matrix(), mct_reference(5), budget=0.2
+    )
+    assert result.complete and result.decided == {"RDWS": (True, "")}
+    assert result.overrun > 0.2
+
+
+def test_budget_respected():
+    tested_matrix = Operator(MCTBarenco74Dirty(8).generate_circuit()).data
+    start = time.perf_counter()
+    classify(tested_matrix, mct_reference(8))
+    seconds = time.perf_counter() - start
+
+    start = time.perf_counter()
+    result = classify(tested_matrix, mct_reference(8), budget=seconds / 20)
+    assert time.perf_counter() - start < seconds / 2
+    assert result.pending
+
+
+def test_streaming_out_of_time(monkeypatch):
+    _expire_after(monkeypatch, 5)
+
+    result = verify_circuit_streaming(MCTVChain(3), mct_reference(3), "SCNW", 60.0)
+    assert result.pending == ("SCNW",)
+    assert result.checked == 5 and result.total == 16
+    assert result.confidence == 5 / 16
+
+
+def test_probabilistic_out_of_time(monkeypatch):
+    ref_unitary = np.roll(np.eye(4), 1, axis=0)
+    tested_matrix = np.kron(np.eye(2), ref_unitary).astype(complex)
+
+    result = verify_circuit_probabilistic(
+        tested_matrix, ref_unitary, "SDNW", probes=20, budget=60.0
+    )
+    assert result.decided == {"SDNW": (True, "")}
+    assert result.confidence == 1.0 - 2.0**-20
+
+    _expire_after(monkeypatch, 4)
+    result = verify_circuit_probabilistic(
+        tested_matrix, ref_unitary, "SDNW", probes=20, budget=60.0
+    )
+    assert result.pending == ("SDNW",)
+    assert result.checked == 4 and result.total == 20
+    assert result.confidence == 1.0 - 2.0**-4
+
+
+def test_sampled_out_of_time(monkeypatch):
+    _expire_after(monkeypatch, 8)
+
+    result = verify_circuit_sampled(
+        MCTBarenco74Dirty(5), mct_reference(5), "SDNW", samples=20, seed=1, budget=60.0
+    )
+    assert result.pending == ("SDNW",)
+    assert result.checked == 8 and result.total == 20
+    assert 0.0 <= result.confidence < 1.0
+
+
+def test_cache_keeps_decided(tmp_path, monkeypatch):
+    cache = VerificationCache(tmp_path)
+    implementation = MCTBarenco74Dirty(5)
+
+    with monkeypatch.context() as patch:
+        _expire_after(patch, 3)
+        result = cache.classify(implementation, mct_reference(5), budget=60.0)
+    assert result.decided and result.pending
+
+    # the stored answers are returned even when no check can run
+    stored = cache.classify(implementation, mct_reference(5), budget=0.0)
+    assert stored.decided == result.decided and stored.pending == result.pending
+
+    expected = classify(_tested_matrix(), mct_reference(5))
+    assert cache.classify(implementation, mct_reference(5)) == expected
+
+
+def test_negative_budget():
+    with pytest.raises(ValueError, match="Time budget"):
+        classify(_tested_matrix(), mct_reference(5), budget=-1.0)
@@ -0,0 +1,65 @@
+from qiskit import QuantumCircuit
+
+from quconot.implementations import MCTNoAuxiliaryRelative, MCTVChain
+from quconot.verifications import cache as cache_module
+from quconot.verifications import classify, mct_reference
+from quconot.verifications.cache import (
+    VerificationCache,
+    circuit_fingerprint,
+    matrix_fingerprint,
+)
+
+
+def test_fingerprints():
+    assert circuit_fingerprint(MCTVChain(3)) == circuit_fingerprint(MCTVChain(3))
+    assert circuit_fingerprint(MCTVChain(3)) != circuit_fingerprint(MCTVChain(4))
+
+    circuit = QuantumCircuit(2)
+    circuit.cx(0, 1)
+    swapped = QuantumCircuit(2)
+    swapped.cx(1, 0)
+    assert circuit_fingerprint(circuit) != circuit_fingerprint(swapped)
+
+    reference = mct_reference(3)
+    assert matrix_fingerprint(reference) == matrix_fingerprint(mct_reference(3))
+    assert matrix_fingerprint(reference) != matrix_fingerprint(reference.toarray())
+    assert matrix_fingerprint(reference.tocsr()) == matrix_fingerprint(
+        reference.tocsr().tocoo()
+    )
+
+
+def test_cached_verdicts(tmp_path, monkeypatch):
+    built = []
+    operator = cache_module.Operator
+
+    def counting_operator(circuit):
+        built.append(circuit)
+        return operator(circuit)
+
+    monkeypatch.setattr(cache_module, "Operator", counting_operator)
+
+    ref_unitary = mct_reference(3).toarray()
+    cache = VerificationCache(tmp_path)
+
+    res = cache.verify(MCTNoAuxiliaryRelative(3), ref_unitary, "SCNW")
+    assert res[0] is False
+    assert len(built) == 1
+
+    report = cache.classify(MCTNoAuxiliaryRelative(3), ref_unitary)
+    assert report == classify(
+        operator(MCTNoAuxiliaryRelative(3).generate_circuit()).data, ref_unitary
+    )
+    assert len(built) == 2
+
+    # a new cache on the same directory answers from disk
+    cache = VerificationCache(tmp_path)
+    assert cache.classify(MCTNoAuxiliaryRelative(3), ref_unitary) == report
+    assert (
+        cache.verify(MCTNoAuxiliaryRelative(3), ref_unitary, "RCNW") == report["RCNW"]
+    )
+    assert len(built) == 2
+    assert set(cache.timings(MCTNoAuxiliaryRelative(3), ref_unitary)) == set(report)
+
+    # other settings are other keys
+    cache.verify(MCTNoAuxiliaryRelative(3), ref_unitary, "RCNW", precision="single")
+    assert len(built) == 3
@@ -0,0 +1,176 @@
+import numpy as np
+import pytest
+
+from quconot.verifications import classification, functions_testing
+from quconot.verifications.classification import (
+    CLASS_NAMES,
+    classify,
+    implied_classes,
+    implying_classes,
+)
+from quconot.verifications.probabilistic import verify_circuit_probabilistic
+
+
+def test_classify_shares_reverse_kronecker_product(monkeypatch):
+    calls = []
+    reverse_kronecker_product = functions_testing.reverse_kronecker_product
+
+    def counting_reverse_kronecker_product(*args):
+        calls.append(args)
+        return reverse_kronecker_product(*args)
+
+    monkeypatch.setattr(
+        functions_testing,
+        "reverse_kronecker_product",
+        counting_reverse_kronecker_product,
+    )
+
+    ref_unitary = np.roll(np.eye(4), 1, axis=0)
+    report = classify(np.kron(np.eye(2), ref_unitary), ref_unitary)
+
+    assert tuple(report) == CLASS_NAMES
+    assert all(res for res, _ in report.values())
+    assert len(calls) == 1, "Reverse Kronecker product should be computed once"
+
+
+@pytest.mark.parametrize("class_name", CLASS_NAMES)
+def test_prescreen_rejects_before_matrix_products(monkeypatch, class_name):
+    def failing(*args):
+        raise AssertionError("The prescreen should reject first")
+
+    monkeypatch.setattr(functions_testing, "reverse_kronecker_product", failing)
+    monkeypatch.setattr(functions_testing, "_residual_states", failing)
+
+    ref_unitary = np.roll(np.eye(4), 1, axis=0)
+    tested_matrix = np.eye(8, dtype=complex)
+    res, msg = classification.classify(tested_matrix, ref_unitary)[class_name]
+    assert not res and msg
+
+    res, _, bound = verify_circuit_probabilistic(tested_matrix, ref_unitary, class_name)
+    assert not res and bound == 0.0
+
+
+# implications between the classes, written out independently of CLASS_IMPLICATIONS
+_DEPENDENCIES = {
+    "SDNW": {"SCNW", "RDNW", "SDWS"},
+    "RDNW": {"RCNW", "RDWS"},
+    "SDWS": {"SCWS", "RDWS"},
+    "SDWE": {"SCWE"},
+    "SCNW": {"RCNW", "SCWS"},
+    "SCWS": {"RCWS"},
+    "RCNW": {"RCWS"},
+    "RDWS": {"SDWE"},
+    "RCWS": {"SCWE"},
+    "SCWE": set(),
+}
+
+
+@pytest.mark.parametrize("class_name", CLASS_NAMES)
+def test_implied_classes_follow_dependencies(class_name):
+    expected = set()
+    stack = list(_DEPENDENCIES[class_name])
+    while stack:
+        name = stack.pop()
+        expected.add(name)
+        stack.extend(_DEPENDENCIES[name])
+
+    assert implied_classes(class_name) == expected
+
+
+def test_implied_classes():
+    assert implied_classes("SDNW") == set(CLASS_NAMES) - {"SDNW"}
+    assert implied_classes("SCWE") == set()
+    assert implying_classes("SCWE") == set(CLASS_NAMES) - {"SCWE"}
+    assert implying_classes("SDNW") == set()
+    for class_name in CLASS_NAMES:
+        assert class_name not in implied_classes(
+            class_name
+        ), "Lattice should be acyclic"
+
+
+def test_classify_pruned_skips_implied(monkeypatch):
+    checked = []
+    for class_name, check in functions_testing._CHECKS.items():
+
+        def counting_check(data, class_name=class_name, check=check):
+            checked.append(class_name)
+            return check(data)
+
+        monkeypatch.setitem(classification._CHECKS, class_name, counting_check)
+
+    prescreen = functions_testing._prescreen
+
+    def counting_prescreen(class_name, data):
+        checked.append(class_name)
+        return prescreen(class_name, data)
+
+    monkeypatch.setattr(functions_testing, "_prescreen", counting_prescreen)
+
+    ref_unitary = np.roll(np.eye(4), 1, axis=0)
+    tested_matrix = np.kron(np.eye(2), ref_unitary)
+
+    report = classify(tested_matrix, ref_unitary, prune=True)
+    assert all(res for res, _ in report.values())
+    assert len(set(checked)) < len(CLASS_NAMES)
+
+    checked.clear()
+    report = classify(np.eye(8), ref_unitary, prune=True)
+    assert not any(res for res, _ in report.values())
+    # the O(m^2) clean non-wasting checks run before the O(g * m) weakest class
+    assert checked == ["SCNW", "RCNW", "SCWE"], "Failing SCWE decides all the others"
+
+
+def test_single_precision_confirms_borderline(monkeypatch):
+    confirmations = []
+    intermediates = functions_testing._Intermediates
+
+    def counting_intermediates(
+        tested_matrix,
+        ref_unitary,
+        precision="double",
+        workspace=None,
+        stats=None,
+        deadline=None,
+        rng=None,
+    ):
+        if precision == "double":
+            confirmations.append(precision)
+        return intermediates(
+            tested_matrix, ref_unitary, precision, workspace, stats, deadline, rng
+        )
+
+    monkeypatch.setattr(functions_testing, "_Intermediates", counting_intermediates)
+
+    ref_unitary = np.roll(np.eye(4), 1, axis=0)
+    for deviation, expected, confirmed in [
+        (1e-7, True, False),
+        (3e-4, False, True),
+        (1e-1, False, False),
+    ]:
+        confirmations.clear()
+        tested_matrix = np.kron(np.eye(2), ref_unitary).astype(complex)
+        tested_matrix[:, 1] *= np.exp(1j * deviation)
+
+        res, _ = functions_testing.verify_circuit_strict_dirty_non_wasting(
+            tested_matrix, ref_unitary, precision="single"
+        )
+        assert res == expected
+        assert bool(confirmations) == confirmed
+
+
+@pytest.mark.parametrize("precision", ["double", "single"])
+@pytest.mark.parametrize(
+    "verify",
+    [
+        functions_testing.verify_circuit_strict_clean_wasting_entangled,
+        functions_testing.verify_circuit_strict_dirty_wasting_entangled,
+        functions_testing.verify_circuit_strict_clean_wasting_separable,
+    ],
+)
+def test_short_column_rejected(verify, precision):
+    ref_unitary = np.roll(np.eye(4), 1, axis=0)
+    tested_matrix = np.kron(np.eye(2), ref_unitary).astype(complex)
+    tested_matrix[:, 1] *= 0.995
+
+    res, _ = verify(tested_matrix, ref_unitary, precision=precision)
+    assert not res, "A column of norm 0.995 is not a unit vector"
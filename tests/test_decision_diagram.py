@@ -0,0 +1,82 @@
+import numpy as np
+import pytest
+from qiskit import QuantumCircuit
+from qiskit.circuit.library import MCXGate
+from qiskit.quantum_info import Operator
+
+from quconot.implementations import MCTNoAuxiliaryRelative, MCTQclibLdmcu, MCTVChain
+from quconot.verifications.decision_diagram import (
+    DecisionDiagram,
+    verify_circuit_decision_diagram,
+)
+
+
+def _mcx(controls_no: int) -> QuantumCircuit:
+    circuit = QuantumCircuit(controls_no + 1)
+    circuit.mcx(list(range(controls_no)), controls_no)
+    return circuit
+
+
+@pytest.mark.parametrize(
+    "circuit",
+    [
+        MCTVChain(3).generate_circuit(),
+        MCTNoAuxiliaryRelative(3).generate_circuit(),
+        MCTQclibLdmcu(3).generate_circuit(),
+    ],
+)
+def test_from_circuit(circuit):
+    diagram = DecisionDiagram.from_circuit(circuit)
+
+    assert np.allclose(diagram.toarray(), Operator(circuit).data)
+
+
+def test_controlled_gate():
+    circuit = QuantumCircuit(4, global_phase=0.4)
+    circuit.append(MCXGate(2, ctrl_state=1), [3, 0, 2])
+    circuit.h(1)
+    circuit.cp(0.3, 1, 3)
+
+    diagram = DecisionDiagram.from_circuit(circuit)
+
+    assert np.allclose(diagram.toarray(), Operator(circuit).data)
+
+
+def test_from_matrix_and_operations():
+    rng = np.random.default_rng(3)
+    a = Operator(MCTNoAuxiliaryRelative(2).generate_circuit()).data
+    b = np.linalg.qr(rng.normal(size=(8, 8)) + 1j * rng.normal(size=(8, 8)))[0]
+
+    x = DecisionDiagram.from_matrix(a)
+    y = DecisionDiagram.from_matrix(b, like=x)
+
+    assert np.allclose((x @ y).toarray(), a @ b)
+    assert np.allclose(y.adjoint().toarray(), b.conj().T)
+    with pytest.raises(ValueError):
+        x @ DecisionDiagram.from_matrix(b)
+
+
+def test_node_sharing():
+    # the diagram of a multi-controlled X grows linearly with the number of qubits
+    assert DecisionDiagram.from_circuit(_mcx(30)).size <= 3 * 31
+    product = DecisionDiagram.from_circuit(_mcx(10))
+    product = product @ product
+    assert product.size == 11
+
+
+def test_large_implementation():
+    controls_no = 20
+    res, msg = verify_circuit_decision_diagram(
+        MCTVChain(controls_no), _mcx(controls_no), "SCNW"
+    )
+    assert res, msg
+
+    wrong_ref = QuantumCircuit(controls_no + 1)
+    wrong_ref.append(MCXGate(controls_no, ctrl_state=1), list(range(controls_no + 1)))
+    res, _ = verify_circuit_decision_diagram(MCTVChain(controls_no), wrong_ref, "RCWS")
+    assert not res
+
+
+def test_unknown_class():
+    with pytest.raises(ValueError):
+        verify_circuit_decision_diagram(MCTVChain(3), _mcx(3), "XXXX")
@@ -0,0 +1,67 @@
+import numpy as np
+import pytest
+from qiskit.quantum_info import random_unitary
+from scipy import sparse
+
+from quconot.verifications.functions import (
+    _allclose,
+    _apply_ref_dagger,
+    _clean_columns,
+    _clean_subspace,
+    _residual_states,
+)
+
+
+@pytest.mark.parametrize("main_dim, aux_dim", [(2, 2), (4, 2), (3, 4)])
+def test_clean_subspace(main_dim, aux_dim):
+    tested_matrix = np.array(random_unitary(main_dim * aux_dim))
+    ket_0_i = np.eye(main_dim * aux_dim)[:main_dim]
+
+    block = _clean_subspace(tested_matrix, main_dim)
+    columns = _clean_columns(tested_matrix, main_dim)
+
+    assert np.allclose(block, ket_0_i @ tested_matrix @ ket_0_i.T)
+    assert np.allclose(columns, tested_matrix @ ket_0_i.T)
+    assert np.shares_memory(block, tested_matrix), "Block should be a view"
+    assert np.shares_memory(columns, tested_matrix), "Columns should be a view"
+
+
+@pytest.mark.parametrize("main_dim, aux_dim", [(2, 2), (4, 2), (3, 4)])
+def test_residual_states(main_dim, aux_dim):
+    tested_matrix = np.array(random_unitary(main_dim * aux_dim))
+    ref_unitary = np.roll(np.eye(main_dim), 1, axis=0)
+
+    columns = _clean_columns(tested_matrix, main_dim)
+    res = _residual_states(columns, ref_unitary, main_dim, aux_dim)
+    res_sparse = _residual_states(
+        sparse.csr_matrix(columns), sparse.csr_matrix(ref_unitary), main_dim, aux_dim
+    )
+    assert np.allclose(res_sparse.toarray(), res)
+
+    for idx in range(main_dim):
+        ket_b = np.zeros(main_dim)
+        ket_b[idx] = 1
+        b_0 = np.kron(np.eye(aux_dim)[0], ket_b)
+        expected = np.kron(np.eye(aux_dim), ref_unitary @ ket_b) @ tested_matrix @ b_0
+        assert np.allclose(res[:, idx], expected)
+
+
+@pytest.mark.parametrize("main_dim, aux_dim", [(2, 2), (4, 2), (3, 4)])
+def test_apply_ref_dagger(main_dim, aux_dim):
+    tested_matrix = np.array(random_unitary(main_dim * aux_dim))
+    ref_unitary = np.roll(np.eye(main_dim), 1, axis=0)
+    permutation = np.argmax(ref_unitary, axis=0)
+    expected = tested_matrix @ np.kron(np.eye(aux_dim), ref_unitary.conj().T)
+
+    assert np.allclose(_apply_ref_dagger(tested_matrix, permutation), expected)
+    product = _apply_ref_dagger(sparse.csr_matrix(tested_matrix), permutation)
+    assert np.allclose(product.toarray(), expected)
+
+
+def test_allclose_sparse():
+    matrix = sparse.csr_matrix(np.diag([1.0, 1e-10, 0.0]))
+
+    assert _allclose(matrix - sparse.identity(3, format="csr"), 0.0) is False
+    assert _allclose(matrix, sparse.csr_matrix(np.diag([1.0, 0.0, 0.0])))
+    with pytest.raises(ValueError, match="compared only with the scalar 0"):
+        _allclose(matrix, 1.0)
@@ -3,8 +3,11 @@ from typing import Dict, List, Type
 
 import numpy as np
 from qiskit.quantum_info.operators import Operator
+from scipy import sparse
 
 from quconot.implementations.mct_base import MCTBase
+from quconot.verifications.classification import classify
+from quconot.verifications.decision_diagram import verify_circuit_decision_diagram
 from quconot.verifications.functions_testing import (
     verify_circuit_relative_clean_non_wasting,
     verify_circuit_relative_clean_wasting_separable,
@@ -17,6 +20,10 @@ from quconot.verifications.functions_testing import (
     verify_circuit_strict_dirty_wasting_entangled,
     verify_circuit_strict_dirty_wasting_separable,
 )
+from quconot.verifications.monomial import MonomialMatrix
+from quconot.verifications.mpo import verify_circuit_mpo
+from quconot.verifications.probabilistic import verify_circuit_probabilistic
+from quconot.verifications.streaming import verify_circuit_streaming
 from tests.utils import load_matrix
 
 
@@ -125,6 +132,70 @@ class BaseTest(ABC):
             )
             assert res == self._expected_classes["RDWS"], msg
 
+    def test_classify(self):
+        for controls_no in self._controls_no_list:
+            ref_matrix = self._ref_matrix(controls_no)
+            unitary_matrix = self._take_matrix(controls_no)
+            for prune in [False, True]:
+                report = classify(unitary_matrix, ref_matrix, prune=prune)
+                assert {
+                    name: res for name, (res, _) in report.items()
+                } == self._expected_classes
+
+    def test_single_precision(self):
+        for controls_no in self._controls_no_list:
+            ref_matrix = self._ref_matrix(controls_no)
+            unitary_matrix = self._take_matrix(controls_no)
+            report = classify(unitary_matrix, ref_matrix, precision="single")
+            assert {
+                name: res for name, (res, _) in report.items()
+            } == self._expected_classes
+
+    def test_sparse_input(self):
+        verifiers = {
+            "SCNW": verify_circuit_strict_clean_non_wasting,
+            "RCNW": verify_circuit_relative_clean_non_wasting,
+            "SDNW": verify_circuit_strict_dirty_non_wasting,
+            "RDNW": verify_circuit_relative_dirty_non_wasting,
+            "SCWE": verify_circuit_strict_clean_wasting_entangled,
+            "SCWS": verify_circuit_strict_clean_wasting_separable,
+            "RCWS": verify_circuit_relative_clean_wasting_separable,
+            "SDWE": verify_circuit_strict_dirty_wasting_entangled,
+            "SDWS": verify_circuit_strict_dirty_wasting_separable,
+            "RDWS": verify_circuit_relative_dirty_wasting_separable,
+        }
+        for controls_no in self._controls_no_list:
+            ref_matrix = sparse.csr_matrix(self._ref_matrix(controls_no))
+            unitary_matrix = sparse.csr_matrix(self._take_matrix(controls_no))
+            for class_name, verifier in verifiers.items():
+                res, msg = verifier(unitary_matrix, ref_matrix)
+                assert res == self._expected_classes[class_name], f"{class_name}: {msg}"
+
+    def test_monomial_input(self):
+        for controls_no in self._controls_no_list:
+            ref_matrix = MonomialMatrix.from_matrix(self._ref_matrix(controls_no))
+            try:
+                unitary_matrix = MonomialMatrix.from_matrix(
+                    self._take_matrix(controls_no)
+                )
+            except ValueError:
+                continue
+            report = classify(unitary_matrix, ref_matrix)
+            assert {
+                name: res for name, (res, _) in report.items()
+            } == self._expected_classes
+
+    def test_circuit_probabilistic(self):
+        for controls_no in self._controls_no_list:
+            ref_matrix = self._ref_matrix(controls_no)
+            unitary_matrix = self._take_matrix(controls_no)
+            for class_name, expected in self._expected_classes.items():
+                res, msg, bound = verify_circuit_probabilistic(
+                    unitary_matrix, ref_matrix, class_name, seed=controls_no
+                )
+                assert res == expected, f"{class_name}: {msg}"
+                assert 0.0 <= bound <= 2.0**-20
+
     def test_dependencies(self):
         rd = self._expected_classes
 
@@ -177,6 +248,34 @@ class BaseTestMCT(BaseTest):
 
         return self._matrix_dict[controls_no]
 
+    def test_circuit_streaming(self):
+        for controls_no in self._controls_no_list:
+            ref_matrix = self._ref_matrix(controls_no)
+            implementation = self._get_class_name(controls_no)
+            for class_name, expected in self._expected_classes.items():
+                res, msg = verify_circuit_streaming(
+                    implementation, ref_matrix, class_name
+                )
+                assert res == expected, f"{class_name}: {msg}"
+
+    def test_circuit_decision_diagram(self):
+        for controls_no in self._controls_no_list:
+            ref_matrix = self._ref_matrix(controls_no)
+            implementation = self._get_class_name(controls_no)
+            for class_name, expected in self._expected_classes.items():
+                res, msg = verify_circuit_decision_diagram(
+                    implementation, ref_matrix, class_name
+                )
+                assert res == expected, f"{class_name}: {msg}"
+
+    def test_circuit_mpo(self):
+        for controls_no in self._controls_no_list:
+            ref_matrix = self._ref_matrix(controls_no)
+            implementation = self._get_class_name(controls_no)
+            for class_name, expected in self._expected_classes.items():
+                res, msg = verify_circuit_mpo(implementation, ref_matrix, class_name)
+                assert res == expected, f"{class_name}: {msg}"
+
     def _ref_matrix(self, controls_no: int):
         if controls_no in self._ref_matrices:
             return self._ref_matrices[controls_no]
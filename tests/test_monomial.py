@@ -0,0 +1,97 @@
+import numpy as np
+import pytest
+from qiskit import QuantumCircuit
+from scipy import sparse
+
+from quconot.verifications import (
+    MonomialMatrix,
+    classify,
+    mct_reference,
+    verify_circuit_probabilistic,
+    verify_circuit_streaming,
+    verify_circuit_strict_clean_non_wasting,
+)
+
+
+def _toffoli_with_ancilla(phases: np.ndarray) -> MonomialMatrix:
+    # CCX on qubits 0, 1 -> 2 with an untouched ancilla on qubit 3
+    permutation = np.arange(16)
+    permutation[[3, 7, 11, 15]] = [7, 3, 15, 11]
+    return MonomialMatrix(permutation, phases)
+
+
+def _toffoli() -> np.ndarray:
+    matrix = np.eye(8)
+    matrix[[3, 7]] = matrix[[7, 3]]
+    return matrix
+
+
+def test_invalid_permutation():
+    with pytest.raises(ValueError):
+        MonomialMatrix(np.array([0, 0, 1]), np.ones(3))
+    with pytest.raises(ValueError):
+        MonomialMatrix(np.array([0, 1]), np.ones(3))
+
+
+def test_from_matrix_round_trip():
+    matrix = np.diag(np.exp(1j * np.arange(4)))[[2, 0, 3, 1]]
+    monomial = MonomialMatrix.from_matrix(matrix)
+    assert np.allclose(monomial.toarray(), matrix)
+    assert np.allclose(
+        MonomialMatrix.from_matrix(sparse.csr_matrix(matrix)).toarray(), matrix
+    )
+
+
+def test_from_matrix_rejects_dense_column():
+    with pytest.raises(ValueError):
+        MonomialMatrix.from_matrix(np.ones((2, 2)) / np.sqrt(2))
+
+
+def test_matches_matrix_checks():
+    rng = np.random.default_rng(7)
+    ref = _toffoli()
+    for phases in [np.ones(16), np.exp(1j * rng.uniform(0, 2 * np.pi, 16))]:
+        monomial = _toffoli_with_ancilla(phases)
+        assert classify(monomial, ref) == classify(monomial.toarray(), ref)
+        assert classify(monomial, MonomialMatrix.from_matrix(ref)) == classify(
+            monomial.toarray(), ref
+        )
+
+
+def test_monomial_verifiers():
+    monomial = _toffoli_with_ancilla(np.ones(16))
+    assert verify_circuit_strict_clean_non_wasting(monomial, _toffoli())[0]
+    assert verify_circuit_probabilistic(monomial, _toffoli(), "SDNW") == (True, "", 0.0)
+
+    phases = np.ones(16)
+    phases[3] = -1
+    res, msg = verify_circuit_strict_clean_non_wasting(
+        _toffoli_with_ancilla(phases), _toffoli()
+    )
+    assert not res
+    assert msg == "Generated matrix should be all 0"
+
+
+@pytest.mark.parametrize("class_name", ["SCNW", "RCNW", "SDNW", "RCWS", "SDWS"])
+def test_probabilistic_monomial_reference(class_name):
+    tested = _toffoli_with_ancilla(np.ones(16)).toarray()
+    expected = verify_circuit_probabilistic(tested, _toffoli(), class_name, seed=1)
+    for ref in [MonomialMatrix.from_matrix(_toffoli()), sparse.csr_matrix(_toffoli())]:
+        assert verify_circuit_probabilistic(tested, ref, class_name, seed=1) == expected
+
+
+def test_streaming_monomial_reference():
+    circuit = QuantumCircuit(4)
+    circuit.ccx(0, 1, 2)
+    ref = MonomialMatrix.from_matrix(_toffoli())
+    for class_name in ["SCNW", "SDNW", "RDWS"]:
+        assert verify_circuit_streaming(circuit, ref, class_name) == (True, "")
+
+
+def test_mct_reference_matches_stored_matrices():
+    stored = np.load("./tests/ref_matrices/mct_noauxiliary.npz")
+    for controls_no in range(1, len(stored) + 1):
+        reference = mct_reference(controls_no)
+        assert np.allclose(reference.toarray(), stored["arr_" + str(controls_no - 1)])
+    with pytest.raises(ValueError):
+        mct_reference(0)
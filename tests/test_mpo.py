@@ -0,0 +1,92 @@
+import numpy as np
+import pytest
+from qiskit import QuantumCircuit
+from qiskit.circuit.library import MCXGate
+from qiskit.quantum_info import Operator
+
+from quconot.implementations import MCTNoAuxiliaryRelative, MCTQclibLdmcu, MCTVChain
+from quconot.verifications.mpo import MatrixProductOperator, verify_circuit_mpo
+
+
+def _mcx(controls_no: int) -> QuantumCircuit:
+    circuit = QuantumCircuit(controls_no + 1)
+    circuit.mcx(list(range(controls_no)), controls_no)
+    return circuit
+
+
+@pytest.mark.parametrize(
+    "circuit",
+    [
+        MCTVChain(3).generate_circuit(),
+        MCTNoAuxiliaryRelative(3).generate_circuit(),
+        MCTQclibLdmcu(3).generate_circuit(),
+    ],
+)
+def test_from_circuit(circuit):
+    mpo = MatrixProductOperator.from_circuit(circuit)
+
+    assert np.allclose(mpo.toarray(), Operator(circuit).data)
+
+
+def test_controlled_gate():
+    circuit = QuantumCircuit(4, global_phase=0.4)
+    circuit.append(MCXGate(2, ctrl_state=1), [3, 0, 2])
+    circuit.h(1)
+    circuit.cp(0.3, 1, 3)
+
+    mpo = MatrixProductOperator.from_circuit(circuit)
+
+    assert np.allclose(mpo.toarray(), Operator(circuit).data)
+
+
+def test_from_matrix_and_operations():
+    rng = np.random.default_rng(3)
+    a = Operator(MCTNoAuxiliaryRelative(2).generate_circuit()).data
+    b = np.linalg.qr(rng.normal(size=(8, 8)) + 1j * rng.normal(size=(8, 8)))[0]
+
+    x = MatrixProductOperator.from_matrix(a)
+    y = MatrixProductOperator.from_matrix(b)
+
+    assert np.allclose((x @ y).toarray(), a @ b)
+    assert np.allclose((x - y).toarray(), a - b)
+    assert np.allclose(y.adjoint().toarray(), b.conj().T)
+    assert np.isclose(y.trace(), np.trace(b))
+    assert np.isclose(y.norm(), np.sqrt(8))
+
+
+def test_split():
+    rng = np.random.default_rng(5)
+    a = np.linalg.qr(rng.normal(size=(4, 4)) + 1j * rng.normal(size=(4, 4)))[0]
+    b = np.linalg.qr(rng.normal(size=(2, 2)) + 1j * rng.normal(size=(2, 2)))[0]
+
+    main, aux = MatrixProductOperator.from_matrix(np.kron(b, a)).split(2, 1e-8)
+
+    assert np.allclose(np.kron(aux.toarray(), main.toarray()), np.kron(b, a))
+    entangled = Operator(MCTVChain(3).generate_circuit()).data
+    assert MatrixProductOperator.from_matrix(entangled).split(4, 1e-8) is None
+
+
+def test_bounded_bond_dimension():
+    circuit = MCTVChain(20).generate_circuit()
+
+    mpo = MatrixProductOperator.from_circuit(circuit, clean_qubits=18)
+
+    assert max(mpo.bond_dimensions) <= 8
+    with pytest.raises(ValueError):
+        MatrixProductOperator.from_circuit(MCTVChain(8), max_bond=2)
+
+
+def test_large_implementation():
+    controls_no = 20
+    res, msg = verify_circuit_mpo(MCTVChain(controls_no), _mcx(controls_no), "SCNW")
+    assert res, msg
+
+    wrong_ref = QuantumCircuit(controls_no + 1)
+    wrong_ref.append(MCXGate(controls_no, ctrl_state=1), list(range(controls_no + 1)))
+    res, _ = verify_circuit_mpo(MCTVChain(controls_no), wrong_ref, "RCWS")
+    assert not res
+
+
+def test_unknown_class():
+    with pytest.raises(ValueError):
+        verify_circuit_mpo(MCTVChain(3), _mcx(3), "XXXX")
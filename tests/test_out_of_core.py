@@ -0,0 +1,90 @@
+import json
+
+import numpy as np
+import pytest
+from qiskit.quantum_info import Operator
+
+from quconot.implementations import MCTBarenco74Dirty, MCTVChain
+from quconot.verifications import (
+    CLASS_NAMES,
+    classify,
+    mct_reference,
+    out_of_core,
+    verify_circuit_streaming,
+)
+from quconot.verifications.out_of_core import (
+    build_unitary_memmap,
+    verify_circuit_out_of_core,
+)
+from quconot.verifications.streaming import verify_matrix_streaming
+
+
+@pytest.mark.parametrize("block_size", [1, 5, 32])
+def test_build_unitary_memmap(tmp_path, block_size):
+    circuit = MCTVChain(3).generate_circuit()
+
+    unitary = build_unitary_memmap(circuit, tmp_path / "u.bin", block_size)
+
+    assert np.allclose(unitary, Operator(circuit).data)
+    assert not unitary.flags.writeable
+
+
+def test_resume_after_interruption(tmp_path, monkeypatch):
+    circuit = MCTBarenco74Dirty(5).generate_circuit()
+    path = tmp_path / "u.bin"
+    simulated = []
+
+    def failing(gates, global_phase, states, num_qubits):
+        if len(simulated) == 3:
+            raise KeyboardInterrupt
+        simulated.append(states.shape[1])
+        return apply_gates(gates, global_phase, states, num_qubits)
+
+    apply_gates = out_of_core._apply_gates
+    monkeypatch.setattr(out_of_core, "_apply_gates", failing)
+    with pytest.raises(KeyboardInterrupt):
+        build_unitary_memmap(circuit, path, block_size=4)
+    with open(f"{path}.checkpoint", encoding="utf-8") as file:
+        assert json.load(file)["columns"] == 12
+
+    simulated.clear()
+    monkeypatch.setattr(
+        out_of_core,
+        "_apply_gates",
+        lambda *args: simulated.append(args[2].shape[1]) or apply_gates(*args),
+    )
+    unitary = build_unitary_memmap(circuit, path, block_size=4)
+
+    assert sum(simulated) == 2**circuit.num_qubits - 12
+    assert np.allclose(unitary, Operator(circuit).data)
+
+
+def test_rebuild_for_other_circuit(tmp_path):
+    path = tmp_path / "u.bin"
+    build_unitary_memmap(MCTVChain(3), path)
+
+    unitary = build_unitary_memmap(MCTBarenco74Dirty(5), path)
+
+    expected = Operator(MCTBarenco74Dirty(5).generate_circuit()).data
+    assert np.allclose(unitary, expected)
+
+
+@pytest.mark.parametrize(
+    "controls_no, implementation", [(3, MCTVChain), (5, MCTBarenco74Dirty)]
+)
+def test_verify_out_of_core(tmp_path, controls_no, implementation):
+    implementation = implementation(controls_no)
+    ref = mct_reference(controls_no)
+    expected = classify(Operator(implementation.generate_circuit()).data, ref)
+
+    for class_name in CLASS_NAMES:
+        res, msg = verify_circuit_out_of_core(
+            implementation, ref, class_name, tmp_path / "u.bin", block_size=48
+        )
+        assert (res, msg) == verify_circuit_streaming(implementation, ref, class_name)
+        assert res == expected[class_name][0], f"{class_name}: {msg}"
+
+
+def test_unknown_class():
+    with pytest.raises(ValueError):
+        verify_matrix_streaming(np.eye(16), mct_reference(3), "XXXX")
@@ -0,0 +1,132 @@
+import numpy as np
+import pytest
+from qiskit import QuantumCircuit
+from qiskit.quantum_info import Operator
+
+from quconot.implementations import (
+    MCTCleanWastingEntangling,
+    MCTNoAuxiliary,
+    MCTNoAuxiliaryRelative,
+    MCTVChain,
+    MCTVChainDirty,
+)
+from quconot.verifications import classify
+from quconot.verifications.phase_polynomial import (
+    PhasePolynomial,
+    verify_circuit_phase_polynomial,
+)
+
+
+def _relative_toffoli() -> QuantumCircuit:
+    circuit = QuantumCircuit(3)
+    circuit.h(2)
+    circuit.t(2)
+    circuit.cx(1, 2)
+    circuit.tdg(2)
+    circuit.cx(0, 2)
+    circuit.t(2)
+    circuit.cx(1, 2)
+    circuit.tdg(2)
+    circuit.h(2)
+    return circuit
+
+
+def _mixed_circuit() -> QuantumCircuit:
+    circuit = QuantumCircuit(4, global_phase=0.2)
+    circuit.rz(0.3, 1)
+    circuit.cz(0, 1)
+    circuit.cp(0.7, 1, 2)
+    circuit.swap(0, 3)
+    circuit.x(2)
+    circuit.ccx(0, 1, 2)
+    circuit.rccx(1, 2, 3)
+    circuit.y(0)
+    circuit.u(np.pi / 2, 0, 0.4, 2)
+    circuit.h(2)
+    return circuit
+
+
+@pytest.mark.parametrize(
+    "circuit",
+    [
+        _relative_toffoli(),
+        _mixed_circuit(),
+        MCTNoAuxiliaryRelative(3).generate_circuit(),
+        MCTCleanWastingEntangling(4).generate_circuit(),
+        MCTVChain(3).generate_circuit(),
+    ],
+)
+def test_to_monomial(circuit):
+    monomial = PhasePolynomial.from_circuit(circuit).to_monomial()
+
+    assert np.allclose(monomial.toarray(), Operator(circuit).data)
+
+
+def test_linear_circuit_has_no_paths():
+    circuit = QuantumCircuit(3)
+    circuit.cx(0, 1)
+    circuit.t(1)
+    circuit.cx(1, 2)
+    circuit.x(0)
+    circuit.s(2)
+
+    polynomial = PhasePolynomial.from_circuit(circuit)
+
+    assert polynomial.num_paths == 0
+    assert polynomial.outputs == [
+        frozenset({0, 1}),
+        frozenset({1, 2}),
+        frozenset({1, 2, 4}),
+    ]
+    assert np.allclose(polynomial.to_monomial().toarray(), Operator(circuit).data)
+
+
+def test_hadamard_paths_are_eliminated():
+    circuit = _relative_toffoli()
+    circuit.h(0)
+    circuit.h(0)
+
+    polynomial = PhasePolynomial.from_circuit(MCTVChain(7))
+
+    assert PhasePolynomial.from_circuit(circuit).num_paths == 0
+    assert polynomial.num_paths == 0
+    assert polynomial.scale == 0
+
+
+def test_classify_relative_implementation():
+    implementation = MCTNoAuxiliaryRelative(3)
+    unitary_matrix = Operator(implementation.generate_circuit()).data
+    ref_matrix = Operator(MCTNoAuxiliary(3).generate_circuit()).data
+
+    monomial = PhasePolynomial.from_circuit(implementation).to_monomial()
+
+    assert classify(monomial, ref_matrix) == classify(unitary_matrix, ref_matrix)
+
+
+def test_not_monomial():
+    circuit = QuantumCircuit(1)
+    circuit.h(0)
+
+    with pytest.raises(ValueError, match="single nonzero entry"):
+        PhasePolynomial.from_circuit(circuit).to_monomial()
+
+
+def test_unsupported_operation():
+    circuit = QuantumCircuit(1, 1)
+    circuit.measure(0, 0)
+
+    with pytest.raises(ValueError, match="cannot be simulated"):
+        PhasePolynomial.from_circuit(circuit)
+
+
+@pytest.mark.parametrize("implementation", [MCTVChain(4), MCTVChainDirty(4)])
+def test_verify_circuit_phase_polynomial(implementation):
+    unitary_matrix = Operator(implementation.generate_circuit()).data
+    ref_matrix = Operator(MCTNoAuxiliary(4).generate_circuit()).data
+
+    for class_name, (expected, _) in classify(unitary_matrix, ref_matrix).items():
+        res, _ = verify_circuit_phase_polynomial(implementation, ref_matrix, class_name)
+        assert res == expected
+
+    with pytest.raises(ValueError, match="Unknown class"):
+        verify_circuit_phase_polynomial(implementation, ref_matrix, "XXXX")
@@ -0,0 +1,83 @@
+import pytest
+from qiskit import QuantumCircuit
+from qiskit.quantum_info import Operator
+
+from quconot.implementations import MCTBarenco74Dirty, MCTQclibLdmcu, MCTVChain
+from quconot.verifications import (
+    CLASS_NAMES,
+    classify,
+    mct_reference,
+    plan_verification,
+    planner,
+    verify_circuit_planned,
+)
+from quconot.verifications.planner import BACKENDS, BackendEstimate, estimate_backends
+
+
+def test_monomial_circuit():
+    estimates = estimate_backends(MCTVChain(3), mct_reference(3), "SDNW")
+
+    assert [estimate.backend for estimate in estimates] == list(BACKENDS)
+    assert all(estimate.supported for estimate in estimates)
+    assert plan_verification(MCTVChain(3), mct_reference(3), "SDNW").backend == (
+        "monomial"
+    )
+
+
+def test_large_controlled_x_is_monomial():
+    circuit = QuantumCircuit(7)
+    circuit.mcx([0, 1, 2, 3, 4], 5)
+    circuit.cx(5, 6)
+    estimates = estimate_backends(circuit, mct_reference(5), "RCWS")
+
+    assert estimates[0].backend == "monomial" and estimates[0].supported
+    assert plan_verification(circuit, mct_reference(5), "RCWS").backend == "monomial"
+
+
+def test_memory_budget():
+    implementation, ref = MCTQclibLdmcu(6), mct_reference(6)
+    estimates = {
+        estimate.backend: estimate
+        for estimate in estimate_backends(implementation, ref, "RDWS")
+    }
+    assert not estimates["monomial"].supported
+
+    budget = estimates["dense"].peak_bytes - 1
+    plan = plan_verification(implementation, ref, "RDWS", budget)
+    assert plan.backend != "dense"
+    assert plan.peak_bytes <= budget
+
+    with pytest.raises(ValueError):
+        plan_verification(implementation, ref, "RDWS", 1024)
+
+
+def test_large_circuit_is_not_built_densely():
+    controls_no = 15
+    plan = plan_verification(
+        MCTQclibLdmcu(controls_no), mct_reference(controls_no), "SDNW", 2**30
+    )
+
+    assert plan.backend in ("streaming", "sparse")
+    assert plan.peak_bytes <= 2**30
+
+
+@pytest.mark.parametrize("backend", BACKENDS)
+@pytest.mark.parametrize(
+    "controls_no, implementation", [(3, MCTVChain), (5, MCTBarenco74Dirty)]
+)
+def test_verify_circuit_planned(monkeypatch, backend, controls_no, implementation):
+    monkeypatch.setattr(
+        planner, "plan_verification", lambda *args: BackendEstimate(backend, 0, 0.0)
+    )
+    implementation = implementation(controls_no)
+    ref = mct_reference(controls_no)
+    expected = classify(Operator(implementation.generate_circuit()).data, ref)
+
+    for class_name in CLASS_NAMES:
+        res, msg = verify_circuit_planned(implementation, ref, class_name)
+        assert res == expected[class_name][0], f"{class_name}: {msg}"
+
+
+def test_unknown_class():
+    with pytest.raises(ValueError):
+        plan_verification(MCTVChain(3), mct_reference(3), "XXXX")
@@ -0,0 +1,44 @@
+import numpy as np
+import pytest
+from scipy import sparse
+
+from quconot.verifications.probabilistic import verify_circuit_probabilistic
+
+
+@pytest.mark.parametrize("class_name", ["SCNW", "RCNW", "SDNW", "RCWS"])
+def test_probabilistic_rejects_perturbation(class_name):
+    ref_unitary = np.roll(np.eye(4), 1, axis=0)
+    tested_matrix = np.kron(np.eye(2), ref_unitary).astype(complex)
+
+    res, _, bound = verify_circuit_probabilistic(tested_matrix, ref_unitary, class_name)
+    assert res and bound == 2.0**-30
+
+    tested_matrix[1, 2] += 1e-4
+    res, _, _ = verify_circuit_probabilistic(tested_matrix, ref_unitary, class_name)
+    assert not res
+
+
+def test_probabilistic_errors():
+    ref_unitary = np.eye(2)
+    with pytest.raises(ValueError, match="Unknown class"):
+        verify_circuit_probabilistic(np.eye(4), ref_unitary, "XXXX")
+    with pytest.raises(ValueError, match="Number of probes"):
+        verify_circuit_probabilistic(np.eye(4), ref_unitary, "SCNW", probes=0)
+
+
+@pytest.mark.parametrize("class_name", ["SCNW", "RCNW", "SDNW", "RCWS", "SDWS"])
+def test_probabilistic_sparse(class_name):
+    ref_unitary = np.roll(np.eye(4), 1, axis=0)
+    tested_matrix = np.kron(np.eye(2), ref_unitary).astype(complex)
+
+    for ref in [ref_unitary, sparse.csr_matrix(ref_unitary)]:
+        res, _, _ = verify_circuit_probabilistic(
+            sparse.csr_matrix(tested_matrix), ref, class_name
+        )
+        assert res
+
+    tested_matrix[1, 2] += 1e-4
+    res, _, _ = verify_circuit_probabilistic(
+        sparse.csc_matrix(tested_matrix), ref_unitary, class_name
+    )
+    assert not res
@@ -1,8 +1,13 @@
 import numpy as np
 import pytest
+from scipy import sparse
+from scipy.sparse.linalg import aslinearoperator
 
 from quconot.verifications.functions import ABS_TOLERANCE, REL_TOLERANCE
-from quconot.verifications.reverse_kronecker_product import reverse_kronecker_product
+from quconot.verifications.reverse_kronecker_product import (
+    leading_singular_triplet,
+    reverse_kronecker_product,
+)
 
 
 @pytest.mark.parametrize(
@@ -36,3 +41,54 @@ def test_reverse_kronecker_product(par_B, par_C):
     assert np.allclose(
         zero_matrix, 0.0, ABS_TOLERANCE, REL_TOLERANCE
     ), "Result should close to 0"
+
+
+@pytest.mark.parametrize(
+    "par_B",
+    [np.array([[1, 0], [0, -1]]), np.eye(3), np.eye(1), np.array([[0, 1], [1, 0]])],
+)
+@pytest.mark.parametrize(
+    "par_C", [np.array([[1, 0], [0, -1]]), np.array([[0, 1], [1, 0]]), np.eye(1)]
+)
+def test_reverse_kronecker_product_sparse(par_B, par_C):
+    A = np.kron(par_B, par_C)
+
+    res_B, res_C = reverse_kronecker_product(sparse.csr_matrix(A), par_B.shape)
+
+    assert np.allclose(
+        A - np.kron(res_B, res_C), 0.0, ABS_TOLERANCE, REL_TOLERANCE
+    ), "Result should close to 0"
+
+
+def test_reverse_kronecker_product_rectangular():
+    par_B = np.arange(1, 7).reshape(2, 3)
+    par_C = np.array([[1, 2], [3, 4], [5, 6]])
+    A = np.kron(par_B, par_C)
+
+    res_B, res_C = reverse_kronecker_product(A, par_B.shape)
+
+    # factors are determined up to a scalar
+    ratio = par_B[0, 0] / res_B[0, 0]
+    assert np.allclose(res_B * ratio, par_B)
+    res_A = np.kron(res_B, res_C)
+    assert np.allclose(A, res_A * A[0, 0] / res_A[0, 0])
+
+
+@pytest.mark.parametrize("shape", [(1, 5), (5, 1), (20, 30)])
+def test_leading_singular_triplet(shape):
+    rng = np.random.default_rng(0)
+    R = rng.normal(size=shape) + 1j * rng.normal(size=shape)
+    W, s, V = np.linalg.svd(R)
+
+    for operator in [R, sparse.csr_matrix(R), aslinearoperator(R)]:
+        u, s_max, vh = leading_singular_triplet(operator)
+        assert np.isclose(s_max, s[0])
+        assert np.allclose(s_max * np.outer(u, vh), s[0] * np.outer(W[:, 0], V[0]))
+
+
+def test_leading_singular_triplet_seeded():
+    R = np.random.default_rng(1).normal(size=(40, 30))
+    runs = [leading_singular_triplet(R, np.random.default_rng(seed)) for seed in (7, 7)]
+
+    for first, second in zip(*runs):
+        assert np.array_equal(first, second), "Same seed should give the same triplet"
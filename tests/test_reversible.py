@@ -0,0 +1,111 @@
+import numpy as np
+import pytest
+from qiskit import QuantumCircuit
+from qiskit.circuit.library import MCXGate
+from qiskit.quantum_info import Operator
+
+from quconot.implementations import (
+    MCTCleanWastingEntangling,
+    MCTDirtyWastingEntangling,
+    MCTParallelDecomposition,
+    MCTVChain,
+)
+from quconot.verifications import mct_reference, verify_circuit_strict_dirty_non_wasting
+from quconot.verifications.reversible import simulate_permutation, verify_mct_bitstrings
+
+
+def _mixed_circuit() -> QuantumCircuit:
+    circuit = QuantumCircuit(5, global_phase=0.3)
+    circuit.append(MCXGate(3, ctrl_state=5), [0, 2, 4, 1])
+    circuit.x(0)
+    circuit.cx(1, 3)
+    circuit.swap(0, 2)
+    circuit.rccx(0, 1, 4)
+    circuit.mcx([0, 1, 2, 3], 4)
+    return circuit
+
+
+@pytest.mark.parametrize(
+    "circuit",
+    [
+        MCTVChain(3).generate_circuit(),
+        MCTVChain(4).generate_circuit(),
+        MCTParallelDecomposition(5).generate_circuit(),
+        _mixed_circuit(),
+    ],
+)
+def test_simulate_permutation(circuit):
+    monomial = simulate_permutation(circuit)
+
+    assert np.allclose(monomial.toarray(), Operator(circuit).data)
+
+
+def test_simulate_permutation_implementation():
+    monomial = simulate_permutation(MCTVChain(3))
+    unitary_matrix = Operator(MCTVChain(3).generate_circuit()).data
+
+    assert np.array_equal(
+        monomial.permutation, np.argmax(np.abs(unitary_matrix), axis=0)
+    )
+
+
+def test_simulate_permutation_not_reversible():
+    circuit = QuantumCircuit(2)
+    circuit.h(0)
+
+    with pytest.raises(ValueError, match="not a permutation"):
+        simulate_permutation(circuit)
+
+
+def _toffoli_dirty_mct(controls_no: int) -> QuantumCircuit:
+    """Returns the MCT of Barenco et al., Lemma 7.2, with Toffoli gates only."""
+    controls = list(range(controls_no))
+    target = controls_no
+    auxiliary = list(range(controls_no + 1, 2 * controls_no - 1))
+    circuit = QuantumCircuit(2 * controls_no - 1)
+
+    def ladder() -> None:
+        for i in reversed(range(1, controls_no - 2)):
+            circuit.ccx(controls[i + 1], auxiliary[i - 1], auxiliary[i])
+        circuit.ccx(controls[0], controls[1], auxiliary[0])
+        for i in range(1, controls_no - 2):
+            circuit.ccx(controls[i + 1], auxiliary[i - 1], auxiliary[i])
+
+    for _ in range(2):
+        circuit.ccx(controls[-1], auxiliary[-1], target)
+        ladder()
+    return circuit
+
+
+@pytest.mark.parametrize(
+    "circuit, controls_no, class_name, expected",
+    [
+        (_toffoli_dirty_mct(4), 4, "SDNW", True),
+        (_toffoli_dirty_mct(1000), 1000, "SDNW", True),
+        (MCTVChain(1000), 1000, "SCNW", True),
+        (MCTVChain(1000), 1000, "SDNW", False),
+        (MCTCleanWastingEntangling(1000), 1000, "SCWE", True),
+        (MCTCleanWastingEntangling(1000), 1000, "SCNW", False),
+        (MCTDirtyWastingEntangling(1000), 1000, "SDWE", True),
+    ],
+)
+def test_verify_mct_bitstrings(circuit, controls_no, class_name, expected):
+    res, msg = verify_mct_bitstrings(circuit, controls_no, class_name, seed=5)
+
+    assert res == expected, msg
+    assert (msg == "") == res
+
+
+def test_verify_mct_bitstrings_agrees_with_permutation():
+    res, msg = verify_circuit_strict_dirty_non_wasting(
+        simulate_permutation(_toffoli_dirty_mct(4)), mct_reference(4)
+    )
+    assert res, msg
+
+
+def test_verify_mct_bitstrings_broken():
+    circuit = _toffoli_dirty_mct(1000)
+    circuit.data.pop(len(circuit.data) // 2)
+
+    res, msg = verify_mct_bitstrings(circuit, 1000, "SDWE", seed=5)
+    assert not res and "main qubits" in msg
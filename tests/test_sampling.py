@@ -0,0 +1,69 @@
+import numpy as np
+import pytest
+from qiskit import QuantumCircuit
+from qiskit.quantum_info import Operator
+
+from quconot.implementations import (
+    MCTBarenco74Dirty,
+    MCTDirtyWastingEntangling,
+    MCTParallelDecomposition,
+    MCTVChain,
+    MCTVChainDirty,
+)
+from quconot.verifications import (
+    CLASS_NAMES,
+    classify,
+    mct_reference,
+    verify_circuit_sampled,
+)
+
+
+@pytest.mark.parametrize(
+    "implementation",
+    [
+        MCTBarenco74Dirty,
+        MCTDirtyWastingEntangling,
+        MCTParallelDecomposition,
+        MCTVChain,
+    ],
+)
+def test_sampled_agrees_with_classify(implementation):
+    implementation = implementation(5)
+    ref = mct_reference(5)
+    expected = classify(Operator(implementation.generate_circuit()).data, ref)
+
+    for class_name in CLASS_NAMES:
+        res, msg, confidence = verify_circuit_sampled(
+            implementation, ref, class_name, seed=3
+        )
+        assert res == expected[class_name][0], class_name
+        assert (msg == "") == res
+        assert 0.0 < confidence <= 1.0
+
+
+@pytest.mark.parametrize("implementation", [MCTBarenco74Dirty, MCTVChainDirty])
+def test_sampled_many_controls(implementation):
+    implementation = implementation(20)
+    ref = mct_reference(20)
+
+    res, msg, confidence = verify_circuit_sampled(
+        implementation, ref, "SDNW", samples=32, seed=0
+    )
+    assert res, msg
+    assert np.isclose(confidence, 1.0 - 0.99**16, atol=0.1)
+
+    circuit = implementation.generate_circuit()
+    broken = QuantumCircuit(circuit.num_qubits)
+    broken.compose(circuit, inplace=True)
+    broken.data.pop()
+    res, _, confidence = verify_circuit_sampled(broken, ref, "RDWS", seed=0)
+    assert not res and confidence == 1.0
+
+
+def test_sampled_errors():
+    ref_unitary = np.eye(2)
+    circuit = QuantumCircuit(2)
+    with pytest.raises(ValueError, match="Unknown class"):
+        verify_circuit_sampled(circuit, ref_unitary, "XXXX")
+    with pytest.raises(ValueError, match="Number of samples"):
+        verify_circuit_sampled(circuit, ref_unitary, "SCNW", samples=0)
@@ -0,0 +1,58 @@
+import numpy as np
+import pytest
+from qiskit import QuantumCircuit
+from qiskit.quantum_info import Operator
+
+from quconot.implementations import MCTBarenco74Dirty, MCTNoAuxiliaryRelative, MCTVChain
+from quconot.verifications.simulation import simulate_columns, simulate_sparse
+
+
+@pytest.mark.parametrize(
+    "circuit",
+    [
+        MCTVChain(3).generate_circuit(),
+        MCTBarenco74Dirty(5).generate_circuit(),
+        MCTNoAuxiliaryRelative(3).generate_circuit(),
+    ],
+)
+@pytest.mark.parametrize("block_size", [1, 5])
+def test_simulate_columns(circuit, block_size):
+    unitary_matrix = Operator(circuit).data
+    indices = [0, 3, 2, 2**circuit.num_qubits - 1, 7, 1]
+
+    columns = list(simulate_columns(circuit, indices, block_size=block_size))
+
+    assert [index for index, _ in columns] == indices
+    for index, column in columns:
+        assert np.allclose(column, unitary_matrix[:, index])
+
+
+@pytest.mark.parametrize("block_size", [1, 5, 256])
+def test_simulate_sparse(block_size):
+    circuit = MCTNoAuxiliaryRelative(3).generate_circuit()
+    circuit.h(0)
+
+    unitary = simulate_sparse(circuit, block_size=block_size)
+
+    assert np.allclose(unitary.toarray(), Operator(circuit).data)
+    assert unitary.nnz == 2 * 2**circuit.num_qubits
+
+
+def test_simulate_columns_global_phase():
+    circuit = QuantumCircuit(2, global_phase=0.3)
+    circuit.h(0)
+    circuit.cx(0, 1)
+
+    columns = dict(simulate_columns(circuit, range(4)))
+
+    assert np.allclose(
+        np.column_stack([columns[i] for i in range(4)]), Operator(circuit).data
+    )
+
+
+def test_simulate_columns_measurement():
+    circuit = QuantumCircuit(1, 1)
+    circuit.measure(0, 0)
+
+    with pytest.raises(ValueError, match="cannot be simulated"):
+        list(simulate_columns(circuit, [0]))
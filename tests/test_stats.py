@@ -0,0 +1,68 @@
+import numpy as np
+from qiskit.quantum_info import Operator
+
+from quconot.implementations import MCTBarenco74Dirty
+from quconot.verifications import (
+    CLASS_NAMES,
+    VerificationStats,
+    classify,
+    mct_reference,
+    verify_circuit_relative_dirty_wasting_separable,
+    verify_circuit_strict_dirty_non_wasting,
+)
+
+
+def _tested_matrix():
+    return Operator(MCTBarenco74Dirty(5).generate_circuit()).data
+
+
+def test_stages_of_a_verifier():
+    tested_matrix = _tested_matrix()
+    stats = VerificationStats(track_memory=True)
+
+    verify_circuit_relative_dirty_wasting_separable(
+        tested_matrix, mct_reference(5), stats=stats
+    )
+    verify_circuit_relative_dirty_wasting_separable(
+        tested_matrix, mct_reference(5), stats=stats
+    )
+
+    report = stats.report()
+    assert list(report) == [("RDWS", 128)]
+    stages = report[("RDWS", 128)]
+    assert set(stages) == {"total", "prescreen", "rkp", "reference", "tolerance"}
+    assert stages["total"]["calls"] == 2
+    assert stages["rkp"]["flops"] > 0
+    assert stages["total"]["peak_bytes"] >= stages["rkp"]["peak_bytes"] > 0
+    assert stages["total"]["seconds"] >= stages["rkp"]["seconds"]
+
+
+def test_peak_of_the_large_stage():
+    tested_matrix = np.kron(np.eye(2), mct_reference(7).toarray()).astype(complex)
+    stats = VerificationStats(track_memory=True)
+
+    res, msg = verify_circuit_strict_dirty_non_wasting(
+        tested_matrix, mct_reference(7), stats=stats
+    )
+
+    assert res, msg
+    stages = stats.report()[("SDNW", 512)]
+    assert 0 < stages["tolerance"]["peak_bytes"] <= stages["total"]["peak_bytes"]
+    assert stages["tolerance"]["flops"] == 8 * 512**2
+
+
+def test_classify_report():
+    stats = VerificationStats()
+
+    classify(_tested_matrix(), mct_reference(5), stats=stats)
+    classify(mct_reference(5), mct_reference(5), stats=stats)
+
+    report = stats.report()
+    assert set(report) == {(name, 128) for name in CLASS_NAMES} | {
+        (name, 64) for name in CLASS_NAMES
+    }
+    assert report[("SDWE", 128)]["projection"]["calls"] == 1
+    assert all(stages["total"]["peak_bytes"] == 0 for stages in report.values())
+    lines = str(stats).splitlines()
+    assert lines[0].split()[:3] == ["class", "dim", "stage"]
+    assert len(lines) == 1 + sum(len(stages) for stages in report.values())
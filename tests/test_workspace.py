@@ -0,0 +1,92 @@
+import tracemalloc
+
+import numpy as np
+import pytest
+from qiskit.quantum_info import Operator
+
+from quconot.implementations import MCTBarenco74Dirty, MCTVChain
+from quconot.verifications import (
+    Workspace,
+    classify,
+    mct_reference,
+    verify_circuit_strict_dirty_non_wasting,
+)
+from quconot.verifications.workspace import _max_combined_deviation, _max_deviation
+
+
+@pytest.mark.parametrize("absolute", [False, True])
+def test_max_deviation(absolute):
+    rng = np.random.default_rng(7)
+    matrix = rng.normal(size=(6, 6)) + 1j * rng.normal(size=(6, 6))
+    columns = rng.permutation(6)
+    targets = rng.permutation(6)
+    expected_ones = np.zeros((6, 6))
+    expected_ones[np.arange(6), targets] = 1.0
+
+    generated = abs(matrix[:, columns]) if absolute else 0.5j * matrix[:, columns]
+    expected = np.max(abs(generated - expected_ones) - 1e-3 * expected_ones)
+
+    deviation = _max_deviation(
+        matrix,
+        columns,
+        targets,
+        Workspace(block_bytes=40),
+        scale=0.5j,
+        absolute=absolute,
+        rtol=1e-3,
+    )
+    assert np.isclose(deviation, expected)
+
+
+def test_max_combined_deviation():
+    rng = np.random.default_rng(8)
+    matrix = rng.normal(size=(12, 4)) + 1j * rng.normal(size=(12, 4))
+    weights = rng.normal(size=3) + 1j * rng.normal(size=3)
+    targets = np.arange(4)
+
+    blocks = matrix.reshape(3, 4, 4)
+    combined = abs(sum(weight * block for weight, block in zip(weights, blocks)))
+    expected = np.max(abs(combined - np.eye(4)))
+
+    deviation = _max_combined_deviation(matrix, weights, targets, Workspace(64))
+    assert np.isclose(deviation, expected)
+
+
+def test_nan_is_not_close():
+    matrix = np.eye(4, dtype=complex)
+    matrix[3, 3] = np.nan
+
+    deviation = _max_deviation(matrix, np.arange(4), np.arange(4), Workspace(16))
+    assert not deviation <= 1.0
+
+
+def test_reused_workspace():
+    workspace = Workspace(block_bytes=2**10)
+    for controls_no, implementation in [(3, MCTVChain), (5, MCTBarenco74Dirty)]:
+        tested_matrix = Operator(implementation(controls_no).generate_circuit()).data
+        ref = mct_reference(controls_no)
+
+        expected = classify(tested_matrix, ref)
+        assert classify(tested_matrix, ref, workspace=workspace) == expected
+        single = classify(tested_matrix, ref, precision="single", workspace=workspace)
+        assert single == expected
+    assert workspace.nbytes < tested_matrix.nbytes // 16
+
+
+def test_peak_memory():
+    controls_no = 9
+    tested_matrix = np.kron(np.eye(2), mct_reference(controls_no).toarray())
+    tested_matrix = tested_matrix.astype(complex)
+    workspace = Workspace(block_bytes=2**16)
+
+    tracemalloc.start()
+    try:
+        res, msg = verify_circuit_strict_dirty_non_wasting(
+            tested_matrix, mct_reference(controls_no), workspace=workspace
+        )
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    assert res, msg
+    assert peak < tested_matrix.nbytes // 16
@@ -1,9 +1,10 @@
 from functools import lru_cache
 
-import numpy as np
+from quconot.verifications import mct_reference
 
 
 @lru_cache()
 def load_matrix(mode: str, controls_no: int):
-    container = np.load("./tests/ref_matrices/mct_" + mode + ".npz")
-    return container["arr_" + str(controls_no - 1)]
+    if mode != "noauxiliary":
+        raise ValueError(f"Unknown reference {mode}")
+    return mct_reference(controls_no).toarray()